@@ -0,0 +1,213 @@
+"""
+Background color variants composited from transparent renders.
+
+Marketplaces want the same product on white, light gray and brand colors.
+With --transparent (batch_render.py) Cycles renders the model on a
+transparent film, and the Ground_Plane shadow catcher writes the contact
+shadows into the alpha channel. Each background is then one NumPy "over"
+operation on the decoded master (TransparentRender), milliseconds
+instead of a render:
+
+    <model>/angle_0deg.png                        transparent master
+    <model>/backgrounds/white/angle_0deg.png      composited, opaque RGB
+    <model>/backgrounds/brand/angle_0deg.png
+
+Colors are preset names (BACKGROUND_PRESETS), hex values ('#e30613') or
+named hex values ('brand=#e30613'). Outputs newer than their master are
+skipped, so adding a color only composites that color.
+
+Requires Pillow, like postprocess.py (which composites the same variants
+as renders finish with --backgrounds).
+
+Usage:
+    python backgrounds.py <output_dir> white lightgray brand=#e30613
+"""
+
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:  # Checked in main() so the module still imports without Pillow
+    Image = None
+
+
+BACKGROUND_DIR_NAME = 'backgrounds'
+
+# sRGB 8-bit colors; 'studio' is the world gray of opaque renders
+# (WORLD_BACKGROUND_COLOR 0.95 linear through the Standard view transform)
+BACKGROUND_PRESETS = {
+    'white': (255, 255, 255),
+    'studio': (249, 249, 249),
+    'lightgray': (240, 240, 240),
+    'gray': (200, 200, 200),
+    'black': (0, 0, 0),
+}
+
+PNG_COMPRESS_LEVEL = 3  # zlib level; encoding, not compositing, dominates per color
+
+MASTER_PATTERN = re.compile(r'angle_[^.]+\.png$')  # Not pass files (angle_<id>.depth.png)
+
+
+def parse_background(spec):
+    """
+    Parse a background specification.
+
+    Args:
+        spec: Preset name, '#rrggbb' / 'rrggbb', or 'name=#rrggbb'
+
+    Returns:
+        tuple: (name, (r, g, b)) with 0-255 components
+
+    Raises:
+        ValueError: If the color is neither a preset nor a hex value
+    """
+    name, _, value = spec.partition('=')
+    value = value or name
+    if value.lower() in BACKGROUND_PRESETS:
+        return name.lower(), BACKGROUND_PRESETS[value.lower()]
+
+    digits = value.lstrip('#')
+    if not re.fullmatch(r'[0-9a-fA-F]{6}', digits):
+        raise ValueError(f"Unknown background '{spec}' (use {', '.join(BACKGROUND_PRESETS)}, "
+                         f"#rrggbb or name=#rrggbb)")
+    color = tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+    return (digits.lower() if name == value else name), color
+
+
+class TransparentRender:
+    """A decoded transparent render, prepared for compositing over colors"""
+
+    def __init__(self, rgba):
+        """
+        Split the pixels by coverage once per render.
+
+        Most pixels are either clear (background) or opaque (product); only
+        antialiased edges and shadows need blending. Pixels are kept packed
+        as one uint32 per RGBA pixel, so filling the clear ones is a single
+        np.where per color.
+
+        Args:
+            rgba: (H, W, 4) uint8 array, straight alpha (Blender writes
+                unpremultiplied PNG)
+        """
+        rgba = np.array(rgba, dtype=np.uint8, order='C')
+        alpha = rgba[..., 3].copy()
+        self.shape = rgba.shape
+        self.clear = alpha == 0
+        self.partial = np.flatnonzero((alpha > 0) & (alpha < 255))
+        partial_alpha = alpha.reshape(-1)[self.partial].astype(np.uint16)[:, None]
+        self.premultiplied = rgba.reshape(-1, 4)[self.partial, :3] * partial_alpha
+        self.inverse_alpha = 255 - partial_alpha
+        rgba[..., 3] = 255
+        self.pixels = rgba.view(np.uint32)[..., 0]
+
+    def over(self, color):
+        """
+        Composite the render over a solid color.
+
+        Args:
+            color: (r, g, b) 0-255 background
+
+        Returns:
+            np.ndarray: (H, W, 4) uint8 image, alpha 255
+        """
+        packed = np.array([*color, 255], dtype=np.uint8).view(np.uint32)[0]
+        out = np.where(self.clear, packed, self.pixels)
+        # fg·a + bg·(255 - a), divided by 255 with rounding (exact in uint16)
+        blended = self.premultiplied + np.asarray(color, dtype=np.uint16) * self.inverse_alpha
+        blended += 128
+        out.view(np.uint8).reshape(-1, 4)[self.partial, :3] = (blended + (blended >> 8)) >> 8
+        return out.view(np.uint8).reshape(self.shape)
+
+
+def background_path(master_path, name):
+    """<model>/angle_<id>.png -> <model>/backgrounds/<name>/angle_<id>.png"""
+    master_path = Path(master_path)
+    return master_path.parent / BACKGROUND_DIR_NAME / name / master_path.name
+
+
+def find_masters(output_dir):
+    """Rendered angle PNGs of every model in an output directory"""
+    return sorted(path for path in Path(output_dir).glob('*/angle_*.png')
+                  if MASTER_PATTERN.fullmatch(path.name))
+
+
+def composite_master(master_path, backgrounds):
+    """
+    Write every background variant of one master render.
+
+    Args:
+        master_path: Transparent angle PNG
+        backgrounds: (name, color) pairs from parse_background()
+
+    Returns:
+        dict: {'master', 'written': [paths], 'skipped': count, 'opaque', 'seconds'};
+            opaque is True if the master has no alpha channel
+    """
+    start = time.perf_counter()
+    master_path = Path(master_path)
+    master_mtime = master_path.stat().st_mtime
+    todo = [(name, color) for name, color in backgrounds
+            if not (background_path(master_path, name).exists()
+                    and background_path(master_path, name).stat().st_mtime >= master_mtime)]
+
+    written, opaque = [], False
+    if todo:
+        with Image.open(master_path) as image:
+            opaque = 'A' not in image.getbands()
+            render = TransparentRender(np.asarray(image.convert('RGBA')))
+        for name, color in todo:
+            path = background_path(master_path, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            image = Image.fromarray(render.over(color), 'RGBA').convert('RGB')
+            image.save(tmp_path, format='PNG', compress_level=PNG_COMPRESS_LEVEL)
+            os.replace(tmp_path, path)
+            written.append(str(path))
+
+    return {'master': str(master_path), 'written': written,
+            'skipped': len(backgrounds) - len(todo), 'opaque': opaque,
+            'seconds': round(time.perf_counter() - start, 3)}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Composite background colors behind transparent renders')
+    parser.add_argument('output', help='Render output directory (<model>/angle_<id>.png)')
+    parser.add_argument('backgrounds', nargs='+', metavar='COLOR',
+                        help=f"Preset ({', '.join(BACKGROUND_PRESETS)}), #rrggbb or name=#rrggbb")
+    args = parser.parse_args()
+
+    if Image is None:
+        print(f"❌ Pillow is required: {sys.executable} -m pip install Pillow")
+        sys.exit(1)
+    try:
+        backgrounds = [parse_background(spec) for spec in args.backgrounds]
+    except ValueError as e:
+        parser.error(str(e))
+
+    masters = find_masters(args.output)
+    written = skipped = opaque = 0
+    start = time.perf_counter()
+    for master in masters:
+        result = composite_master(master, backgrounds)
+        written += len(result['written'])
+        skipped += result['skipped']
+        opaque += result['opaque']
+
+    if opaque:
+        print(f"⚠ {opaque} renders have no alpha channel (rendered without --transparent); "
+              f"their backgrounds are the render's own")
+    print(f"✓ {written} background variants of {len(masters)} renders in "
+          f"{time.perf_counter() - start:.2f}s ({skipped} up to date)")
+
+
+if __name__ == "__main__":
+    main()
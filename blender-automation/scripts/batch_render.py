@@ -16,33 +16,177 @@ Requirements:
 """
 
 import bpy
+import json
 import os
+import subprocess
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-import math
+import time
+import numpy as np
 
 # Add scripts directory to path for module imports
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir))
 
-from camera_positions import CameraPositions, DIMENSION_PRESETS, calculate_optimal_camera_distance
-from material_setup import complete_scene_setup
+from backgrounds import parse_background
+from camera_positions import (CameraPositions, DIMENSION_PRESETS, calculate_optimal_camera_distance,
+                              calculate_framing_distance, get_model_dimensions)
+from camera_orbit import OrbitCameraPositions, orbit_angle_ids, look_at_quaternions
+from mesh_cache import MeshCache, import_file, count_vertices
+from model_catalog import ModelCatalog
+from model_formats import MODEL_EXTENSIONS, find_model_files
+from model_dedup import find_duplicates
+from material_setup import (complete_scene_setup, setup_studio, setup_red_green_materials,
+                            apply_material_by_geometry, remove_object, purge_orphans,
+                            scene_parameters, WORLD_BACKGROUND_COLOR)
+from obj_scanner import INDEX_NAME, load_index, plan_models
+from parallel_render import (run_parallel_batch, apply_core_affinity, balance_jobs, load_shard,
+                             merge_model_result, write_results)
+from render_queue import (RenderQueue, DEFAULT_JOB_TIMEOUT, DEFAULT_LEASE_SECONDS,
+                          print_queue_status, run_host, work_queue)
+from render_service import serve
+from render_stats import (RenderStats, RenderPhases, STATS_DIR_NAME, default_stats_path,
+                          report as report_stats)
+from render_cache import RenderCache, hash_file, link_file, render_key
+from render_cost import (CostModel, DEFAULT_POLICY, SCHEDULE_POLICIES, format_duration, plan_jobs,
+                         print_estimate)
+from render_manifest import RenderManifest, MANIFEST_NAME
+from render_passes import PASS_FORMATS, PASSES, PassOutput, pass_path
+from render_tiers import RENDER_TIERS, DEFAULT_TIER, DEFAULT_LOD_THRESHOLD, get_tier
+from size_variants import VARIANT_METHOD, resize_table, top_thickness, variant_sizes
+from tiled_render import (DEFAULT_TILE_OVERLAP, parse_tile_grid, plan_tiles, run_tile_workers,
+                          stitch_tiles, tile_border, tile_path)
+
+
+# Fixed Cycles seed so identical inputs give identical pixels (render cache)
+RENDER_SEED = 0
+
+# Extra frame share kept around the projected bounding box in crop mode
+CROP_MARGIN = 0.03
+
+
+def srgb_encode(value):
+    """Linear 0-1 value through the sRGB curve (the Standard view transform)"""
+    value = min(max(value, 0.0), 1.0)
+    return value * 12.92 if value <= 0.0031308 else 1.055 * value ** (1 / 2.4) - 0.055
+
+
+# Crop mode leaves the frame outside the border unrendered; it is filled with
+# the world background as it appears in renders
+CROP_FILL_COLOR = tuple(srgb_encode(c) for c in WORLD_BACKGROUND_COLOR)
 
 
 class BlenderAutomation:
     """Automated rendering system for furniture models"""
 
-    def __init__(self, output_dir='../output', resolution=(2048, 2048)):
+    def __init__(self, output_dir='../output', resolution=(2048, 2048), threads=None,
+                 persistent_studio=False, cache=None, manifest=None, catalog=None,
+                 keyframed_angles=False,
+                 tier=DEFAULT_TIER, auto_frame=False, frame_fill=0.8, crop=False,
+                 auto_materials=False, mesh_cache_dir=None,
+                 lod_threshold=DEFAULT_LOD_THRESHOLD, turntable_steps=0,
+                 orbit_elevations=(15.0,), orbit_roll=0.0, stats=None, samples=None,
+                 passes=(), pass_format='png', transparent=False):
         """
         Initialize automation system.
 
         Args:
             output_dir: Directory for rendered images
             resolution: Output resolution (width, height) in pixels
+            threads: Fixed Cycles CPU thread count (None = auto-detect)
+            persistent_studio: If True, build scene settings, lights, ground, world,
+                camera and materials once and only swap the model between renders
+            cache: RenderCache instance (None = always render)
+            manifest: RenderManifest recording every finished angle (None = no manifest)
+            catalog: ModelCatalog for dimensions, measured bounding boxes and
+                per-angle render status (None = presets and file names only)
+            keyframed_angles: If True, render all angles of a model as one
+                keyframed animation in a single Cycles session
+            tier: Render quality tier name ('draft', 'proof', 'final')
+            auto_frame: If True, frame every model from its bounding box, even
+                models with dimension presets
+            frame_fill: Share of the frame the bounding box should fill
+            crop: If True, sample only the projected bounding box (render border);
+                the saved image keeps the full resolution
+            auto_materials: If True, assign red/green per face from geometry
+                (apply_material_by_geometry) instead of slot order
+            mesh_cache_dir: Directory for binary .npz copies of imported meshes
+                (None = always import the model file)
+            lod_threshold: Meshes with at least this many vertices are decimated
+                to the tier's lod_ratio (draft/proof only; 0 = never decimate)
+            turntable_steps: Azimuth steps of orbit poses added to the standard
+                angles (0 = no orbit poses)
+            orbit_elevations: Elevation rings of the orbit, in degrees
+            orbit_roll: Camera roll of orbit poses, in degrees
+            stats: RenderStats recording per-stage timings (None = not recorded)
+            samples: Override the tier's maximum samples (None = tier default)
+            passes: Passes written next to every angle from the same render
+                (render_passes.PASSES; empty = beauty image only)
+            pass_format: 'png' (separate masks) or 'exr' (one multilayer EXR)
+            transparent: If True, render RGBA on a transparent film with the
+                ground's shadows in alpha, for background variants (backgrounds.py)
         """
         self.output_dir = Path(output_dir)
         self.resolution = resolution
-        self.camera_positions = CameraPositions()
+        self.threads = threads
+        self.persistent_studio = persistent_studio
+        self.cache = cache
+        self.manifest = manifest
+        self.catalog = catalog
+        self.stats = stats or RenderStats()
+        self.keyframed_angles = keyframed_angles
+        self.tier_name = tier
+        self.tier = get_tier(tier)
+        if samples:
+            self.tier = {**self.tier, 'max_samples': samples,
+                         'min_samples': min(self.tier['min_samples'], samples)}
+        self.samples = self.tier['max_samples']
+        if cache is not None and self.tier['time_limit']:
+            # A wall-clock limit makes the sample count depend on machine load,
+            # so one cache key could map to different pixels; cached renders
+            # always run to the tier's sample budget (time_limit 0 in the key)
+            self.tier = {**self.tier, 'time_limit': 0}
+            print(f"⚠ Render cache in use: {tier} tier time limit disabled for reproducible pixels")
+        self.auto_frame = auto_frame
+        self.frame_fill = frame_fill
+        self.crop = crop
+        self.auto_materials = auto_materials
+        self.lod_threshold = lod_threshold
+        self.lod_ratio = self.tier['lod_ratio'] if lod_threshold else None
+        if not mesh_cache_dir and self.lod_ratio:
+            mesh_cache_dir = self.output_dir / '.mesh-cache'  # Decimated meshes are always cached
+        self.mesh_cache = MeshCache(mesh_cache_dir) if mesh_cache_dir else None
+        if turntable_steps:
+            self.camera_positions = OrbitCameraPositions(turntable_steps, orbit_elevations,
+                                                         orbit_roll)
+        else:
+            self.camera_positions = CameraPositions()
+
+        # Persistent studio state
+        self.scene_ready = False
+        self.model_objects = []
+        self.model_geometry = {}  # Vertex counts before/after LOD, for the manifest
+
+        # Model currently resident in the scene (reused by the render service)
+        self.loaded_model = None
+        self.loaded_positions = None
+
+        # Size variants: dimensions being rendered, and the imported base
+        # model's world-space vertices they are resized from
+        self.variant = None
+        self.base_model = None
+        self.base_vertices = {}
+        self.model_corners = None  # 8x3 world bounding box corners
+        self.render_border = None  # Border of the current render (crop mode, tiles)
+
+        # Conditioning passes (render_passes.py): compositor output and the
+        # files written for each angle of the current model
+        self.transparent = transparent
+        self.passes = list(passes)
+        self.pass_format = pass_format
+        self.pass_output = None
+        self.pass_files = {}
 
     def setup_scene(self):
         """Configure Blender scene settings for high-quality product photography"""
@@ -50,8 +194,8 @@ class BlenderAutomation:
 
         # Render engine: Cycles for photorealistic ray-tracing
         scene.render.engine = 'CYCLES'
-        scene.cycles.samples = 256  # High quality (increase to 512 for final production)
-        scene.cycles.use_denoising = True  # AI denoising for clean shadows
+        scene.cycles.seed = RENDER_SEED
+        scene.cycles.use_animated_seed = False
 
         # GPU acceleration (if available)
         prefs = bpy.context.preferences.addons['cycles'].preferences
@@ -60,70 +204,190 @@ class BlenderAutomation:
         for device in prefs.devices:
             device.use = True  # Enable all available GPUs
 
+        # CPU thread budget (fixed when several workers share one machine)
+        if self.threads:
+            scene.render.threads_mode = 'FIXED'
+            scene.render.threads = self.threads
+        else:
+            scene.render.threads_mode = 'AUTO'
+
         # Output resolution
         scene.render.resolution_x = self.resolution[0]
         scene.render.resolution_y = self.resolution[1]
         scene.render.resolution_percentage = 100
 
-        # Image format: PNG with RGB color
+        # Image format: PNG with RGB color (RGBA on a transparent film)
         scene.render.image_settings.file_format = 'PNG'
-        scene.render.image_settings.color_mode = 'RGB'
+        scene.render.image_settings.color_mode = 'RGBA' if self.transparent else 'RGB'
         scene.render.image_settings.color_depth = '8'
         scene.render.image_settings.compression = 15  # 0-100, higher = smaller file
 
-        # Background: Solid light gray (not transparent)
-        scene.render.film_transparent = False
+        # Quality tier: sampling, bounces, time budget, denoiser
+        self.apply_tier(scene)
+
+        # Background: Solid light gray, or transparent with the Ground_Plane
+        # shadow catcher's shadows in alpha (backgrounds composited later)
+        scene.render.film_transparent = self.transparent
 
         # Color management for accurate colors
         scene.view_settings.view_transform = 'Standard'
         scene.view_settings.look = 'None'
 
+        # Passes from the same render, written by the compositor
+        if self.passes:
+            self.pass_output = PassOutput(scene, self.passes, self.pass_format)
+
         print("✓ Scene configured for high-quality rendering")
-        print(f"  • Engine: Cycles, {scene.cycles.samples} samples")
+        print(f"  • Engine: Cycles, {self.tier_name} tier, "
+              f"{self.tier['min_samples']}-{scene.cycles.samples} adaptive samples")
         print(f"  • Resolution: {self.resolution[0]}×{self.resolution[1]}")
-        print(f"  • Format: PNG RGB")
+        print(f"  • Threads: {scene.render.threads}")
+        print(f"  • Format: PNG {'RGBA, transparent film' if self.transparent else 'RGB'}")
+        if self.passes:
+            print(f"  • Passes: {', '.join(self.passes)} ({self.pass_format.upper()})")
+
+    def apply_tier(self, scene):
+        """
+        Apply the quality tier to Cycles and record it in image metadata.
+
+        Args:
+            scene: Scene to configure
+        """
+        tier = self.tier
+        cycles = scene.cycles
+
+        # Adaptive sampling: stop each pixel once noise is below the threshold
+        cycles.use_adaptive_sampling = True
+        cycles.adaptive_threshold = tier['adaptive_threshold']
+        cycles.adaptive_min_samples = tier['min_samples']
+        cycles.samples = tier['max_samples']
+        cycles.time_limit = tier['time_limit']
+
+        # Light-path bounce limits
+        cycles.max_bounces = tier['max_bounces']
+        cycles.diffuse_bounces = tier['diffuse_bounces']
+        cycles.glossy_bounces = tier['glossy_bounces']
+        cycles.transmission_bounces = tier['transmission_bounces']
+        cycles.transparent_max_bounces = tier['transparent_max_bounces']
+        cycles.caustics_reflective = tier['caustics']
+        cycles.caustics_refractive = tier['caustics']
+
+        # Denoising for clean shadows
+        cycles.use_denoising = tier['denoiser'] is not None
+        if tier['denoiser']:
+            cycles.denoiser = tier['denoiser']
+
+        # Tier is written into PNG metadata (not burned into the image)
+        scene.render.use_stamp = False
+        scene.render.use_stamp_note = True
+        scene.render.stamp_note_text = (
+            f"tier={self.tier_name}; samples={tier['max_samples']}; "
+            f"adaptive_threshold={tier['adaptive_threshold']}"
+        )
+
+    def render_settings(self):
+        """
+        Settings that affect rendered pixels, for render cache keys.
+
+        Returns:
+            dict: JSON-serializable settings snapshot
+        """
+        return {
+            'resolution': list(self.resolution),
+            'tier': self.tier_name,
+            'tier_settings': self.tier,
+            'seed': RENDER_SEED,
+            'auto_materials': self.auto_materials,
+            'lod_threshold': self.lod_threshold if self.lod_ratio else None,
+            'camera': {'lens': 50, 'sensor_width': 36},
+            'scene': scene_parameters(),
+            **({'film': 'transparent'} if self.transparent else {}),
+        }
+
+    def render_fields(self):
+        """Per-render fields for stage stats: geometry, resolution, sample budget"""
+        return {
+            'vertices': self.model_geometry.get('lod_vertices', self.model_geometry.get('vertices')),
+            'resolution': list(self.resolution),
+            'max_samples': self.samples,
+            'tier': self.tier_name,
+        }
+
+    def output_path(self, model_name, angle_id):
+        """Output PNG path for a model angle"""
+        return self.output_dir / model_name / f"angle_{angle_id}.png"
 
     def clear_scene(self):
         """Remove all objects from scene"""
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete()
+        for obj in list(bpy.data.objects):
+            remove_object(obj)
+        self.model_objects = []
+        self.scene_ready = False
+        purge_orphans()
         print("✓ Scene cleared")
 
+    def remove_model(self):
+        """Remove only the previously imported model, keeping the studio"""
+        for name in self.model_objects:
+            obj = bpy.data.objects.get(name)
+            if obj is not None:
+                remove_object(obj)
+        self.model_objects = []
+        purge_orphans()
+
+    def imported_objects(self):
+        """Objects of the current model import (meshes and any empties)"""
+        return [bpy.data.objects[name] for name in self.model_objects if name in bpy.data.objects]
+
     def import_model(self, obj_path):
         """
-        Import .obj file from Shapr3D or other CAD software.
+        Import a model file from Shapr3D or other CAD software.
 
         Args:
-            obj_path: Path to .obj file
+            obj_path: Path to .obj, .glb/.gltf, .stl or .ply file
 
         Returns:
             bpy.types.Object: Imported model object (or collection of objects)
         """
-        self.clear_scene()
-
-        # Import OBJ
-        bpy.ops.import_scene.obj(filepath=str(obj_path))
-
-        # Get all imported objects
-        imported_objects = bpy.context.selected_objects
-
-        if not imported_objects:
+        if self.persistent_studio:
+            self.remove_model()
+        else:
+            self.clear_scene()
+
+        # Import model (rebuilt from binary arrays on mesh cache hits)
+        # and decimated for draft/proof tiers (level of detail)
+        lod = None
+        if self.mesh_cache is not None:
+            imported_objects, lod = self.mesh_cache.import_model(
+                obj_path, lod_ratio=self.lod_ratio, lod_threshold=self.lod_threshold)
+        else:
+            existing = set(bpy.data.objects.keys())
+            import_file(obj_path)
+            imported_objects = [obj for obj in bpy.data.objects if obj.name not in existing]
+        self.model_objects = [obj.name for obj in imported_objects]
+        self.model_geometry = lod or {'vertices': count_vertices(imported_objects)}
+
+        # glTF imports may add empties and cameras next to the meshes
+        mesh_objects = [obj for obj in imported_objects if obj.type == 'MESH']
+        if not mesh_objects:
             raise Exception(f"Failed to import model: {obj_path}")
 
-        # If multiple objects, find the parent or largest mesh
-        main_obj = imported_objects[0]
-        for obj in imported_objects:
-            if obj.type == 'MESH':
-                # Use the object with the most vertices as main
-                if len(obj.data.vertices) > len(main_obj.data.vertices):
-                    main_obj = obj
+        # Object index pass: 1..n in import order (0 = ground and background)
+        for index, obj in enumerate(mesh_objects, 1):
+            obj.pass_index = index
+
+        # If multiple objects, use the mesh with the most vertices as main
+        main_obj = max(mesh_objects, key=lambda obj: len(obj.data.vertices))
 
         # Center model at origin
         main_obj.location = (0, 0, 0)
 
-        print(f"✓ Imported model: {obj_path.name}")
+        print(f"✓ Imported model: {Path(obj_path).name}")
         print(f"  • Objects: {len(imported_objects)}")
         print(f"  • Vertices: {len(main_obj.data.vertices)}")
+        if lod is not None:
+            print(f"  • LOD ({self.tier_name}, ratio {lod['lod_ratio']:g}): "
+                  f"{lod['vertices']:,} → {lod['lod_vertices']:,} vertices")
 
         return main_obj
 
@@ -137,14 +401,19 @@ class BlenderAutomation:
         Returns:
             bpy.types.Object: Camera object
         """
+        # Persistent studio keeps its camera between models
+        if self.persistent_studio and name in bpy.data.objects:
+            camera = bpy.data.objects[name]
+            bpy.context.scene.camera = camera
+            return camera
+
         # Remove existing camera
         if name in bpy.data.objects:
-            bpy.data.objects.remove(bpy.data.objects[name], do_unlink=True)
+            remove_object(bpy.data.objects[name])
 
         # Create new camera
-        bpy.ops.object.camera_add()
-        camera = bpy.context.active_object
-        camera.name = name
+        camera = bpy.data.objects.new(name, bpy.data.cameras.new(name))
+        bpy.context.scene.collection.objects.link(camera)
 
         # Camera settings: 50mm focal length, full-frame sensor
         camera.data.lens = 50  # mm
@@ -158,30 +427,27 @@ class BlenderAutomation:
 
         return camera
 
-    def position_camera(self, camera, position, rotation, target):
+    def position_camera(self, camera, angle_config):
         """
         Position camera at specific angle.
 
         Args:
             camera: Camera object
-            position: (x, y, z) tuple in meters
-            rotation: (pitch, yaw, roll) tuple in degrees
-            target: (x, y, z) tuple for camera target point
+            angle_config: Angle configuration with 'position' and 'target' in
+                meters, plus optional 'roll' (degrees) or a precomputed look-at
+                'quaternion' (w, x, y, z) from camera_orbit
         """
-        # Set position
-        camera.location = position
+        import mathutils
 
-        # Set rotation (convert degrees to radians)
-        camera.rotation_euler = (
-            math.radians(rotation[0]),
-            math.radians(rotation[1]),
-            math.radians(rotation[2])
-        )
+        # Set position
+        camera.location = angle_config['position']
 
-        # Point camera at target (more precise than just rotation)
-        direction = tuple(t - p for t, p in zip(target, position))
-        rot_quat = direction_to_rotation(direction)
-        camera.rotation_euler = rot_quat.to_euler()
+        # Point camera at target: local -Z towards the target, +Y up
+        quaternion = angle_config.get('quaternion')
+        if quaternion is None:
+            quaternion = look_at_quaternions([angle_config['position']], angle_config['target'],
+                                             angle_config.get('roll', 0.0))[0]
+        camera.rotation_euler = mathutils.Quaternion(quaternion).to_euler()
 
     def render_angle(self, angle_id, angle_config, model_name):
         """
@@ -198,29 +464,413 @@ class BlenderAutomation:
         camera = bpy.context.scene.camera
 
         # Position camera
-        self.position_camera(
-            camera,
-            angle_config['position'],
-            angle_config['rotation'],
-            angle_config['target']
-        )
+        self.position_camera(camera, angle_config)
 
-        # Create output directory
-        output_dir = self.output_dir / model_name
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Crop mode: only sample pixels that contain the product
+        self.apply_render_border(self.projected_border(camera) if self.crop else None)
 
         # Output path
-        output_path = output_dir / f"angle_{angle_id}.png"
-
-        # Render
-        bpy.context.scene.render.filepath = str(output_path)
-        bpy.ops.render.render(write_still=True)
+        output_path = self.output_path(model_name, angle_id)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Render to a temporary name and rename, so a partial PNG is never
+        # mistaken for a finished render (and cache hardlinks are never overwritten)
+        partial_path = output_path.with_name(f".{output_path.stem}.partial.png")
+        bpy.context.scene.render.filepath = str(partial_path)
+        if self.pass_output is not None:
+            self.pass_output.set_depth_range(angle_config['position'], angle_config['target'],
+                                             self.model_corners)
+            self.pass_output.begin(output_path)
+        with self.stats.stage('render', model_name, angle_id, **self.render_fields()) as info:
+            phases = RenderPhases()
+            with render_phase_handlers(phases):
+                bpy.ops.render.render(write_still=True)
+            self.fill_unrendered(partial_path)
+            os.replace(partial_path, output_path)
+            if self.pass_output is not None:
+                self.pass_files[angle_id] = self.pass_output.finish(output_path)
+            info['samples'] = phases.samples
+            phases.record(self.stats, model_name, angle_id)
 
         print(f"✓ Rendered {angle_config['name']}: {output_path.name}")
 
         return output_path
 
-    def process_model(self, obj_path, model_name=None, angles=None):
+    def render_angles_keyframed(self, positions, model_name, on_angle_done):
+        """
+        Render several angles as one animation, one camera keyframe per angle.
+        With render.use_persistent_data, Cycles syncs the scene and builds the
+        BVH once for all frames instead of once per angle.
+
+        Args:
+            positions: {angle_id: angle_config} to render, in frame order
+            model_name: Model identifier for output filenames
+            on_angle_done: Called as on_angle_done(angle_id, output_path, duration)
+                as soon as each frame is written
+        """
+        scene = bpy.context.scene
+        camera = scene.camera
+        angle_ids = list(positions)
+
+        output_dir = self.output_dir / model_name
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Keyframe one camera pose per frame
+        camera.animation_data_clear()
+        for frame, angle_id in enumerate(angle_ids, start=1):
+            config = positions[angle_id]
+            self.position_camera(camera, config)
+            camera.keyframe_insert(data_path='location', frame=frame)
+            camera.keyframe_insert(data_path='rotation_euler', frame=frame)
+
+        # Crop mode: one border covering the product in every pose
+        if self.crop:
+            borders = []
+            for frame in range(1, len(angle_ids) + 1):
+                scene.frame_set(frame)
+                borders.append(self.projected_border(camera))
+            borders = np.array(borders)
+            self.apply_render_border((*borders[:, :2].min(axis=0), *borders[:, 2:].max(axis=0)))
+        else:
+            self.apply_render_border(None)
+
+        # Hold each pose on its own frame (no interpolation between angles)
+        for fcurve in camera.animation_data.action.fcurves:
+            for point in fcurve.keyframe_points:
+                point.interpolation = 'CONSTANT'
+
+        scene.frame_start = 1
+        scene.frame_end = len(angle_ids)
+        persistent_data = scene.render.use_persistent_data
+        scene.render.use_persistent_data = True
+        scene.render.filepath = str(output_dir / '.frame_####')
+
+        written = []
+        last_done = [time.time()]
+
+        def on_frame_written(scene, *args):
+            # Rename each finished frame to angle_<id>.png as soon as it is on disk
+            angle_id = angle_ids[scene.frame_current - 1]
+            frame_path = Path(scene.render.frame_path(frame=scene.frame_current))
+            output_path = self.output_path(model_name, angle_id)
+            self.fill_unrendered(frame_path)
+            os.replace(frame_path, output_path)
+            written.append(angle_id)
+
+            now = time.time()
+            print(f"✓ Rendered {positions[angle_id]['name']}: {output_path.name}")
+            self.stats.record('render', model_name, angle_id, start=last_done[0],
+                              wall=now - last_done[0], keyframed=True, **self.render_fields())
+            on_angle_done(angle_id, output_path, now - last_done[0])
+            last_done[0] = now
+
+        bpy.app.handlers.render_write.append(on_frame_written)
+        try:
+            with self.stats.stage('render_animation', model_name, frames=len(angle_ids)):
+                phases = RenderPhases()
+                with render_phase_handlers(phases):
+                    bpy.ops.render.render(animation=True)
+                phases.record(self.stats, model_name)
+        finally:
+            bpy.app.handlers.render_write.remove(on_frame_written)
+            camera.animation_data_clear()
+            scene.frame_set(1)
+            # Later single-frame renders must resync the scene, and frames a
+            # failed render left behind must not pile up in the output
+            scene.render.use_persistent_data = persistent_data
+            for frame in range(1, len(angle_ids) + 1):
+                Path(scene.render.frame_path(frame=frame)).unlink(missing_ok=True)
+
+        missing = [a for a in angle_ids if a not in written]
+        if missing:
+            raise Exception(f"Keyframed render did not write angles: {', '.join(missing)}")
+
+    def prepare_model(self, obj_path, model_name):
+        """
+        Build the scene for a model: settings, import, materials, lighting, camera.
+
+        Args:
+            obj_path: Path to .obj file
+            model_name: Model identifier (e.g., '150x80')
+
+        Returns:
+            dict: Camera configurations for all angles {angle_id: config}
+        """
+        stats = self.stats
+        if self.persistent_studio:
+            # Scene settings and studio are built once per session
+            with stats.stage('setup_scene', model_name):
+                if not self.scene_ready:
+                    self.setup_scene()
+                    self.scene_ready = True
+                setup_studio()
+
+            # Swap the model, then apply the shared materials
+            with stats.stage('import', model_name) as info:
+                model_obj = self.import_model(obj_path)
+                info.update(self.model_geometry)
+            with stats.stage('materials', model_name):
+                setup_red_green_materials(model_obj, self.imported_objects())
+                if self.auto_materials:
+                    apply_material_by_geometry(model_obj, objects=self.imported_objects())
+        else:
+            # Setup scene
+            with stats.stage('setup_scene', model_name):
+                self.setup_scene()
+
+            # Import model
+            with stats.stage('import', model_name) as info:
+                model_obj = self.import_model(obj_path)
+                info.update(self.model_geometry)
+
+            # Apply materials and lighting
+            with stats.stage('materials', model_name):
+                complete_scene_setup(model_obj, auto_assign_materials=self.auto_materials,
+                                     objects=self.imported_objects())
+
+        # A size variant is resized from the freshly imported base model
+        self.base_model = None
+        if self.variant is not None:
+            self.capture_base(obj_path)
+            with stats.stage('resize', model_name):
+                self.apply_variant(self.variant)
+
+        positions = self.frame_model(model_name)
+        self.loaded_model = self.variant_key(obj_path, model_name)
+        self.loaded_positions = positions
+
+        return positions
+
+    def frame_model(self, model_name):
+        """
+        Set up the camera for the model in the scene.
+
+        Args:
+            model_name: Model identifier (decides preset framing)
+
+        Returns:
+            dict: Camera configurations for all angles {angle_id: config}
+        """
+        with self.stats.stage('camera', model_name):
+            # Setup camera
+            self.setup_camera()
+
+            # Frame from presets or the model's bounding box
+            bbox_min, bbox_max = self.model_bounds()
+            self.model_corners = box_corners(bbox_min, bbox_max)
+            if self.catalog is not None:
+                self.catalog.update_measurement(model_name, bbox_min, bbox_max,
+                                                self.model_geometry.get('vertices'))
+            distance, table_height_mm = self.framing(model_name, bbox_min, bbox_max)
+        print(f"✓ Camera distance: {distance:.2f} meters")
+
+        # Get camera positions
+        return self.camera_positions.get_positions(distance, table_height_mm)
+
+    # ---- Size variants (see size_variants.py) ----------------------------
+
+    def mesh_objects(self):
+        """Mesh objects of the model in the scene"""
+        objects = (bpy.data.objects.get(name) for name in self.model_objects)
+        return [obj for obj in objects if obj is not None and obj.type == 'MESH']
+
+    def capture_base(self, obj_path):
+        """Keep the imported model's world-space vertices as the base for size variants"""
+        bpy.context.view_layer.update()  # Refresh matrix_world after re-centering
+        self.base_vertices = {}
+        for obj in self.mesh_objects():
+            coords = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+            obj.data.vertices.foreach_get('co', coords)
+            matrix = np.array(obj.matrix_world, dtype=np.float64)
+            self.base_vertices[obj.name] = (coords.reshape(-1, 3) @ matrix[:3, :3].T
+                                            + matrix[:3, 3], matrix)
+        self.base_model = model_key(obj_path, Path(obj_path).stem)
+
+    def apply_variant(self, dims):
+        """
+        Resize the base model in place to a variant's length, width and top thickness.
+
+        Args:
+            dims: Dimension dict ('length', 'width' and optional 'thickness' in mm)
+        """
+        names = list(self.base_vertices)
+        world = np.concatenate([self.base_vertices[name][0] for name in names])
+        thickness = dims.get('thickness')
+        if thickness and top_thickness(world) is None:
+            print(f"⚠ Top thickness kept as modeled: the top does not overhang the legs, "
+                  f"so {thickness:.0f}mm cannot be applied")
+            thickness = None
+        resized = resize_table(world, dims['length'] / 1000.0, dims['width'] / 1000.0,
+                               thickness / 1000.0 if thickness else None)
+
+        start = 0
+        for name in names:
+            base, matrix = self.base_vertices[name]
+            part = resized[start:start + len(base)]
+            start += len(base)
+            local = (part - matrix[:3, 3]) @ np.linalg.inv(matrix[:3, :3]).T
+            mesh = bpy.data.objects[name].data
+            mesh.vertices.foreach_set('co', local.astype(np.float32).ravel())
+            mesh.update()
+        print(f"✓ Resized to {dims['length']:.0f}×{dims['width']:.0f}mm"
+              + (f", {thickness:.0f}mm top" if thickness else ""))
+
+    def resize_loaded(self, obj_path, model_name):
+        """
+        Turn the loaded base model into the current variant and reframe it.
+
+        Returns:
+            dict: Camera configurations for all angles {angle_id: config}
+        """
+        with self.stats.stage('resize', model_name):
+            self.apply_variant(self.variant)
+        positions = self.frame_model(model_name)
+        self.loaded_model = self.variant_key(obj_path, model_name)
+        self.loaded_positions = positions
+        return positions
+
+    def variant_key(self, obj_path, model_name):
+        """model_key() of the scene contents, including the variant size if resized"""
+        key = model_key(obj_path, model_name)
+        if self.variant is not None:
+            key += (VARIANT_METHOD, self.variant['length'], self.variant['width'],
+                    self.variant.get('thickness'))
+        return key
+
+    def model_bounds(self):
+        """
+        World-space bounding box of the imported model.
+        Reads each object's bound_box corners as arrays instead of looping
+        over vertices, so it is constant-time in mesh size.
+
+        Returns:
+            tuple: (bbox_min, bbox_max) as numpy arrays in meters
+        """
+        bpy.context.view_layer.update()  # Refresh matrix_world after re-centering
+
+        corners = []
+        for name in self.model_objects:
+            obj = bpy.data.objects.get(name)
+            if obj is None or obj.type != 'MESH':
+                continue
+            local = np.array(obj.bound_box, dtype=np.float64)
+            matrix = np.array(obj.matrix_world, dtype=np.float64)
+            corners.append(local @ matrix[:3, :3].T + matrix[:3, 3])
+
+        if not corners:
+            raise Exception("Imported model has no mesh geometry")
+
+        corners = np.concatenate(corners)
+        return corners.min(axis=0), corners.max(axis=0)
+
+    def uses_bbox_framing(self, model_name):
+        """Whether a model is framed from its bounding box rather than a preset"""
+        return self.auto_frame or get_model_dimensions(model_name, self.catalog) is None
+
+    def framing(self, model_name, bbox_min, bbox_max):
+        """
+        Choose camera distance and table height for a model.
+
+        Args:
+            model_name: Model identifier
+            bbox_min, bbox_max: World bounding box in meters
+
+        Returns:
+            tuple: (distance in meters, table height in millimeters)
+        """
+        if not self.uses_bbox_framing(model_name):
+            return calculate_optimal_camera_distance(model_name, self.catalog), 750
+
+        distance = calculate_framing_distance(
+            bbox_min, bbox_max, fill=self.frame_fill,
+            lens_mm=50, sensor_mm=36,
+            aspect=self.resolution[0] / self.resolution[1]
+        )
+        table_height_mm = max(float(bbox_max[2]), 0.01) * 1000.0
+        print(f"✓ Auto-framed from bounding box "
+              f"{bbox_max[0] - bbox_min[0]:.2f}×{bbox_max[1] - bbox_min[1]:.2f}×"
+              f"{bbox_max[2] - bbox_min[2]:.2f}m, {self.frame_fill:.0%} fill")
+        return distance, table_height_mm
+
+    def framing_key(self, model_name, angle_id):
+        """
+        Cache-key description of an angle's camera, computable before import.
+        Bounding-box framing depends only on the model bytes (already in the
+        key) and the fill parameter.
+        """
+        if self.uses_bbox_framing(model_name):
+            shape = self.camera_positions.get_positions(1.0).get(angle_id)
+            camera = {'mode': 'bbox', 'fill': self.frame_fill, 'angle': shape}
+        else:
+            distance = calculate_optimal_camera_distance(model_name, self.catalog)
+            angle = self.camera_positions.get_positions(distance).get(angle_id)
+            camera = {'mode': 'preset', 'angle': angle}
+        camera['crop'] = {'margin': CROP_MARGIN, 'frame': 'full'} if self.crop else None
+        if self.variant is not None:
+            camera['variant'] = {'method': VARIANT_METHOD, 'length': self.variant['length'],
+                                 'width': self.variant['width'],
+                                 'thickness': self.variant.get('thickness')}
+        return camera
+
+    def apply_render_border(self, border, crop_to_border=False):
+        """
+        Limit rendering to a region of the frame, or reset to the full frame.
+
+        Args:
+            border: (min_x, min_y, max_x, max_y) in 0-1 frame coordinates, or None
+            crop_to_border: If True, save only the border region (tiles, which
+                are stitched back together); otherwise the image keeps the
+                full resolution and the rest of the frame stays unrendered
+        """
+        render = bpy.context.scene.render
+        self.render_border = border
+        if border is None:
+            render.use_border = False
+            return
+
+        render.use_border = True
+        render.use_crop_to_border = crop_to_border
+        render.border_min_x, render.border_min_y, render.border_max_x, render.border_max_y = border
+
+    def fill_unrendered(self, image_path):
+        """
+        Paint the frame outside the crop border with the studio background.
+
+        Opaque crop renders only; on a transparent film the unrendered
+        pixels already have alpha 0.
+
+        Args:
+            image_path: Rendered full-frame PNG
+        """
+        if not self.crop or self.transparent or self.render_border is None:
+            return
+        fill_outside_border(image_path, self.render_border, CROP_FILL_COLOR)
+
+    def projected_border(self, camera):
+        """
+        Frame region covered by the model's bounding box from the current pose.
+
+        Args:
+            camera: Positioned camera object
+
+        Returns:
+            tuple: (min_x, min_y, max_x, max_y) in 0-1 frame coordinates
+        """
+        from bpy_extras.object_utils import world_to_camera_view
+        import mathutils
+
+        bpy.context.view_layer.update()  # Refresh camera matrix_world
+        scene = bpy.context.scene
+        projected = np.array([
+            tuple(world_to_camera_view(scene, camera, mathutils.Vector(corner)))[:2]
+            for corner in self.model_corners
+        ])
+        lo = np.clip(projected.min(axis=0) - CROP_MARGIN, 0.0, 1.0)
+        hi = np.clip(projected.max(axis=0) + CROP_MARGIN, 0.0, 1.0)
+        return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+
+    def process_model(self, obj_path, model_name=None, angles=None, reuse_loaded=False,
+                      variant=None):
         """
         Complete processing pipeline for single model.
 
@@ -228,6 +878,10 @@ class BlenderAutomation:
             obj_path: Path to .obj file
             model_name: Model identifier (e.g., '150x80'). If None, extracted from filename.
             angles: List of angle IDs to render (None = standard 4 angles)
+            reuse_loaded: If True and the same unchanged model is already in the
+                scene, skip setup and import and only render
+            variant: Dimension dict to resize the model to (size variants);
+                the base model is imported only if it is not already loaded
 
         Returns:
             dict: {angle_id: output_path}
@@ -240,127 +894,917 @@ class BlenderAutomation:
         print(f"Processing: {model_name}")
         print(f"{'='*60}\n")
 
-        # Setup scene
-        self.setup_scene()
+        # Use standard 4-angle set if angles not specified
+        if angles is None:
+            angles = self.camera_positions.get_standard_set()
+        self.variant = variant
+
+        # Serve unchanged angles from the render cache, before any import
+        with self.stats.stage('cache_lookup', model_name, angles=len(angles)) as info:
+            output_files, cache_keys = self.lookup_cached_angles(obj_path, model_name, angles)
+            info['hits'] = len(output_files)
+        for angle_id, output_path in output_files.items():
+            self.record_angle(model_name, angle_id, 'success', output_path, 0.0, cached=True)
+        if output_files and not cache_keys:
+            print(f"\n✓ Completed {model_name}: all {len(output_files)} angles from cache\n")
+            return output_files
+
+        start = time.time()
+        try:
+            if reuse_loaded and self.loaded_model == self.variant_key(obj_path, model_name):
+                positions = self.loaded_positions
+                print("✓ Reusing loaded model and scene")
+            elif variant is not None and self.base_model == model_key(obj_path,
+                                                                      Path(obj_path).stem):
+                positions = self.resize_loaded(obj_path, model_name)
+                print("✓ Reusing imported base model")
+            else:
+                positions = self.prepare_model(obj_path, model_name)
+
+            # Filter to requested angles not already served from cache
+            positions = {k: v for k, v in positions.items()
+                         if k in angles and k not in output_files}
+
+            print(f"\nRendering {len(positions)} angles...")
+
+            def finish_angle(angle_id, output_path, duration):
+                output_files[angle_id] = output_path
+                extra = dict(self.model_geometry)
+                if angle_id in self.pass_files:
+                    extra['passes'] = {suffix: str(path)
+                                       for suffix, path in self.pass_files.pop(angle_id).items()}
+                self.record_angle(model_name, angle_id, 'success', output_path, duration, **extra)
+                if angle_id in cache_keys:
+                    self.cache.store(cache_keys[angle_id], output_path)
+
+            # Passes are written per render_angle() call, so they need one render per angle
+            if self.keyframed_angles and len(positions) > 1 and not self.passes:
+                # One animation render: scene sync and BVH paid once per model
+                self.render_angles_keyframed(positions, model_name, finish_angle)
+            else:
+                # Render each angle
+                for angle_id, angle_config in positions.items():
+                    angle_start = time.time()
+                    output_path = self.render_angle(angle_id, angle_config, model_name)
+                    finish_angle(angle_id, output_path, time.time() - angle_start)
 
-        # Import model
-        model_obj = self.import_model(obj_path)
+        except Exception as e:
+            # Every requested angle that did not finish is recorded as failed
+            for angle_id in angles:
+                if angle_id not in output_files:
+                    self.record_angle(model_name, angle_id, 'failed', duration=time.time() - start,
+                                      error=str(e))
+            raise
 
-        # Apply materials and lighting
-        complete_scene_setup(model_obj, auto_assign_materials=False)
+        print(f"\n✓ Completed {model_name}: {len(positions)} angles rendered")
+        print(f"  Output: {self.output_dir / model_name}\n")
 
-        # Setup camera
-        camera = self.setup_camera()
+        return output_files
 
-        # Calculate optimal camera distance
-        distance = calculate_optimal_camera_distance(model_name)
-        print(f"✓ Camera distance: {distance:.2f} meters")
+    def process_variants(self, obj_path, names=None, angles=None):
+        """
+        Render size variants of one base model from a single import.
 
-        # Get camera positions
-        positions = self.camera_positions.get_positions(distance)
+        Each variant is the base model resized in the scene (size_variants.py),
+        framed with its own camera distance and written to the usual
+        <output>/<variant>/angle_<id>.png layout.
 
-        # Use standard 4-angle set if angles not specified
-        if angles is None:
-            angles = self.camera_positions.get_standard_set()
+        Args:
+            obj_path: Base model file
+            names: Variant size names (None = presets of the base model's category)
+            angles: List of angle IDs to render (None = standard 4 angles)
+
+        Returns:
+            dict: {variant name: {'status', 'files' or 'error'}}
+        """
+        sizes = variant_sizes(Path(obj_path).stem, names, self.catalog)
+        print(f"✓ {len(sizes)} size variants of {Path(obj_path).stem}: {', '.join(sizes)}")
+
+        results = {}
+        for name, dims in sizes.items():
+            try:
+                with self.stats.stage('model', name, variant=True):
+                    output_files = self.process_model(obj_path, name, angles, variant=dims)
+                results[name] = {'status': 'success', 'files': output_files}
+            except Exception as e:
+                print(f"\n❌ Failed to render variant {name}: {str(e)}")
+                results[name] = {'status': 'failed', 'error': str(e)}
+        return results
+
+    def record_angle(self, model_name, angle_id, status, output_path=None, duration=None,
+                     error=None, **extra):
+        """Append an angle result to the manifest and catalog, if configured"""
+        if self.manifest is not None:
+            self.manifest.record(model_name, angle_id, status, output=output_path,
+                                 duration=duration, error=error, tier=self.tier_name,
+                                 **extra)
+        if self.catalog is not None:
+            self.catalog.record_render(model_name, angle_id, self.tier_name, status,
+                                       output=output_path, duration=duration)
+
+    def lookup_cached_angles(self, obj_path, model_name, angles):
+        """
+        Materialize cached renders for the requested angles.
 
-        # Filter to requested angles
-        positions = {k: v for k, v in positions.items() if k in angles}
+        Args:
+            obj_path: Path to .obj file
+            model_name: Model identifier
+            angles: Requested angle IDs
+
+        Returns:
+            tuple: ({angle_id: output_path} for hits, {angle_id: cache_key} for misses)
+        """
+        # Cache entries hold only the beauty PNG; passes always render
+        if self.cache is None or self.passes:
+            return {}, {}
+
+        positions = self.camera_positions.get_positions(1.0)
+        model_hash = self.cache.model_hash(obj_path)
+        settings = self.render_settings()
+
+        hits, misses = {}, {}
+        for angle_id in angles:
+            if angle_id not in positions:
+                continue
+            key = render_key(model_hash, self.framing_key(model_name, angle_id), settings)
+            entry = self.cache.lookup(key)
+            if entry is None:
+                misses[angle_id] = key
+                continue
+            output_path = self.output_path(model_name, angle_id)
+            self.cache.materialize(entry, output_path)
+            hits[angle_id] = output_path
+            print(f"✓ Cache hit {positions[angle_id]['name']}: {output_path.name}")
+
+        return hits, misses
+
+    # ---- Tiled rendering (see tiled_render.py) ---------------------------
+
+    def tile_key(self, model_hash, model_name, angle_id, tile):
+        """Render cache key of one tile of an angle"""
+        camera = {**self.framing_key(model_name, angle_id), 'tile': tile['render']}
+        return render_key(model_hash, camera, self.render_settings())
+
+    def render_tile(self, angle_config, tile, tile_file):
+        """
+        Render the border region of one tile.
+
+        Args:
+            angle_config: Camera configuration of the angle
+            tile: Tile dict from plan_tiles()
+            tile_file: Output PNG path
+
+        Returns:
+            Path: Tile PNG path
+        """
+        camera = bpy.context.scene.camera
+        self.position_camera(camera, angle_config)
+        self.apply_render_border(tile_border(tile, *self.resolution), crop_to_border=True)
+
+        tile_file = Path(tile_file)
+        tile_file.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = tile_file.with_name(f".{tile_file.stem}.partial.png")
+        bpy.context.scene.render.filepath = str(partial_path)
+        bpy.ops.render.render(write_still=True)
+        os.replace(partial_path, tile_file)
+        return tile_file
+
+    def render_tile_jobs(self, obj_path, model_name, jobs):
+        """
+        Render a list of tile jobs of one model (tile worker process).
+
+        Args:
+            obj_path: Model file
+            model_name: Model identifier
+            jobs: [{'angle', 'tile', 'path', 'key'}, ...]
+
+        Returns:
+            dict: {'<angle>/<tile id>': {'status', 'path' or 'error', 'duration'}}
+        """
+        self.variant = None
+        positions = self.prepare_model(obj_path, model_name)
+        results = {}
+        for job in jobs:
+            job_id = f"{job['angle']}/{job['tile']['id']}"
+            start = time.time()
+            try:
+                with self.stats.stage('render_tile', model_name, job['angle'], tile=job['tile']['id'],
+                                      **self.render_fields()):
+                    tile_file = self.render_tile(positions[job['angle']], job['tile'], job['path'])
+                if self.cache is not None and job.get('key'):
+                    self.cache.store(job['key'], tile_file)
+                results[job_id] = {'status': 'success', 'path': str(tile_file),
+                                   'duration': round(time.time() - start, 3)}
+                print(f"✓ Rendered tile {job_id}")
+            except Exception as e:
+                results[job_id] = {'status': 'failed', 'error': str(e),
+                                   'duration': round(time.time() - start, 3)}
+                print(f"❌ Tile {job_id} failed: {e}")
+        return results
+
+    def process_model_tiled(self, obj_path, model_name=None, angles=None, grid=(2, 2),
+                            overlap=DEFAULT_TILE_OVERLAP, workers=1, pin_cores=False,
+                            worker_args=()):
+        """
+        Render each angle as a grid of border tiles and stitch them.
+
+        Tiles finished by an earlier run (same render key) are reused, so a
+        crashed worker only costs its own tiles.
+
+        Args:
+            obj_path: Path to the model file
+            model_name: Model identifier (None = file name)
+            angles: Angle IDs to render (None = standard set)
+            grid: (columns, rows)
+            overlap: Pixels each tile extends into its neighbours
+            workers: Blender processes rendering tiles (1 = this process)
+            pin_cores: If True, pin each tile worker to its own cores
+            worker_args: batch_render.py flags forwarded to tile workers
+
+        Returns:
+            dict: {angle_id: output_path}
+        """
+        model_name = model_name or Path(obj_path).stem
+        angles = angles or self.camera_positions.get_standard_set()
+        self.crop = False  # Tiles always cover the full frame
+
+        print(f"\n{'='*60}")
+        print(f"Processing (tiled {grid[0]}×{grid[1]}): {model_name}")
+        print(f"{'='*60}\n")
 
-        print(f"\nRendering {len(positions)} angles...")
+        tiles = plan_tiles(*self.resolution, grid, overlap)
+        model_hash = self.cache.model_hash(obj_path) if self.cache else hash_file(obj_path)
+
+        jobs, tile_files = [], {}
+        for angle_id in angles:
+            for tile in tiles:
+                key = self.tile_key(model_hash, model_name, angle_id, tile)
+                path = tile_path(self.output_dir, model_name, angle_id, tile, key)
+                tile_files[(angle_id, tile['id'])] = path
+                if path.exists():
+                    continue
+                entry = self.cache.lookup(key) if self.cache else None
+                if entry is not None:
+                    self.cache.materialize(entry, path)
+                    continue
+                jobs.append({'angle': angle_id, 'tile': tile, 'path': str(path),
+                             'key': key if self.cache else None})
+
+        reused = len(tile_files) - len(jobs)
+        print(f"✓ {len(tile_files)} tiles, {reused} reused, {len(jobs)} to render")
+
+        start = time.time()
+        if jobs and workers > 1:
+            results = run_tile_workers(obj_path, jobs, self.output_dir, workers,
+                                       bpy.app.binary_path, resolution=self.resolution,
+                                       threads_per_worker=self.threads, pin_cores=pin_cores,
+                                       worker_args=worker_args)
+        elif jobs:
+            results = self.render_tile_jobs(obj_path, model_name, jobs)
+        else:
+            results = {}
+        failed = sum(1 for r in results.values() if r['status'] != 'success')
 
-        # Render each angle
         output_files = {}
-        for angle_id, angle_config in positions.items():
-            output_path = self.render_angle(angle_id, angle_config, model_name)
+        for angle_id in angles:
+            entries = [(tile, tile_files[(angle_id, tile['id'])]) for tile in tiles]
+            missing = [path.name for _, path in entries if not path.exists()]
+            if missing:
+                self.record_angle(model_name, angle_id, 'failed', duration=time.time() - start,
+                                  error=f"missing tiles: {', '.join(missing)}")
+                continue
+            output_path = self.output_path(model_name, angle_id)
+            with self.stats.stage('stitch', model_name, angle_id, tiles=len(tiles)):
+                stitch_angle(entries, self.resolution, output_path, alpha=self.transparent)
             output_files[angle_id] = output_path
+            self.record_angle(model_name, angle_id, 'success', output_path,
+                              time.time() - start, tiles=len(tiles))
+            print(f"✓ Stitched {angle_id}: {output_path.name}")
 
-        print(f"\n✓ Completed {model_name}: {len(positions)} angles rendered")
-        print(f"  Output: {self.output_dir / model_name}\n")
+        if len(output_files) < len(angles):
+            raise Exception(f"{len(angles) - len(output_files)} angles incomplete "
+                            f"({failed} tiles failed); re-run to render only the missing tiles")
 
+        print(f"\n✓ Completed {model_name}: {len(output_files)} angles from "
+              f"{len(tile_files)} tiles")
         return output_files
 
 
-def direction_to_rotation(direction):
+@contextmanager
+def render_phase_handlers(phases):
     """
-    Convert direction vector to rotation quaternion.
+    Feed Blender's render status updates into a RenderPhases while rendering.
 
     Args:
-        direction: (x, y, z) direction vector
-
-    Returns:
-        mathutils.Quaternion: Rotation quaternion
+        phases: RenderPhases to update
     """
-    import mathutils
+    def on_stats(stats, *args):
+        phases.on_stats(str(stats))
 
-    # Normalize direction
-    direction = mathutils.Vector(direction).normalized()
+    def on_post(*args):
+        phases.mark('write')
 
-    # Default forward direction (-Y in Blender)
-    forward = mathutils.Vector((0, -1, 0))
+    handlers = bpy.app.handlers
+    handlers.render_stats.append(on_stats)
+    handlers.render_post.append(on_post)
+    try:
+        yield phases
+    finally:
+        handlers.render_stats.remove(on_stats)
+        handlers.render_post.remove(on_post)
 
-    # Calculate rotation between forward and direction
-    rotation = forward.rotation_difference(direction)
 
-    return rotation
+def box_corners(bbox_min, bbox_max):
+    """The 8 corners of an axis-aligned box as an 8x3 array"""
+    return np.array([
+        (x, y, z)
+        for x in (bbox_min[0], bbox_max[0])
+        for y in (bbox_min[1], bbox_max[1])
+        for z in (bbox_min[2], bbox_max[2])
+    ])
 
 
-def batch_process_directory(input_dir, output_dir, angles=None, resolution=(2048, 2048)):
+def stitch_angle(entries, resolution, output_path, alpha=False):
     """
-    Process all .obj files in directory tree.
+    Stitch rendered tile PNGs into one frame and save it as PNG.
 
     Args:
-        input_dir: Directory containing .obj files (searched recursively)
-        output_dir: Output directory for renders
-        angles: List of angle IDs to render (None = standard 4 angles)
-        resolution: Output resolution tuple (width, height)
+        entries: [(tile, tile PNG path), ...] covering the frame
+        resolution: (width, height) of the frame
+        output_path: Stitched PNG path (written atomically)
+        alpha: If True, keep the tiles' alpha (transparent film)
     """
-    automation = BlenderAutomation(output_dir=output_dir, resolution=resolution)
-    input_path = Path(input_dir)
+    tile_pixels = []
+    for tile, path in entries:
+        image = bpy.data.images.load(str(path))
+        try:
+            width, height = image.size
+            pixels = np.empty(width * height * 4, dtype=np.float32)
+            image.pixels.foreach_get(pixels)  # Rows bottom-up, RGBA
+            tile_pixels.append((tile, pixels.reshape(height, width, 4)))
+        finally:
+            bpy.data.images.remove(image)
+
+    width, height = resolution
+    frame = stitch_tiles(width, height, tile_pixels)
+    if not alpha:
+        frame[..., 3] = 1.0
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = output_path.with_name(f".{output_path.stem}.partial.png")
+    image = bpy.data.images.new(output_path.stem, width, height, alpha=alpha)
+    try:
+        image.pixels.foreach_set(frame.ravel())
+        image.filepath_raw = str(partial_path)
+        image.file_format = 'PNG'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+    os.replace(partial_path, output_path)
 
-    # Find all .obj files recursively
-    obj_files = list(input_path.glob('**/*.obj'))
 
-    if not obj_files:
-        print(f"❌ No .obj files found in {input_dir}")
-        return
+def fill_outside_border(image_path, border, color):
+    """
+    Fill the unrendered part of a full-frame border render in place.
 
-    print(f"\n{'='*60}")
-    print(f"BATCH PROCESSING: {len(obj_files)} models found")
-    print(f"{'='*60}\n")
+    Blender leaves pixels outside render.border black. Only pure black
+    pixels outside the border are replaced, so rounding of the border
+    edge never overwrites rendered pixels.
 
-    success_count = 0
-    fail_count = 0
+    Args:
+        image_path: PNG rendered with a border and without crop-to-border
+        border: (min_x, min_y, max_x, max_y) in 0-1 frame coordinates
+        color: RGB fill in 0-1 display values
+    """
+    image = bpy.data.images.load(str(image_path))
+    try:
+        width, height = image.size
+        channels = image.channels
+        pixels = np.empty(width * height * channels, dtype=np.float32)
+        image.pixels.foreach_get(pixels)  # Rows bottom-up, like the border
+        pixels = pixels.reshape(height, width, channels)
+
+        x0, y0 = int(border[0] * width) + 1, int(border[1] * height) + 1
+        x1, y1 = int(np.ceil(border[2] * width)) - 1, int(np.ceil(border[3] * height)) - 1
+        outside = np.ones((height, width), dtype=bool)
+        outside[max(y0, 0):max(y1, 0), max(x0, 0):max(x1, 0)] = False
+        mask = outside & (pixels[..., :3] == 0).all(axis=2)
+        pixels[mask, :3] = color
+        if channels == 4:
+            pixels[mask, 3] = 1.0
+
+        image.pixels.foreach_set(pixels.ravel())
+        image.filepath_raw = str(image_path)
+        image.file_format = 'PNG'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+
+def model_key(obj_path, model_name):
+    """Identify a model file version (path, modification time, name) for scene reuse"""
+    obj_path = Path(obj_path).resolve()
+    return (str(obj_path), obj_path.stat().st_mtime_ns, model_name)
+
+
+def process_model_list(automation, obj_files, angles=None, resume=False):
+    """
+    Render a list of models sequentially in this Blender process.
+
+    Args:
+        automation: BlenderAutomation instance
+        obj_files: Model paths, or (path, angle IDs) jobs; a model may appear
+            in several jobs (hero-first scheduling)
+        angles: List of angle IDs to render (None = standard 4 angles)
+        resume: If True, skip angles the catalog (or manifest) records as completed
+
+    Returns:
+        dict: {model_name: {'status', 'files' or 'error'}}
+    """
     results = {}
+    default_angles = angles or automation.camera_positions.get_standard_set()
 
-    for i, obj_file in enumerate(obj_files, 1):
+    for i, job in enumerate(obj_files, 1):
+        obj_file, job_angles = job if isinstance(job, tuple) else (job, None)
+        requested = job_angles or default_angles
         # Extract model name from filename
         model_name = obj_file.stem
 
-        print(f"\n[{i}/{len(obj_files)}] Processing: {model_name}")
+        print(f"\n[{i}/{len(obj_files)}] Processing: {model_name}"
+              f"{f' ({len(requested)} angles)' if job_angles else ''}")
+
+        pending, done_files = requested, {}
+        progress = automation.catalog or automation.manifest
+        if resume and progress is not None:
+            pending = progress.pending_angles(model_name, requested, automation.tier_name)
+            done_files = progress.completed_files(model_name, requested, automation.tier_name)
+            if not pending:
+                print(f"✓ Skipping {model_name}: all angles completed in a previous run")
+                merge_model_result(results, model_name,
+                                   {'status': 'success', 'files': done_files, 'resumed': True})
+                continue
+
+        cache_before = automation.cache.stats() if automation.cache else None
 
         try:
-            output_files = automation.process_model(obj_file, model_name, angles)
-            results[model_name] = {'status': 'success', 'files': output_files}
-            success_count += 1
+            with automation.stats.stage('model', model_name, angles=len(pending)):
+                output_files = automation.process_model(obj_file, model_name, pending)
+            result = {'status': 'success', 'files': {**done_files, **output_files}}
 
         except Exception as e:
             print(f"\n❌ Failed to process {model_name}: {str(e)}")
-            results[model_name] = {'status': 'failed', 'error': str(e)}
-            fail_count += 1
+            result = {'status': 'failed', 'error': str(e)}
+
+        if cache_before is not None:
+            cache_after = automation.cache.stats()
+            result['cache'] = {
+                k: cache_after[k] - cache_before[k] for k in cache_after
+            }
+        merge_model_result(results, model_name, result)
+
+    return results
+
+
+def print_batch_summary(results, output_dir):
+    """
+    Print the end-of-batch summary.
+
+    Args:
+        results: {model_name: result} from batch processing
+        output_dir: Output directory for renders
+    """
+    total = len(results)
+    success_count = sum(1 for r in results.values() if r['status'] == 'success')
+    fail_count = total - success_count
 
-    # Summary
     print(f"\n{'='*60}")
     print(f"BATCH COMPLETE")
     print(f"{'='*60}")
-    print(f"✓ Success: {success_count}/{len(obj_files)}")
+    print(f"✓ Success: {success_count}/{total}")
     if fail_count > 0:
-        print(f"❌ Failed:  {fail_count}/{len(obj_files)}")
+        print(f"❌ Failed:  {fail_count}/{total}")
+        for model_name, result in results.items():
+            if result['status'] != 'success':
+                print(f"  • {model_name}: {result.get('error')}")
+
+    cache_stats = [r['cache'] for r in results.values() if 'cache' in r]
+    resumed = sum(1 for r in results.values() if r.get('resumed'))
+    if resumed:
+        print(f"Resumed: {resumed} models already complete in manifest")
+
+    aliases = {name: r for name, r in results.items() if r.get('alias_of')}
+    if aliases:
+        saved = sum(r.get('saved_seconds', 0.0) for r in aliases.values())
+        print(f"Deduplicated: {len(aliases)} models share geometry with a rendered model "
+              f"({format_duration(saved)} of rendering saved)")
+        for model_name, result in aliases.items():
+            print(f"  • {model_name} → {result['alias_of']}")
+
+    if cache_stats:
+        hits = sum(c['hits'] for c in cache_stats)
+        misses = sum(c['misses'] for c in cache_stats)
+        lookups = hits + misses
+        hit_rate = 100 * hits / lookups if lookups else 0.0
+        print(f"Render cache: {hits} hits, {misses} misses ({hit_rate:.0f}% hit rate)")
+
     print(f"Output directory: {output_dir}")
     print(f"{'='*60}\n")
 
+
+def make_cache(cache_dir, cache_max_gb):
+    """Create a RenderCache, or None when caching is disabled"""
+    if not cache_dir:
+        return None
+    return RenderCache(cache_dir, max_bytes=int(cache_max_gb * 1024**3))
+
+
+def make_catalog(catalog_path):
+    """Open a ModelCatalog, or None when no catalog is configured"""
+    if not catalog_path:
+        return None
+    return ModelCatalog(catalog_path)
+
+
+def requested_angles(angles, automation_options):
+    """Angle IDs a run renders per model: the given ones, or the default set"""
+    if angles:
+        return list(angles)
+    if automation_options.get('turntable_steps'):
+        return OrbitCameraPositions(automation_options['turntable_steps'],
+                                    automation_options.get('orbit_elevations', (15.0,)),
+                                    automation_options.get('orbit_roll', 0.0)).get_standard_set()
+    return CameraPositions.get_standard_set()
+
+
+def framing_group(model_name, catalog=None, auto_frame=False):
+    """Camera framing that renders depend on besides the geometry (for dedup)"""
+    if auto_frame or get_model_dimensions(model_name, catalog) is None:
+        return 'bbox'  # Framed from the bounding box, i.e. from the geometry
+    return round(calculate_optimal_camera_distance(model_name, catalog), 6)
+
+
+def link_aliases(aliases, results, output_dir, manifest, catalog=None, tier=DEFAULT_TIER):
+    """
+    Give every deduplicated model the outputs of the model rendered for it.
+
+    Outputs are hardlinked to the usual <output>/<model>/angle_<id>.png
+    paths and recorded in the manifest (and catalog) with alias_of, so
+    post-processing and --resume treat them like renders.
+
+    Args:
+        aliases: {alias path: canonical path} from find_duplicates()
+        results: {model_name: result}; alias results are added
+        output_dir: Output directory for renders
+        manifest: RenderManifest with the canonical models' records
+        catalog: ModelCatalog to record alias renders in (None = no catalog)
+        tier: Render tier of the run
+    """
+    for alias, canonical in aliases.items():
+        source = results.get(canonical.stem)
+        if source is None or source['status'] != 'success':
+            error = source.get('error') if source else 'not rendered'
+            results[alias.stem] = {'status': 'failed', 'alias_of': canonical.stem,
+                                   'error': f"duplicate of {canonical.stem}: {error}"}
+            continue
+
+        files, saved = {}, 0.0
+        for angle_id, source_path in source['files'].items():
+            output_path = Path(output_dir) / alias.stem / f"angle_{angle_id}.png"
+            link_file(source_path, output_path)
+            files[angle_id] = output_path
+            record = manifest.records.get((canonical.stem, angle_id)) or {}
+            saved += record.get('duration') or 0.0
+            passes = {}
+            for suffix, pass_file in (record.get('passes') or {}).items():
+                passes[suffix] = pass_path(output_path, suffix, Path(pass_file).suffix[1:])
+                link_file(pass_file, passes[suffix])
+            extra = {'passes': {k: str(v) for k, v in passes.items()}} if passes else {}
+            manifest.record(alias.stem, angle_id, 'success', output=output_path, duration=0.0,
+                            tier=tier, alias_of=canonical.stem, **extra)
+            if catalog is not None:
+                catalog.record_render(alias.stem, angle_id, tier, 'success',
+                                      output=output_path, duration=0.0)
+        results[alias.stem] = {'status': 'success', 'files': files, 'alias_of': canonical.stem,
+                               'saved_seconds': saved}
+
+
+def batch_process_directory(input_dir, output_dir, angles=None, resolution=(2048, 2048),
+                            workers=1, threads=None, pin_cores=False,
+                            cache_dir=None, cache_max_gb=20, resume=False,
+                            preflight=True, catalog_path=None, stats_path=None,
+                            schedule=DEFAULT_POLICY, dedup=True, worker_args=(),
+                            preflight_scan=None, **automation_options):
+    """
+    Process all model files (.obj, .glb/.gltf, .stl, .ply) in directory tree.
+
+    Args:
+        input_dir: Directory containing model files (searched recursively)
+        output_dir: Output directory for renders
+        angles: List of angle IDs to render (None = standard 4 angles)
+        resolution: Output resolution tuple (width, height)
+        workers: Number of Blender processes (1 = render in this process)
+        threads: Cycles CPU threads per process (None = auto)
+        pin_cores: If True, pin each worker process to its own cores
+        cache_dir: Render cache directory (None = no cache)
+        cache_max_gb: Render cache size limit for LRU eviction
+        resume: If True, skip (model, angle) pairs completed in the manifest
+            and retry failed ones
+        preflight: If True, scan .obj files without Blender first, skip invalid
+            ones and render the heaviest models first
+        catalog_path: SQLite model catalog; models are registered in it and
+            --resume planning becomes a catalog query (None = no catalog)
+        stats_path: JSON-lines file for per-stage timings of all processes;
+            summarized with a Chrome trace at the end (None = no stats)
+        schedule: Job order, 'longest-first' or 'hero-first' (see render_cost.py);
+            durations are estimated from the timings of earlier runs
+        dedup: If True (and with preflight), render models with identical
+            geometry fingerprints once and link the outputs to the others
+        worker_args: batch_render.py flags forwarded to worker processes
+            (the CLI equivalents of automation_options)
+        preflight_scan: Scanner process from start_preflight() (None = scan here)
+        **automation_options: Extra BlenderAutomation options for in-process
+            rendering (persistent_studio, keyframed_angles, ...)
+    """
+    input_path = Path(input_dir)
+
+    # Find all model files recursively
+    obj_files = find_model_files(input_path)
+
+    if not obj_files:
+        print(f"❌ No model files ({', '.join(MODEL_EXTENSIONS)}) found in {input_dir}")
+        return
+
+    print(f"\n{'='*60}")
+    print(f"BATCH PROCESSING: {len(obj_files)} models found")
+    print(f"{'='*60}\n")
+
+    results = {}
+    if preflight:
+        obj_files, invalid = preflight_models(input_path, obj_files,
+                                              Path(output_dir) / INDEX_NAME, preflight_scan)
+        for obj_file, entry in invalid.items():
+            results[obj_file.stem] = {
+                'status': 'failed',
+                'error': f"pre-flight: {'; '.join(entry['errors'][:3])}"
+            }
+
+    # Per-angle progress survives crashes in <output>/manifest.jsonl
+    manifest = RenderManifest(Path(output_dir) / MANIFEST_NAME)
+    catalog = make_catalog(catalog_path)
+    if catalog is not None:
+        catalog.sync_files(obj_files)
+
+    # Repeated exports of the same geometry are rendered once
+    aliases = {}
+    if preflight and dedup:
+        auto_frame = automation_options.get('auto_frame', False)
+        aliases = find_duplicates(obj_files, load_index(Path(output_dir) / INDEX_NAME),
+                                  framing=lambda p: framing_group(p.stem, catalog, auto_frame))
+        if aliases:
+            print(f"✓ Geometry dedup: {len(aliases)} models duplicate "
+                  f"{len(set(aliases.values()))} others and will be linked, not rendered")
+            obj_files = [f for f in obj_files if f not in aliases]
+
+    requested = requested_angles(angles, automation_options)
+    tier = automation_options.get('tier', DEFAULT_TIER)
+    plan = {f.stem: requested for f in obj_files}
+    if resume:
+        progress = catalog or manifest
+        if catalog is not None:
+            plan = catalog.pending_models([f.stem for f in obj_files], requested, tier)
+        else:
+            plan = {f.stem: manifest.pending_angles(f.stem, requested, tier) for f in obj_files}
+        remaining = [f for f in obj_files if plan.get(f.stem)]
+        for obj_file in obj_files:
+            if not plan.get(obj_file.stem):
+                results[obj_file.stem] = {
+                    'status': 'success', 'resumed': True,
+                    'files': progress.completed_files(obj_file.stem, requested, tier)
+                }
+        print(f"✓ Resuming: {len(obj_files) - len(remaining)} models complete, "
+              f"{len(remaining)} to render")
+        obj_files = remaining
+
+    # Longest jobs first, balanced across workers by estimated duration
+    cost_model = CostModel.from_history(Path(output_dir) / STATS_DIR_NAME)
+    jobs = plan_jobs([(f, plan[f.stem]) for f in obj_files], cost_model, resolution,
+                     automation_options.get('samples') or get_tier(tier)['max_samples'],
+                     tier, index=load_index(Path(output_dir) / INDEX_NAME),
+                     lod_threshold=automation_options.get('lod_threshold',
+                                                          DEFAULT_LOD_THRESHOLD),
+                     policy=schedule, hero_angle=requested[0])
+    shards = balance_jobs(jobs, max(1, workers))
+    print_estimate(jobs, cost_model, len(shards))
+
+    if jobs and workers > 1:
+        worker_args = list(worker_args)
+        if resume:
+            worker_args.append('--resume')
+        if cache_dir:
+            worker_args += ['--cache-dir', str(cache_dir), '--cache-max-gb', str(cache_max_gb)]
+        if catalog_path:
+            worker_args += ['--catalog', str(catalog_path)]
+        if stats_path:
+            worker_args += ['--stats-file', str(stats_path)]
+
+        results.update(run_parallel_batch(
+            obj_files, output_dir, workers, bpy.app.binary_path,
+            angles=angles, resolution=resolution,
+            threads_per_worker=threads, pin_cores=pin_cores,
+            worker_args=worker_args, shards=shards
+        ))
+    elif jobs:
+        automation = BlenderAutomation(output_dir=output_dir, resolution=resolution,
+                                       threads=threads,
+                                       cache=make_cache(cache_dir, cache_max_gb),
+                                       manifest=manifest, catalog=catalog,
+                                       stats=RenderStats(stats_path),
+                                       **automation_options)
+        results.update(process_model_list(automation,
+                                          [(job['path'], job['angles']) for job in jobs],
+                                          angles, resume=resume))
+
+    if aliases:
+        manifest.load()  # Pick up the records of worker processes
+        link_aliases(aliases, results, output_dir, manifest, catalog, tier)
+
+    print_batch_summary(results, output_dir)
+    if stats_path:
+        report_stats(stats_path)
+
     return results
 
 
+def start_preflight(input_dir, index_path):
+    """
+    Start obj_scanner.py on a directory in a plain Python process.
+
+    The scanner runs outside Blender (sys.executable is Blender's bundled
+    Python) so its process pool does not fork the Blender process. It is
+    started first thing in __main__, so the scan overlaps the coordinator's
+    own setup and is finished before any Blender worker is spawned.
+
+    Args:
+        input_dir: Directory to scan
+        index_path: Model index to update (unchanged files are not rescanned)
+
+    Returns:
+        subprocess.Popen: The scanner process, or None if it could not start
+    """
+    scanner = [sys.executable, str(script_dir / 'obj_scanner.py'), str(input_dir),
+               '--index', str(index_path), '--quiet']
+    try:
+        return subprocess.Popen(scanner)
+    except OSError as e:
+        print(f"⚠ Pre-flight scan skipped: {e}")
+        return None
+
+
+def preflight_models(input_dir, model_files, index_path, scan=None):
+    """
+    Wait for the pre-flight scan of a directory and plan the batch.
+
+    Args:
+        input_dir: Directory to scan
+        model_files: Model paths found in it
+        index_path: Model index to update (unchanged files are not rescanned)
+        scan: Scanner already started with start_preflight() (None = start it now)
+
+    Returns:
+        tuple: (renderable paths, heaviest first; {path: index entry} of invalid files)
+    """
+    scan = scan or start_preflight(input_dir, index_path)
+    if scan is None:
+        return model_files, {}
+    scan.wait()  # Exit code 1 only means invalid files
+
+    renderable, invalid = plan_models(model_files, load_index(index_path))
+    for model_file, entry in invalid.items():
+        print(f"⚠ Skipping invalid model {model_file.name}: {entry['errors'][0]}")
+    return renderable, invalid
+
+
+def enqueue_models(queue, input_path, output_dir, angles, tier, preflight=True,
+                   catalog=None, retry_failed=False, preflight_scan=None):
+    """
+    Add (model, angle, tier) jobs for a model file or a directory of models.
+
+    Directories are pre-flight scanned like batch_process_directory, so
+    invalid files are never queued and the heaviest models are claimed first.
+
+    Args:
+        queue: RenderQueue
+        input_path: Model file or directory
+        output_dir: Output directory (holds the model index)
+        angles: Angle IDs (None = standard set)
+        tier: Render tier
+        preflight: If True, scan .obj files first
+        catalog: ModelCatalog to register the models in (None = no catalog)
+        retry_failed: If True, re-queue failed jobs of these models
+        preflight_scan: Scanner process from start_preflight() (None = scan here)
+
+    Returns:
+        int: Number of jobs added or re-queued
+    """
+    input_path = Path(input_path)
+    if input_path.is_dir():
+        model_files = find_model_files(input_path)
+        if preflight and model_files:
+            model_files, _ = preflight_models(input_path, model_files,
+                                              Path(output_dir) / INDEX_NAME, preflight_scan)
+    else:
+        model_files = [input_path]
+
+    if catalog is not None:
+        catalog.sync_files(model_files)
+    angles = angles or CameraPositions.get_standard_set()
+    added = queue.enqueue(model_files, angles, tier, retry_failed=retry_failed)
+    print(f"✓ Queued {added} new jobs ({len(model_files)} models × {len(angles)} angles, "
+          f"{tier} tier)")
+    return added
+
+
+def start_postprocessor(output_dir, args):
+    """
+    Launch postprocess.py to encode web formats and sizes as renders finish.
+
+    It follows <output>/manifest.jsonl in its own process pool and exits
+    after this Blender process has exited and the last render is encoded.
+
+    Returns:
+        subprocess.Popen: The post-processing process, or None if it could not start
+    """
+    command = [args.postprocess_python or sys.executable, str(script_dir / 'postprocess.py'),
+               str(output_dir), '--follow', '--until-pid', str(os.getpid()),
+               '--formats', *args.postprocess_formats,
+               '--sizes', *map(str, args.postprocess_sizes)]
+    if args.postprocess_backgrounds:
+        command += ['--backgrounds', *args.postprocess_backgrounds]
+    try:
+        process = subprocess.Popen(command)
+    except OSError as e:
+        print(f"⚠ Post-processing not started: {e}")
+        return None
+    print(f"✓ Post-processing {', '.join(args.postprocess_formats)} at full size and "
+          f"{', '.join(map(str, args.postprocess_sizes))}px (pid {process.pid})")
+    if args.postprocess_backgrounds:
+        print(f"  • Backgrounds: {', '.join(args.postprocess_backgrounds)}")
+    return process
+
+
+def automation_options(args):
+    """BlenderAutomation keyword options selected on the command line"""
+    return {
+        'persistent_studio': args.persistent_studio,
+        'keyframed_angles': args.keyframed_angles,
+        'tier': args.tier,
+        'auto_frame': args.auto_frame,
+        'frame_fill': args.frame_fill,
+        'crop': args.crop,
+        'auto_materials': args.auto_materials,
+        'mesh_cache_dir': args.mesh_cache_dir,
+        'lod_threshold': args.lod_threshold,
+        'turntable_steps': args.turntable,
+        'orbit_elevations': args.orbit_elevations,
+        'orbit_roll': args.orbit_roll,
+        'samples': args.samples,
+        'passes': args.passes,
+        'pass_format': args.pass_format,
+        'transparent': args.transparent,
+    }
+
+
+def worker_flags(args):
+    """Rendering flags the --workers coordinator forwards to each worker process"""
+    flags = []
+    if args.persistent_studio:
+        flags.append('--persistent-studio')
+    if args.keyframed_angles:
+        flags.append('--keyframed-angles')
+    flags += ['--tier', args.tier]
+    if args.samples:
+        flags += ['--samples', str(args.samples)]
+    if args.passes:
+        flags += ['--passes', *args.passes, '--pass-format', args.pass_format]
+    if args.transparent:
+        flags.append('--transparent')
+    if args.auto_frame:
+        flags.append('--auto-frame')
+    flags += ['--frame-fill', str(args.frame_fill)]
+    if args.crop:
+        flags.append('--crop')
+    if args.auto_materials:
+        flags.append('--auto-materials')
+    if args.mesh_cache_dir:
+        flags += ['--mesh-cache-dir', args.mesh_cache_dir]
+    flags += ['--lod-threshold', str(args.lod_threshold)]
+    if args.turntable:
+        flags += ['--turntable', str(args.turntable), '--orbit-roll', str(args.orbit_roll),
+                  '--orbit-elevations', *map(str, args.orbit_elevations)]
+    return flags
+
+
 def parse_arguments():
     """Parse command-line arguments (after '--')"""
     import argparse
@@ -388,12 +1832,26 @@ Examples:
 
   # All 8 angles (including isometric)
   blender --background --python batch_render.py -- ../references/3D-Models -o ../blender-output -a 0deg 45deg_left 45deg_right 30deg_top 15deg_top 60deg_left 60deg_right isometric
+
+  # 8 parallel Blender workers, each pinned to its own cores
+  blender --background --python batch_render.py -- ../references/3D-Models -o ../blender-output --workers 8 --pin-cores
+
+  # One 8K frame split into 4x2 tiles rendered by 4 Blender workers
+  blender --background --python batch_render.py -- ../references/3D-Models/Rectangular/150x80.obj -o ../blender-output -r 8192 8192 -a 45deg_left --tiles 4x2 --workers 4
+
+  # Render farm: queue a directory on shared storage, then run 4 workers on each host
+  blender --background --python batch_render.py -- ../references/3D-Models -o /shared/output --queue /shared/queue.sqlite -w 4
+  blender --background --python batch_render.py -- -o /shared/output --queue /shared/queue.sqlite -w 4
+
+  # Resident render service fed through a job directory
+  blender --background --factory-startup --python batch_render.py -- --serve ../render-jobs -o ../blender-output
         """
     )
 
     parser.add_argument(
         'input',
-        help='Path to .obj file or directory containing .obj files'
+        nargs='?',
+        help='Path to model file (.obj, .glb/.gltf, .stl, .ply), directory of models, or worker shard .json'
     )
 
     parser.add_argument(
@@ -417,7 +1875,322 @@ Examples:
         help='Output resolution in pixels (default: 2048 2048)'
     )
 
-    return parser.parse_args(args)
+    parser.add_argument(
+        '-q', '--tier',
+        choices=list(RENDER_TIERS),
+        default=DEFAULT_TIER,
+        help=f'Render quality tier: draft, proof or final (default: {DEFAULT_TIER})'
+    )
+
+    parser.add_argument(
+        '--samples',
+        type=int,
+        help="Override the tier's maximum Cycles samples (benchmarks, quick checks)"
+    )
+
+    parser.add_argument(
+        '--passes',
+        nargs='+',
+        choices=PASSES,
+        default=[],
+        metavar='PASS',
+        help=f"Also write these passes from the same render next to each angle: "
+             f"{', '.join(PASSES)}"
+    )
+
+    parser.add_argument(
+        '--pass-format',
+        choices=PASS_FORMATS,
+        default='png',
+        help='png: one mask/map per pass (default); exr: one multilayer EXR per angle'
+    )
+
+    parser.add_argument(
+        '--transparent',
+        action='store_true',
+        help='Render RGBA on a transparent film with ground shadows in alpha (see backgrounds.py)'
+    )
+
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=1,
+        help='Number of parallel Blender processes for directory input (default: 1)'
+    )
+
+    parser.add_argument(
+        '--threads',
+        type=int,
+        help='Cycles CPU threads per process (default: auto, or cores / workers)'
+    )
+
+    parser.add_argument(
+        '--pin-cores',
+        action='store_true',
+        help='Pin each worker process to its own group of CPU cores (Linux)'
+    )
+
+    parser.add_argument(
+        '--persistent-studio',
+        action='store_true',
+        help='Build lights, ground, world, camera and materials once per process and only swap models'
+    )
+
+    parser.add_argument(
+        '--keyframed-angles',
+        action='store_true',
+        help='Render all angles of a model as one keyframed animation (scene sync/BVH once per model)'
+    )
+
+    parser.add_argument(
+        '--turntable',
+        type=int,
+        default=0,
+        metavar='STEPS',
+        help='Add orbit poses every 360/STEPS degrees (e.g. 36 or 72); rendered by default when -a is not given'
+    )
+
+    parser.add_argument(
+        '--orbit-elevations',
+        nargs='+',
+        type=float,
+        default=[15.0],
+        metavar='DEG',
+        help='Elevation rings for --turntable in degrees (default: 15)'
+    )
+
+    parser.add_argument(
+        '--orbit-roll',
+        type=float,
+        default=0.0,
+        metavar='DEG',
+        help='Camera roll for --turntable poses in degrees (default: 0)'
+    )
+
+    parser.add_argument(
+        '--auto-materials',
+        action='store_true',
+        help='Assign red tabletop / green legs per face from geometry (upward faces above 0.5m)'
+    )
+
+    parser.add_argument(
+        '--auto-frame',
+        action='store_true',
+        help='Frame every model from its bounding box (models without presets always are)'
+    )
+
+    parser.add_argument(
+        '--frame-fill',
+        type=float,
+        default=0.8,
+        help='Share of the frame a bounding-box framed model should fill (default: 0.8)'
+    )
+
+    parser.add_argument(
+        '--crop',
+        action='store_true',
+        help='Sample only the region around the projected model bounding box (full-size output)'
+    )
+
+    parser.add_argument(
+        '--variants',
+        nargs='*',
+        metavar='SIZE',
+        help='Render size variants of a single model file from one import, e.g. 200x80 240x110 '
+             '(sizes are presets or LxW in cm; no sizes = every preset of the model\'s category)'
+    )
+
+    parser.add_argument(
+        '--tiles',
+        type=parse_tile_grid,
+        metavar='GRID',
+        help='Render single model files as a grid of border tiles, e.g. 2 (2×2) or 4x2; '
+             'with --workers, tiles render in parallel processes'
+    )
+
+    parser.add_argument(
+        '--tile-overlap',
+        type=int,
+        default=DEFAULT_TILE_OVERLAP,
+        metavar='PX',
+        help=f'Pixels each tile overlaps its neighbours for seamless stitching '
+             f'(default: {DEFAULT_TILE_OVERLAP})'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        help='Render cache directory; unchanged model/angle/settings combinations are not re-rendered'
+    )
+
+    parser.add_argument(
+        '--cache-max-gb',
+        type=float,
+        default=20,
+        help='Render cache size limit before least-recently-used eviction (default: 20)'
+    )
+
+    parser.add_argument(
+        '--mesh-cache-dir',
+        help='Store imported meshes as binary .npz keyed by file hash and rebuild from them on repeat imports'
+    )
+
+    parser.add_argument(
+        '--lod-threshold',
+        type=int,
+        default=DEFAULT_LOD_THRESHOLD,
+        help=f'Decimate meshes with at least this many vertices in draft/proof tiers '
+             f'(0 = never, default: {DEFAULT_LOD_THRESHOLD})'
+    )
+
+    parser.add_argument(
+        '--catalog',
+        metavar='DB',
+        help='SQLite model catalog: dimensions, measured sizes and per-angle/tier render status'
+    )
+
+    parser.add_argument(
+        '--no-preflight',
+        action='store_true',
+        help='Do not scan .obj files (obj_scanner.py) before rendering a directory'
+    )
+
+    parser.add_argument(
+        '--no-dedup',
+        action='store_true',
+        help='Render every model, even when its geometry fingerprint matches another one'
+    )
+
+    parser.add_argument(
+        '--schedule',
+        choices=SCHEDULE_POLICIES,
+        default=DEFAULT_POLICY,
+        help='Directory job order: longest-first (estimated from earlier runs\' timings, '
+             'balanced across workers) or hero-first (the first angle of every model, '
+             'then the rest) (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--stats-file',
+        metavar='FILE',
+        help='Append per-stage timings (wall/CPU time, peak memory, vertices, samples) to this '
+             'JSON-lines file (default: <output>/.stats/run-<time>.jsonl)'
+    )
+
+    parser.add_argument(
+        '--no-stats',
+        action='store_true',
+        help='Do not record per-stage timings'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip angles completed in <output>/manifest.jsonl and retry failed ones'
+    )
+
+    parser.add_argument(
+        '--postprocess',
+        action='store_true',
+        help='Encode web formats and thumbnails of each render in a separate process pool (needs Pillow)'
+    )
+
+    parser.add_argument(
+        '--postprocess-formats',
+        nargs='+',
+        choices=['webp', 'jpeg', 'png'],
+        default=['webp', 'jpeg'],
+        help='Formats for --postprocess (default: webp jpeg)'
+    )
+
+    parser.add_argument(
+        '--postprocess-sizes',
+        nargs='+',
+        type=int,
+        default=[1024, 512, 256],
+        help='Derivative long-side sizes in pixels for --postprocess (default: 1024 512 256)'
+    )
+
+    parser.add_argument(
+        '--postprocess-python',
+        metavar='PYTHON',
+        help="Python with Pillow that runs postprocess.py (default: Blender's Python)"
+    )
+
+    parser.add_argument(
+        '--postprocess-backgrounds',
+        nargs='+',
+        default=[],
+        metavar='COLOR',
+        help='Composite each render onto these backgrounds as it finishes (preset, #rrggbb '
+             'or name=#rrggbb); implies --postprocess and --transparent'
+    )
+
+    parser.add_argument(
+        '--queue',
+        metavar='DB',
+        help='Shared SQLite job queue: queue the input (if given), then render queued jobs '
+             'with --workers processes on this host until the queue is drained'
+    )
+
+    parser.add_argument(
+        '--job-timeout',
+        type=float,
+        default=DEFAULT_JOB_TIMEOUT,
+        metavar='SEC',
+        help=f'With --queue, kill and replace a worker whose job runs longer than this '
+             f'(default: {DEFAULT_JOB_TIMEOUT})'
+    )
+
+    parser.add_argument(
+        '--lease',
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        metavar='SEC',
+        help=f'With --queue, seconds before jobs of an unresponsive host are re-queued '
+             f'(default: {DEFAULT_LEASE_SECONDS})'
+    )
+
+    parser.add_argument(
+        '--serve',
+        metavar='JOB_DIR',
+        help='Run as a resident render service, taking jobs from JOB_DIR (see render_service.py)'
+    )
+
+    parser.add_argument(
+        '--cpu-affinity',
+        metavar='CORES',
+        help=argparse.SUPPRESS  # Set by the coordinator for worker processes, e.g. 0-7
+    )
+
+    parser.add_argument(
+        '--results-json',
+        help=argparse.SUPPRESS  # Worker processes write their results here
+    )
+
+    parser.add_argument(
+        '--queue-worker',
+        metavar='WORKER_ID',
+        help=argparse.SUPPRESS  # Set by the queue supervisor for its worker processes
+    )
+
+    parser.add_argument(
+        '--tile-jobs',
+        help=argparse.SUPPRESS  # Tile worker processes render the tiles listed here
+    )
+
+    parsed = parser.parse_args(args)
+    if parsed.input is None and parsed.serve is None and parsed.queue is None:
+        parser.error('input is required unless --serve or --queue is given')
+    if parsed.turntable and not parsed.angles:
+        parsed.angles = orbit_angle_ids(parsed.turntable, parsed.orbit_elevations)
+    if parsed.postprocess_backgrounds:
+        try:
+            for spec in parsed.postprocess_backgrounds:
+                parse_background(spec)
+        except ValueError as e:
+            parser.error(str(e))
+        parsed.postprocess = parsed.transparent = True
+    return parsed
 
 
 # Main execution
@@ -431,35 +2204,178 @@ if __name__ == "__main__":
 
     args = parse_arguments()
 
-    input_path = Path(args.input)
+    input_path = Path(args.input) if args.input else None
     output_path = Path(args.output)
     resolution = tuple(args.resolution)
 
-    print(f"Input:      {input_path}")
+    print(f"Input:      {input_path or args.serve or args.queue}")
     print(f"Output:     {output_path}")
     print(f"Resolution: {resolution[0]}×{resolution[1]}")
+    print(f"Tier:       {args.tier}")
     if args.angles:
         print(f"Angles:     {', '.join(args.angles)}")
     else:
         print(f"Angles:     Standard set (0deg, 45deg_left, 45deg_right, 30deg_top)")
+    if args.workers > 1:
+        print(f"Workers:    {args.workers}")
     print()
 
-    # Check if input is file or directory
-    if input_path.is_file():
+    if args.cpu_affinity:
+        apply_core_affinity(args.cpu_affinity)
+
+    # Directory input: scan the model files while this process sets up
+    is_worker = input_path is not None and input_path.suffix.lower() == '.json'
+    is_worker = is_worker or bool(args.tile_jobs or args.queue_worker)
+    preflight_scan = None
+    if input_path is not None and input_path.is_dir() and not args.no_preflight and not is_worker:
+        preflight_scan = start_preflight(input_path, output_path / INDEX_NAME)
+
+    # Web formats and thumbnails are encoded by a separate process as renders finish
+    postprocessor = None
+    if args.postprocess and not is_worker:
+        postprocessor = start_postprocessor(output_path, args)
+
+    # Per-stage timings of this run; workers append to the coordinator's file
+    if args.no_stats:
+        args.stats_file = None
+    elif args.stats_file is None and not is_worker:
+        args.stats_file = default_stats_path(output_path)
+    stats = RenderStats(args.stats_file)
+    manifest = RenderManifest(output_path / MANIFEST_NAME) if postprocessor else None
+
+    # Check if running as queue host/worker or service, or input is worker shard, file or directory
+    if args.queue_worker:
+        # Queue worker process: claim and render jobs until none are left
+        options = {**automation_options(args), 'persistent_studio': True}
+        automation = BlenderAutomation(output_dir=output_path, resolution=resolution,
+                                       threads=args.threads, stats=stats,
+                                       cache=make_cache(args.cache_dir, args.cache_max_gb),
+                                       manifest=RenderManifest(output_path / MANIFEST_NAME),
+                                       catalog=make_catalog(args.catalog),
+                                       **options)
+        queue = RenderQueue(args.queue, lease_seconds=args.lease)
+        processed = work_queue(automation, queue, args.queue_worker)
+        print(f"✓ Queue worker {args.queue_worker} done: {processed} jobs")
+
+    elif args.queue:
+        # Render host: queue the input, then supervise workers until the queue is drained
+        if input_path is not None:
+            if not input_path.exists():
+                print(f"❌ Error: Input path does not exist: {input_path}")
+                sys.exit(1)
+            catalog = make_catalog(args.catalog)
+            enqueue_models(RenderQueue(args.queue), input_path, output_path, args.angles,
+                           args.tier, preflight=not args.no_preflight, catalog=catalog,
+                           retry_failed=args.resume, preflight_scan=preflight_scan)
+        host_args = worker_flags(args)
+        if args.cache_dir:
+            host_args += ['--cache-dir', args.cache_dir, '--cache-max-gb', str(args.cache_max_gb)]
+        if args.catalog:
+            host_args += ['--catalog', args.catalog]
+        if args.stats_file:
+            host_args += ['--stats-file', str(args.stats_file)]
+        run_host(args.queue, output_path, max(1, args.workers), bpy.app.binary_path, args.tier,
+                 resolution=resolution, threads_per_worker=args.threads,
+                 pin_cores=args.pin_cores, worker_args=host_args,
+                 job_timeout=args.job_timeout, lease_seconds=args.lease)
+        print_queue_status(RenderQueue(args.queue), args.tier)
+
+    elif args.serve:
+        # Resident service: pay Blender and Cycles startup once
+        options = {**automation_options(args), 'persistent_studio': True}
+        automation = BlenderAutomation(output_dir=output_path, resolution=resolution,
+                                       threads=args.threads, stats=stats,
+                                       cache=make_cache(args.cache_dir, args.cache_max_gb),
+                                       manifest=manifest,
+                                       catalog=make_catalog(args.catalog),
+                                       **options)
+        automation.setup_scene()
+        automation.scene_ready = True
+        serve(automation, args.serve)
+
+    elif input_path.suffix.lower() == '.json' and input_path.is_file():
+        # Worker process: render the shard assigned by the coordinator
+        automation = BlenderAutomation(output_dir=output_path, resolution=resolution,
+                                       threads=args.threads, stats=stats,
+                                       cache=make_cache(args.cache_dir, args.cache_max_gb),
+                                       manifest=RenderManifest(output_path / MANIFEST_NAME),
+                                       catalog=make_catalog(args.catalog),
+                                       **automation_options(args))
+        results = process_model_list(automation, load_shard(input_path), args.angles,
+                                     resume=args.resume)
+        if args.results_json:
+            write_results(results, args.results_json)
+
+    elif args.tile_jobs:
+        # Tile worker process: render the tiles assigned by the coordinator
+        with open(args.tile_jobs) as f:
+            jobs = json.load(f)
+        automation = BlenderAutomation(output_dir=output_path, resolution=resolution,
+                                       threads=args.threads, stats=stats,
+                                       cache=make_cache(args.cache_dir, args.cache_max_gb),
+                                       **{**automation_options(args), 'crop': False})
+        results = automation.render_tile_jobs(input_path, input_path.stem, jobs)
+        if args.results_json:
+            write_results(results, args.results_json)
+
+    elif input_path.is_file():
         # Single file processing
-        if input_path.suffix.lower() != '.obj':
-            print(f"❌ Error: Input file must be .obj format, got {input_path.suffix}")
+        if input_path.suffix.lower() not in MODEL_EXTENSIONS:
+            print(f"❌ Error: Input file must be one of {', '.join(MODEL_EXTENSIONS)}, "
+                  f"got {input_path.suffix}")
             sys.exit(1)
 
-        automation = BlenderAutomation(output_dir=output_path, resolution=resolution)
-        automation.process_model(input_path, angles=args.angles)
+        if args.tiles and args.passes:
+            print("⚠ --passes is not supported with --tiles; rendering the beauty image only")
+            args.passes = []
+        catalog = make_catalog(args.catalog)
+        if catalog is not None:
+            catalog.register_file(input_path)
+        automation = BlenderAutomation(output_dir=output_path, resolution=resolution,
+                                       threads=args.threads, stats=stats,
+                                       cache=make_cache(args.cache_dir, args.cache_max_gb),
+                                       manifest=manifest, catalog=catalog,
+                                       **automation_options(args))
+        if args.tiles:
+            # One frame, many processes: each renders a border region
+            tile_args = worker_flags(args)
+            if args.cache_dir:
+                tile_args += ['--cache-dir', args.cache_dir, '--cache-max-gb', str(args.cache_max_gb)]
+            if args.stats_file:
+                tile_args += ['--stats-file', str(args.stats_file)]
+            automation.process_model_tiled(input_path, angles=args.angles, grid=args.tiles,
+                                           overlap=args.tile_overlap, workers=args.workers,
+                                           pin_cores=args.pin_cores, worker_args=tile_args)
+        elif args.variants is not None:
+            # One import, every size of the product line
+            print_batch_summary(automation.process_variants(input_path, args.variants,
+                                                            args.angles), output_path)
+        else:
+            automation.process_model(input_path, angles=args.angles)
 
     elif input_path.is_dir():
         # Batch directory processing
-        batch_process_directory(input_path, output_path, args.angles, resolution)
+        if args.tiles:
+            print("⚠ --tiles applies to single model files; rendering the directory untiled")
+        if args.variants is not None:
+            print("⚠ --variants applies to single model files; rendering the directory as is")
+        batch_process_directory(input_path, output_path, args.angles, resolution,
+                                workers=args.workers, threads=args.threads,
+                                pin_cores=args.pin_cores,
+                                cache_dir=args.cache_dir, cache_max_gb=args.cache_max_gb,
+                                resume=args.resume, preflight=not args.no_preflight,
+                                catalog_path=args.catalog, stats_path=args.stats_file,
+                                schedule=args.schedule, dedup=not args.no_dedup,
+                                worker_args=worker_flags(args),
+                                preflight_scan=preflight_scan,
+                                **automation_options(args))
 
     else:
         print(f"❌ Error: Input path does not exist: {input_path}")
         sys.exit(1)
 
+    if args.stats_file and not is_worker and not (input_path and input_path.is_dir()):
+        report_stats(args.stats_file)  # Directory batches report in batch_process_directory
+    if postprocessor is not None:
+        print(f"✓ Post-processing continues in the background (pid {postprocessor.pid})")
     print("\n✓ All processing complete!\n")
@@ -0,0 +1,140 @@
+"""
+Benchmark: geometry-based material assignment, per-face loop vs NumPy bulk path.
+
+Builds a synthetic model of wavy grid meshes (so faces split between tabletop
+and legs), times apply_material_by_geometry_loop on every mesh against
+apply_material_by_geometry and checks both produce the same material indices.
+With --parts > 1 the meshes are unparented siblings, like the root objects of
+a multi-object OBJ import, and each has its own object transform.
+
+Usage:
+    blender --background --factory-startup --python benchmark_materials.py -- [--faces 1000000] [--parts 3] [--repeats 3]
+"""
+
+import bpy
+import sys
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add scripts directory to path for module imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+from material_setup import (setup_red_green_materials, apply_material_by_geometry,
+                            apply_material_by_geometry_loop)
+
+
+def build_test_model(faces, parts=1):
+    """
+    Create `parts` grid meshes with roughly `faces` quads in total and wavy surfaces.
+
+    Args:
+        faces: Target face count
+        parts: Number of sibling mesh objects
+
+    Returns:
+        list: Mesh objects, the first with the most faces (the model object)
+    """
+    objects = []
+    for part in range(parts):
+        share = faces // parts + (faces % parts if part == 0 else 0)
+        side = max(2, int(math.sqrt(share)))
+        bpy.ops.mesh.primitive_grid_add(x_subdivisions=side, y_subdivisions=side, size=2.0)
+        obj = bpy.context.active_object
+        mesh = obj.data
+
+        # Waves around the 0.5m threshold so both classes are populated
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+        co = co.reshape(-1, 3)
+        co[:, 2] = 0.5 + 0.2 * np.sin(co[:, 0] * 6.0 + part) * np.cos(co[:, 1] * 6.0)
+        mesh.vertices.foreach_set('co', co.ravel())
+        mesh.update()
+
+        # Object transforms must not change the assignment (it uses mesh coordinates)
+        obj.location = (part * 2.5, 0.0, part * 0.3)
+        obj.rotation_euler = (0.0, part * 0.4, part * 0.7)
+        objects.append(obj)
+
+    setup_red_green_materials(objects[0], objects)
+    return objects
+
+
+def material_indices(objects):
+    """Read all face material indices of the objects as one array"""
+    arrays = []
+    for obj in objects:
+        indices = np.empty(len(obj.data.polygons), dtype=np.int32)
+        obj.data.polygons.foreach_get('material_index', indices)
+        arrays.append(indices)
+    return np.concatenate(arrays)
+
+
+def set_material_indices(objects, indices):
+    """Write face material indices, the inverse of material_indices()"""
+    offset = 0
+    for obj in objects:
+        count = len(obj.data.polygons)
+        obj.data.polygons.foreach_set('material_index', indices[offset:offset + count])
+        offset += count
+
+
+def time_call(func, repeats):
+    """Best-of-N wall time for func()"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    import argparse
+
+    try:
+        args = sys.argv[sys.argv.index('--') + 1:]
+    except ValueError:
+        args = []
+
+    parser = argparse.ArgumentParser(description='Benchmark geometry-based material assignment')
+    parser.add_argument('--faces', type=int, default=1_000_000, help='Approximate face count')
+    parser.add_argument('--parts', type=int, default=3,
+                        help='Sibling mesh objects, like a multi-object OBJ import')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per implementation (best is kept)')
+    args = parser.parse_args(args)
+
+    objects = build_test_model(args.faces, max(1, args.parts))
+    model_obj = objects[0]
+    face_count = sum(len(obj.data.polygons) for obj in objects)
+
+    def loop():
+        for obj in objects:
+            apply_material_by_geometry_loop(obj)
+
+    loop_time = time_call(loop, args.repeats)
+    loop_indices = material_indices(objects)
+
+    # Start from the opposite assignment so a skipped mesh cannot match
+    set_material_indices(objects, 1 - loop_indices)
+    bulk_time = time_call(lambda: apply_material_by_geometry(model_obj, objects=objects),
+                          args.repeats)
+    bulk_indices = material_indices(objects)
+
+    print("\n" + "="*60)
+    print("Material Assignment Benchmark")
+    print("="*60)
+    print(f"Faces:            {face_count:,} in {len(objects)} objects")
+    print(f"Tabletop faces:   {int((bulk_indices == 0).sum()):,}")
+    print(f"Per-face loop:    {loop_time:.3f}s")
+    print(f"NumPy bulk:       {bulk_time:.3f}s")
+    print(f"Speedup:          {loop_time / max(bulk_time, 1e-9):.1f}×")
+    print(f"Identical output: {'✓' if np.array_equal(loop_indices, bulk_indices) else '❌'}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
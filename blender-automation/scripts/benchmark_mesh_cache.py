@@ -0,0 +1,140 @@
+"""
+Benchmark: model import from OBJ text vs the binary mesh cache.
+
+Writes a synthetic table (synthetic_models.py), imports it through an empty
+MeshCache (text import, then store), imports it again (load from the .npz)
+and checks the round trip: one cache entry named after the file hash, a
+hit on the second import, and identical geometry and material slots.
+
+The level-of-detail path is checked the same way: a decimated import stores
+a second entry under lod_key(), and importing at the same ratio again is a
+hit that returns the same geometry and LOD stats.
+
+Usage:
+    blender --background --factory-startup --python benchmark_mesh_cache.py -- [--faces 200000] [--lod-ratio 0.25]
+"""
+
+import bpy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add scripts directory to path for module imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+from mesh_cache import MeshCache, _read_mesh_arrays, lod_key
+from render_cache import hash_file
+from synthetic_models import generate_tables
+
+
+def clear_objects(objects):
+    """Remove imported objects and their meshes"""
+    for obj in objects:
+        mesh = obj.data if obj.type == 'MESH' else None
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def geometry(objects):
+    """Geometry arrays and material slot names of the mesh objects, in order"""
+    return [(_read_mesh_arrays(obj), [m.name for m in obj.data.materials if m is not None])
+            for obj in objects if obj.type == 'MESH']
+
+
+def same_geometry(first, second):
+    """Whether two geometry() results match (positions and normals to float32 precision)"""
+    if len(first) != len(second):
+        return False
+    for (arrays_a, materials_a), (arrays_b, materials_b) in zip(first, second):
+        if materials_a != materials_b or arrays_a.keys() != arrays_b.keys():
+            return False
+        for name in arrays_a:
+            a, b = arrays_a[name], arrays_b[name]
+            if a.shape != b.shape:
+                return False
+            if a.dtype.kind == 'f' and not np.allclose(a, b, atol=1e-6):
+                return False
+            if a.dtype.kind != 'f' and not np.array_equal(a, b):
+                return False
+    return True
+
+
+def timed_import(cache, path, lod_ratio=None):
+    """(objects, LOD stats, seconds) of one MeshCache.import_model call"""
+    start = time.perf_counter()
+    objects, lod = cache.import_model(path, lod_ratio=lod_ratio)
+    return objects, lod, time.perf_counter() - start
+
+
+def main():
+    import argparse
+
+    try:
+        args = sys.argv[sys.argv.index('--') + 1:]
+    except ValueError:
+        args = []
+
+    parser = argparse.ArgumentParser(description='Benchmark and check the binary mesh cache')
+    parser.add_argument('--faces', type=int, default=200_000, help='Faces of the synthetic table')
+    parser.add_argument('--lod-ratio', type=float, default=0.25, help='Decimation ratio for the LOD check')
+    args = parser.parse_args(args)
+
+    work_dir = Path(tempfile.mkdtemp(prefix='mesh-cache-bench-'))
+    path = generate_tables(work_dir / 'models', [args.faces], ['150x80'])[0]
+    cache = MeshCache(work_dir / 'cache')
+
+    file_hash = hash_file(path)
+
+    objects, _, text_time = timed_import(cache, path)
+    imported = geometry(objects)
+    clear_objects(objects)
+    entries = sorted(p.name for p in cache.cache_dir.glob('*.npz'))
+
+    objects, _, cached_time = timed_import(cache, path)
+    loaded = geometry(objects)
+    clear_objects(objects)
+    full_counts = (cache.hits, cache.misses)
+
+    # Decimated import: miss (full entry + decimate + store), then a hit
+    objects, lod, decimate_time = timed_import(cache, path, args.lod_ratio)
+    decimated = geometry(objects)
+    clear_objects(objects)
+
+    objects, cached_lod, lod_time = timed_import(cache, path, args.lod_ratio)
+    lod_loaded = geometry(objects)
+    clear_objects(objects)
+
+    checks = {
+        'Entry per file:  ': entries == [f"{file_hash}.npz"],
+        'Second import hit:': full_counts == (1, 1),
+        'Identical meshes:': same_geometry(imported, loaded),
+        'LOD entry stored:': cache.entry_path(lod_key(file_hash, args.lod_ratio, 0)).exists(),
+        'Second LOD hit:  ': (cache.hits, cache.misses) == (2, 2),
+        'Identical LOD:   ': same_geometry(decimated, lod_loaded) and lod == cached_lod,
+    }
+
+    print("\n" + "="*60)
+    print("Mesh Cache Benchmark")
+    print("="*60)
+    print(f"Faces:             {args.faces:,} ({len(imported)} meshes)")
+    print(f"Text import+store: {text_time:.3f}s")
+    print(f"Cache load:        {cached_time:.3f}s")
+    print(f"Speedup:           {text_time / max(cached_time, 1e-9):.1f}×")
+    if lod:
+        print(f"LOD vertices:      {lod['vertices']:,} → {lod['lod_vertices']:,} "
+              f"(ratio {args.lod_ratio:g})")
+    print(f"Decimate+store:    {decimate_time:.3f}s")
+    print(f"LOD cache load:    {lod_time:.3f}s")
+    for label, ok in checks.items():
+        print(f"{label} {'✓' if ok else '❌'}")
+    print("="*60)
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
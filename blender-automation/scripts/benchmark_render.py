@@ -0,0 +1,467 @@
+"""
+Reproducible render benchmark suite.
+
+Two suites, both measured against a stored baseline:
+
+- python: the pure-Python parts of the pipeline (camera math, OBJ
+  scanning, scheduling, render queue, cache keys and lookups, tile
+  stitching), timed best-of-N in plain Python. Modules that import bpy
+  load against bpy_stub, so this runs on machines without Blender.
+- render: full batch_render.py runs over synthetic tables
+  (synthetic_models.py) for every combination of resolution × samples ×
+  angle count × worker count, reporting seconds per angle and angles per
+  hour.
+
+Results are written as JSON. With a baseline (by default
+../benchmarks/<suite>-baseline.json, created with --save-baseline), each
+case is compared and the run exits with status 1 if any case got slower
+than the threshold. Baselines are only comparable on the same machine.
+
+Usage:
+    python benchmark_render.py python [--repeats 5] [--save-baseline]
+    python benchmark_render.py render --blender /path/to/blender \\
+        --resolutions 512x512 1024x1024 --samples 16 64 --angle-counts 1 4 --workers 1 2
+"""
+
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add scripts directory to path for module imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+import bpy_stub
+from camera_positions import CameraPositions, DIMENSION_PRESETS, calculate_framing_distance
+from render_stats import load_records
+from synthetic_models import generate_tables
+
+
+BASELINE_DIR = script_dir.parent / 'benchmarks'
+DEFAULT_THRESHOLD = 0.10  # 10% slower than the baseline is a regression
+
+
+def baseline_path(suite):
+    """Default baseline file of a suite"""
+    return BASELINE_DIR / f"{suite}-baseline.json"
+
+
+def machine_info():
+    """Host details stored with results, to spot cross-machine comparisons"""
+    info = {
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    try:
+        info['commit'] = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=script_dir,
+                                        capture_output=True, text=True,
+                                        check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return info
+
+
+def time_call(func, repeats):
+    """Best-of-N wall time for func()"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# ---- Python suite ----------------------------------------------------------
+
+def selected(name, only):
+    """True if a case name matches one of the --only prefixes (None = all)"""
+    return not only or any(name.startswith(prefix) for prefix in only)
+
+
+def python_cases(work_dir, only=None):
+    """
+    Set up the pure-Python benchmark cases (setup is not timed).
+
+    Only the selected cases are set up, so --only scan does not build the
+    cache or stitching fixtures and --only camera generates no models.
+
+    Args:
+        work_dir: Scratch directory for generated files
+        only: Case name prefixes to set up (None = all)
+
+    Returns:
+        list: (case name, zero-argument callable)
+    """
+    bpy_stub.install()
+    from batch_render import BlenderAutomation
+    from camera_orbit import orbit_poses, turntable_azimuths
+    from obj_scanner import plan_models, scan_obj
+    from parallel_render import shard_models
+    from render_cache import RenderCache, render_key
+    from render_queue import RenderQueue
+    from tiled_render import plan_tiles, stitch_tiles
+
+    work_dir = Path(work_dir)
+    cases = []
+
+    def wanted(*names):
+        return any(selected(name, only) for name in names)
+
+    # Camera math
+    if wanted('camera.orbit_poses_10k'):
+        cases.append(('camera.orbit_poses_10k',
+                      lambda: orbit_poses(turntable_azimuths(360), np.arange(0, 60, 2), 3.0)))
+
+    def standard_positions():
+        for i in range(1000):
+            CameraPositions.get_positions(2.0 + i * 0.001)
+    if wanted('camera.standard_positions_1k'):
+        cases.append(('camera.standard_positions_1k', standard_positions))
+
+    def framing_distances():
+        for i in range(1000):
+            calculate_framing_distance((-0.75, -0.4, 0.0), (0.75, 0.4, 0.75 + i * 1e-4))
+    if wanted('camera.framing_distance_1k'):
+        cases.append(('camera.framing_distance_1k', framing_distances))
+
+    # OBJ scanning
+    if wanted('scan.obj_100k_faces'):
+        obj_path = generate_tables(work_dir / 'models', [100_000], ['150x80'])[0]
+        cases.append(('scan.obj_100k_faces', lambda: scan_obj(obj_path)))
+
+    # Scheduling
+    if wanted('schedule.plan_models_10k', 'schedule.shard_models_100k',
+              'queue.enqueue_claim_finish_400'):
+        model_files = [Path(f"/models/{i // 100}/{i}x80.obj") for i in range(10_000)]
+        index = {str(p): {'valid': True, 'triangles': (i * 7919) % 1_000_000,
+                          'size': 1000 + i, 'mtime_ns': i, 'errors': []}
+                 for i, p in enumerate(model_files)}
+
+    def queue_round_trip():
+        path = work_dir / 'queue.sqlite'
+        path.unlink(missing_ok=True)
+        queue = RenderQueue(path)
+        queue.enqueue(model_files[:100], CameraPositions.get_standard_set(), 'final')
+        while (job := queue.claim('bench', 'final')) is not None:
+            queue.finish(job['id'], 'bench', 'success', '/dev/null', None, 0.0)
+        queue.close()
+
+    if wanted('schedule.plan_models_10k'):
+        cases.append(('schedule.plan_models_10k', lambda: plan_models(model_files, index)))
+    if wanted('schedule.shard_models_100k'):
+        cases.append(('schedule.shard_models_100k',
+                      lambda: shard_models(model_files * 10, 16)))
+    if wanted('queue.enqueue_claim_finish_400'):
+        cases.append(('queue.enqueue_claim_finish_400', queue_round_trip))
+
+    # Cache keys and lookups
+    if wanted('cache.render_key_1k'):
+        automation = BlenderAutomation(output_dir=work_dir / 'output')
+        angles = list(CameraPositions.get_positions(1.0))
+        names = list(DIMENSION_PRESETS) + ['123x45', 'unknown']
+
+        def cache_keys():
+            for i in range(125):
+                for angle_id in angles:
+                    render_key(f"{i:064x}",
+                               automation.framing_key(names[i % len(names)], angle_id),
+                               automation.render_settings())
+        cases.append(('cache.render_key_1k', cache_keys))
+
+    if wanted('cache.lookup_materialize_100'):
+        cache = RenderCache(work_dir / 'cache')
+        keys = []
+        for i in range(100):
+            rendered = work_dir / 'rendered' / f"{i}.png"
+            rendered.parent.mkdir(parents=True, exist_ok=True)
+            rendered.write_bytes(os.urandom(64 * 1024))
+            keys.append(render_key(f"{i:064x}", {'angle': i}, {}))
+            cache.store(keys[-1], rendered)
+
+        def cache_hits():
+            for i, key in enumerate(keys):
+                cache.materialize(cache.lookup(key), work_dir / 'hits' / f"{i}.png")
+        cases.append(('cache.lookup_materialize_100', cache_hits))
+
+    # Tile stitching
+    if wanted('tiles.stitch_2k_4x4'):
+        tiles = plan_tiles(2048, 2048, (4, 4))
+        rng = np.random.default_rng(0)
+        tile_pixels = []
+        for tile in tiles:
+            x0, y0, x1, y1 = tile['render']
+            tile_pixels.append((tile, rng.random((y1 - y0, x1 - x0, 4), dtype=np.float32)))
+        cases.append(('tiles.stitch_2k_4x4', lambda: stitch_tiles(2048, 2048, tile_pixels)))
+
+    return cases
+
+
+def run_python_suite(work_dir, repeats=5, only=None):
+    """
+    Time every pure-Python case.
+
+    Args:
+        work_dir: Scratch directory
+        repeats: Runs per case (best is kept)
+        only: Case name prefixes to run (None = all)
+
+    Returns:
+        dict: {case: {'metric': 'seconds', 'value'}}
+    """
+    results = {}
+    for name, func in python_cases(work_dir, only):
+        seconds = time_call(func, repeats)
+        results[name] = {'metric': 'seconds', 'value': round(seconds, 6)}
+        print(f"✓ {name:34} {seconds * 1000:10.2f} ms")
+    return results
+
+
+# ---- Render suite ----------------------------------------------------------
+
+def parse_resolution(spec):
+    """'1024x768' or '1024' -> (1024, 768) / (1024, 1024)"""
+    parts = [int(p) for p in spec.lower().split('x')]
+    return (parts[0], parts[-1])
+
+
+def blender_version(blender_binary):
+    """First line of `blender --version`, or None"""
+    try:
+        output = subprocess.run([blender_binary, '--version'], capture_output=True, text=True,
+                                timeout=60).stdout
+        return output.splitlines()[0] if output else None
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def run_render_case(blender_binary, models_dir, output_dir, resolution, samples, angles,
+                    workers, tier):
+    """
+    Render the synthetic models once with batch_render.py.
+
+    Returns:
+        dict: wall seconds, seconds per angle, angles per hour, mean render
+            stage seconds (or 'error')
+    """
+    if output_dir.exists():
+        shutil.rmtree(output_dir)  # Fresh output: nothing resumed or cached
+    stats_file = output_dir / 'stats.jsonl'
+    command = [
+        str(blender_binary), '--background', '--factory-startup',
+        '--python', str(script_dir / 'batch_render.py'), '--',
+        str(models_dir), '-o', str(output_dir),
+        '-r', str(resolution[0]), str(resolution[1]),
+        '-a', *angles, '--samples', str(samples), '--tier', tier,
+        '-w', str(workers), '--no-preflight', '--stats-file', str(stats_file),
+    ]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / 'benchmark.log', 'w') as log:
+        start = time.perf_counter()
+        process = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT)
+        wall = time.perf_counter() - start
+
+    rendered = len(list(output_dir.glob('*/angle_*.png')))
+    expected = len(list(Path(models_dir).glob('*.obj'))) * len(angles)
+    if process.returncode != 0 or rendered != expected:
+        return {'error': f"exit {process.returncode}, {rendered}/{expected} angles rendered "
+                         f"(see {output_dir / 'benchmark.log'})"}
+
+    renders = [r['wall'] for r in (load_records(stats_file) if stats_file.exists() else [])
+               if r['stage'] == 'render']
+    per_angle = wall / expected
+    return {
+        'wall': round(wall, 3),
+        'angles': expected,
+        'seconds_per_angle': round(per_angle, 3),
+        'angles_per_hour': round(3600 / per_angle, 1),
+        'render_mean': round(sum(renders) / len(renders), 3) if renders else None,
+    }
+
+
+def run_render_suite(blender_binary, work_dir, resolutions, samples, angle_counts, workers,
+                     faces=20_000, presets=None, tier='final', repeats=1, only=None):
+    """
+    Run the resolution × samples × angle count × workers matrix.
+
+    Args:
+        only: Case name prefixes to run (None = all); the synthetic models
+            are only generated if a case is left
+
+    Returns:
+        dict: {case: {'metric': 'seconds_per_angle', 'value', ...details}}
+    """
+    work_dir = Path(work_dir)
+    matrix = [(f"render.{resolution[0]}x{resolution[1]}.s{sample_count}"
+               f".a{angle_count}.w{worker_count}", resolution, sample_count, angle_count,
+               worker_count)
+              for resolution, sample_count, angle_count, worker_count in itertools.product(
+                  resolutions, samples, angle_counts, workers)]
+    matrix = [case for case in matrix if selected(case[0], only)]
+    if not matrix:
+        return {}
+
+    models_dir = work_dir / 'models'
+    generate_tables(models_dir, [faces], presets)
+    all_angles = list(CameraPositions.get_positions(1.0))
+
+    results = {}
+    for name, resolution, sample_count, angle_count, worker_count in matrix:
+        best = None
+        for _ in range(repeats):
+            run = run_render_case(blender_binary, models_dir, work_dir / 'output' / name,
+                                  resolution, sample_count, all_angles[:angle_count],
+                                  worker_count, tier)
+            if 'error' in run:
+                best = run
+                break
+            if best is None or run['seconds_per_angle'] < best['seconds_per_angle']:
+                best = run
+
+        if 'error' in best:
+            results[name] = {'metric': 'seconds_per_angle', 'value': None, **best}
+            print(f"❌ {name}: {best['error']}")
+            continue
+        results[name] = {'metric': 'seconds_per_angle', 'value': best['seconds_per_angle'],
+                         **best}
+        print(f"✓ {name:34} {best['seconds_per_angle']:8.2f} s/angle "
+              f"{best['angles_per_hour']:8.0f} angles/h")
+    return results
+
+
+# ---- Baselines -------------------------------------------------------------
+
+def compare(cases, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare case values against a baseline (lower is better).
+
+    Returns:
+        list: (case, baseline value, value, relative change, status) with
+            status 'ok', 'faster', 'regression', 'new' or 'failed'
+    """
+    rows = []
+    base_cases = baseline.get('cases', {})
+    for name, result in cases.items():
+        value = result.get('value')
+        base = base_cases.get(name, {}).get('value')
+        if value is None:
+            rows.append((name, base, None, None, 'failed'))
+        elif not base:
+            rows.append((name, None, value, None, 'new'))
+        else:
+            change = value / base - 1
+            status = ('regression' if change > threshold
+                      else 'faster' if change < -threshold else 'ok')
+            rows.append((name, base, value, change, status))
+    return rows
+
+
+def print_comparison(rows, baseline, threshold):
+    """Print the baseline comparison table"""
+    symbols = {'ok': '✓', 'faster': '✓', 'regression': '❌', 'new': '•', 'failed': '❌'}
+    print(f"\n{'='*60}")
+    print(f"BASELINE COMPARISON (±{threshold:.0%}, baseline from "
+          f"{baseline.get('machine', {}).get('time', '?')})")
+    print(f"{'='*60}")
+    for name, base, value, change, status in rows:
+        base_text = f"{base:.4g}" if base is not None else '-'
+        value_text = f"{value:.4g}" if value is not None else '-'
+        change_text = f"{change:+.1%}" if change is not None else ''
+        print(f"{symbols[status]} {name:34} {base_text:>10} → {value_text:<10} {change_text:>7} "
+              f"{'' if status == 'ok' else status}")
+    print(f"{'='*60}\n")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render pipeline benchmarks')
+    parser.add_argument('suite', choices=['python', 'render'], help='Benchmark suite')
+    parser.add_argument('--work-dir', help='Scratch directory (default: a temporary directory)')
+    parser.add_argument('--repeats', type=int, help='Runs per case, best kept '
+                                                    '(default: 5 python, 1 render)')
+    parser.add_argument('--only', nargs='+', metavar='PREFIX',
+                        help='Cases to set up and run, by name prefix (e.g. scan cache.render_key)')
+    parser.add_argument('-o', '--output', help='Results JSON (default: <work-dir>/results.json)')
+    parser.add_argument('--baseline', help='Baseline JSON (default: ../benchmarks/<suite>-baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Relative slowdown counted as a regression (default: {DEFAULT_THRESHOLD})')
+
+    render = parser.add_argument_group('render suite')
+    render.add_argument('--blender', default='blender', help='Blender executable')
+    render.add_argument('--resolutions', nargs='+', type=parse_resolution,
+                        default=[(512, 512), (1024, 1024)], metavar='WxH')
+    render.add_argument('--samples', nargs='+', type=int, default=[16, 64])
+    render.add_argument('--angle-counts', nargs='+', type=int, default=[1, 4])
+    render.add_argument('--workers', nargs='+', type=int, default=[1])
+    render.add_argument('--faces', type=int, default=20_000, help='Faces per synthetic table')
+    render.add_argument('--presets', nargs='+', choices=list(DIMENSION_PRESETS),
+                        help='Table sizes (default: all presets)')
+    render.add_argument('--tier', default='final', help='Render tier (samples are overridden)')
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix='render-bench-'))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    machine = machine_info()
+
+    print("="*60)
+    print(f"Benchmark: {args.suite} suite on {machine['host']} ({machine['cpus']} CPUs)")
+    print("="*60)
+
+    if args.suite == 'python':
+        stubbed = bpy_stub.install()
+        machine['bpy'] = 'stub' if stubbed else 'blender'
+        cases = run_python_suite(work_dir, args.repeats or 5, args.only)
+    else:
+        machine['blender'] = blender_version(args.blender)
+        cases = run_render_suite(args.blender, work_dir, args.resolutions, args.samples,
+                                 args.angle_counts, args.workers, faces=args.faces,
+                                 presets=args.presets, tier=args.tier,
+                                 repeats=args.repeats or 1, only=args.only)
+
+    results = {'suite': args.suite, 'machine': machine, 'cases': cases}
+    output = Path(args.output) if args.output else work_dir / 'results.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results: {output}")
+
+    regressions = 0
+    base_file = Path(args.baseline) if args.baseline else baseline_path(args.suite)
+    if base_file.exists() and not args.save_baseline:
+        with open(base_file) as f:
+            baseline = json.load(f)
+        if baseline.get('machine', {}).get('host') != machine['host']:
+            print(f"⚠ Baseline was recorded on {baseline.get('machine', {}).get('host')}, "
+                  f"not {machine['host']}; differences may be hardware")
+        rows = compare(cases, baseline, args.threshold)
+        print_comparison(rows, baseline, args.threshold)
+        regressions = sum(1 for row in rows if row[4] in ('regression', 'failed'))
+        if regressions:
+            print(f"❌ {regressions} cases slower than the baseline by more than "
+                  f"{args.threshold:.0%} (or failed)")
+    elif args.save_baseline:
+        base_file.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(output, base_file)
+        print(f"✓ Baseline saved: {base_file}")
+    else:
+        print(f"⚠ No baseline at {base_file}; run with --save-baseline to create one")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
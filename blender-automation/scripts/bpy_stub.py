@@ -0,0 +1,69 @@
+"""
+Minimal stand-in for the bpy module, for benchmarks outside Blender.
+
+batch_render.py, material_setup.py and mesh_cache.py import bpy at module
+level, but much of their logic (render settings, cache keys, framing,
+scheduling) never touches Blender data. install() registers an empty bpy
+module so that logic can be imported and timed with plain Python; any
+call that needs real Blender data fails loudly instead of returning
+made-up values.
+
+Never install the stub inside Blender: install() is a no-op when the real
+bpy can be imported.
+"""
+
+import sys
+import types
+
+
+class _Unavailable:
+    """Attribute namespace whose every access raises"""
+
+    def __init__(self, path):
+        self._path = path
+
+    def __getattr__(self, name):
+        raise RuntimeError(f"{self._path}.{name} is not available in the bpy stub "
+                           f"(run inside Blender)")
+
+
+def make_stub():
+    """
+    Build the stub module.
+
+    Returns:
+        types.ModuleType: Module with app, data, context, ops and types
+    """
+    bpy = types.ModuleType('bpy')
+    bpy.__stub__ = True
+    bpy.app = types.SimpleNamespace(
+        binary_path='blender',
+        version=(0, 0, 0),
+        version_string='stub',
+        background=True,
+        handlers=types.SimpleNamespace(render_pre=[], render_post=[], render_stats=[],
+                                       render_write=[], render_complete=[],
+                                       render_cancel=[]),
+    )
+    bpy.data = _Unavailable('bpy.data')
+    bpy.context = _Unavailable('bpy.context')
+    bpy.ops = _Unavailable('bpy.ops')
+    bpy.types = _Unavailable('bpy.types')
+    return bpy
+
+
+def install():
+    """
+    Make `import bpy` succeed outside Blender.
+
+    Returns:
+        bool: True if the stub was installed, False if the real bpy is available
+    """
+    if 'bpy' in sys.modules:
+        return getattr(sys.modules['bpy'], '__stub__', False)
+    try:
+        import bpy  # noqa: F401
+        return False
+    except ImportError:
+        sys.modules['bpy'] = make_stub()
+        return True
@@ -0,0 +1,230 @@
+"""
+Vectorized orbit and turntable camera poses.
+
+Builds N camera poses at once from (azimuth, elevation, distance) grids:
+positions, camera-to-world rotation matrices and quaternions as NumPy
+arrays. Orientation uses Blender's camera convention (looks down local -Z,
+local +Y is up), with an explicit roll around the viewing axis.
+
+Azimuth follows the existing angle IDs: 0° is the front camera on -Y,
+positive azimuth moves to the right (+X), so 45° matches '45deg_right' and
+-45° matches '45deg_left'. Elevation is measured at the target.
+
+Generated poses are plain angle configs ({name, description, position,
+rotation, target, quaternion}) under IDs such as 'orbit_az045.0_el15', so
+they render, cache and resume exactly like the hand-written angles.
+"""
+
+import numpy as np
+
+from camera_positions import CameraPositions
+
+
+WORLD_UP = np.array([0.0, 0.0, 1.0])
+
+
+def orbit_grid(azimuth_deg, elevation_deg, distance):
+    """
+    Cartesian product of azimuths, elevations and distances.
+
+    Args:
+        azimuth_deg: Scalar or sequence of azimuths in degrees
+        elevation_deg: Scalar or sequence of elevations in degrees
+        distance: Scalar or sequence of distances in meters
+
+    Returns:
+        tuple: Flat (azimuth, elevation, distance) arrays, elevation-major
+    """
+    el, az, dist = np.meshgrid(np.atleast_1d(np.asarray(elevation_deg, dtype=np.float64)),
+                               np.atleast_1d(np.asarray(azimuth_deg, dtype=np.float64)),
+                               np.atleast_1d(np.asarray(distance, dtype=np.float64)),
+                               indexing='ij')
+    return az.ravel(), el.ravel(), dist.ravel()
+
+
+def orbit_positions(azimuth_deg, elevation_deg, distance, target=(0.0, 0.0, 0.0)):
+    """
+    Camera positions on a sphere around a target.
+
+    Args:
+        azimuth_deg, elevation_deg, distance: Broadcastable arrays
+        target: (x, y, z) orbit center in meters
+
+    Returns:
+        np.ndarray: (N, 3) positions
+    """
+    az = np.radians(np.asarray(azimuth_deg, dtype=np.float64))
+    el = np.radians(np.asarray(elevation_deg, dtype=np.float64))
+    dist = np.asarray(distance, dtype=np.float64)
+    horizontal = dist * np.cos(el)
+    offset = np.stack(np.broadcast_arrays(horizontal * np.sin(az),
+                                          -horizontal * np.cos(az),
+                                          dist * np.sin(el)), axis=-1)
+    return offset.reshape(-1, 3) + np.asarray(target, dtype=np.float64)
+
+
+def look_at_matrices(positions, targets, roll_deg=0.0):
+    """
+    Camera-to-world rotation matrices that aim cameras at targets.
+
+    Args:
+        positions: (N, 3) camera positions
+        targets: (N, 3) or (3,) look-at points
+        roll_deg: Scalar or (N,) roll around the viewing axis, in degrees
+
+    Returns:
+        np.ndarray: (N, 3, 3) matrices whose columns are the camera's local
+            X (right), Y (up) and Z (backwards) axes in world space
+    """
+    positions = np.atleast_2d(np.asarray(positions, dtype=np.float64))
+    forward = np.asarray(targets, dtype=np.float64) - positions
+    forward /= np.linalg.norm(forward, axis=-1, keepdims=True)
+
+    # Straight up/down views have no horizon; use +Y as the up hint there
+    up_hint = np.broadcast_to(WORLD_UP, forward.shape).copy()
+    vertical = np.abs(forward @ WORLD_UP) > 0.999999
+    up_hint[vertical] = (0.0, 1.0, 0.0)
+
+    right = np.cross(forward, up_hint)
+    right /= np.linalg.norm(right, axis=-1, keepdims=True)
+    up = np.cross(right, forward)
+
+    roll = np.radians(np.broadcast_to(np.asarray(roll_deg, dtype=np.float64),
+                                      (len(positions),)))[:, None]
+    right, up = (np.cos(roll) * right - np.sin(roll) * up,
+                 np.sin(roll) * right + np.cos(roll) * up)
+
+    return np.stack([right, up, -forward], axis=-1)
+
+
+def matrices_to_quaternions(matrices):
+    """
+    Convert rotation matrices to unit quaternions (w, x, y, z), batched.
+
+    Args:
+        matrices: (N, 3, 3) rotation matrices
+
+    Returns:
+        np.ndarray: (N, 4) quaternions with w >= 0
+    """
+    m = np.asarray(matrices, dtype=np.float64)
+    m00, m11, m22 = m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]
+
+    # Per matrix, derive from the largest of w, x, y, z for numerical stability
+    candidates = np.stack([1 + m00 + m11 + m22, 1 + m00 - m11 - m22,
+                           1 - m00 + m11 - m22, 1 - m00 - m11 + m22], axis=-1)
+    case = np.argmax(candidates, axis=-1)
+    s = np.sqrt(np.maximum(candidates[np.arange(len(m)), case], 1e-12)) * 2  # 4 * largest
+
+    q = np.empty((len(m), 4))
+    rows = [
+        ((0.25 * s), (m[:, 2, 1] - m[:, 1, 2]) / s, (m[:, 0, 2] - m[:, 2, 0]) / s,
+         (m[:, 1, 0] - m[:, 0, 1]) / s),
+        ((m[:, 2, 1] - m[:, 1, 2]) / s, (0.25 * s), (m[:, 0, 1] + m[:, 1, 0]) / s,
+         (m[:, 0, 2] + m[:, 2, 0]) / s),
+        ((m[:, 0, 2] - m[:, 2, 0]) / s, (m[:, 0, 1] + m[:, 1, 0]) / s, (0.25 * s),
+         (m[:, 1, 2] + m[:, 2, 1]) / s),
+        ((m[:, 1, 0] - m[:, 0, 1]) / s, (m[:, 0, 2] + m[:, 2, 0]) / s,
+         (m[:, 1, 2] + m[:, 2, 1]) / s, (0.25 * s)),
+    ]
+    for i, components in enumerate(rows):
+        mask = case == i
+        q[mask] = np.stack(components, axis=-1)[mask]
+
+    q *= np.where(q[:, :1] < 0, -1.0, 1.0)
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def look_at_quaternions(positions, targets, roll_deg=0.0):
+    """Quaternions (w, x, y, z) aiming cameras at targets, see look_at_matrices()"""
+    return matrices_to_quaternions(look_at_matrices(positions, targets, roll_deg))
+
+
+def orbit_poses(azimuth_deg, elevation_deg, distance, target=(0.0, 0.0, 0.0), roll_deg=0.0):
+    """
+    Camera poses for every (azimuth, elevation, distance) combination.
+
+    Args:
+        azimuth_deg: Azimuths in degrees (0 = front, positive = right)
+        elevation_deg: Elevations in degrees above the target
+        distance: Distances from the target in meters
+        target: (x, y, z) look-at point
+        roll_deg: Roll around the viewing axis in degrees
+
+    Returns:
+        dict: 'azimuth', 'elevation', 'distance' (N,), 'position' (N, 3),
+            'matrix' (N, 3, 3), 'quaternion' (N, 4) arrays
+    """
+    az, el, dist = orbit_grid(azimuth_deg, elevation_deg, distance)
+    positions = orbit_positions(az, el, dist, target)
+    matrices = look_at_matrices(positions, target, roll_deg)
+    return {
+        'azimuth': az, 'elevation': el, 'distance': dist,
+        'position': positions, 'matrix': matrices,
+        'quaternion': matrices_to_quaternions(matrices),
+    }
+
+
+def turntable_azimuths(steps):
+    """Evenly spaced azimuths for a full turn, starting at the front (0°)"""
+    return np.arange(steps) * (360.0 / steps)
+
+
+def orbit_angle_id(azimuth_deg, elevation_deg):
+    """Angle ID of an orbit pose, e.g. 'orbit_az045.0_el15'"""
+    return f"orbit_az{azimuth_deg % 360:05.1f}_el{elevation_deg:g}"
+
+
+def orbit_angle_ids(steps, elevations):
+    """Angle IDs of a turntable, elevation-major (the order of orbit_poses)"""
+    return [orbit_angle_id(az, el) for el in elevations for az in turntable_azimuths(steps)]
+
+
+class OrbitCameraPositions(CameraPositions):
+    """Standard angles plus turntable/elevation-sweep poses"""
+
+    def __init__(self, steps, elevations=(15.0,), roll_deg=0.0):
+        """
+        Initialize orbit generator.
+
+        Args:
+            steps: Azimuth steps per turn (e.g. 36 or 72)
+            elevations: Elevation angles in degrees, one ring each
+            roll_deg: Camera roll in degrees for all orbit poses
+        """
+        self.steps = steps
+        self.elevations = [float(e) for e in elevations]
+        self.roll_deg = roll_deg
+
+    def get_orbit_positions(self, distance, table_height_mm=750):
+        """
+        Orbit poses as angle configs, aimed at the middle of the table height.
+
+        Returns:
+            dict: {angle_id: {name, description, position, rotation, target, quaternion}}
+        """
+        target = (0.0, 0.0, table_height_mm / 1000.0 / 2)
+        poses = orbit_poses(turntable_azimuths(self.steps), self.elevations, distance,
+                            target=target, roll_deg=self.roll_deg)
+
+        configs = {}
+        for i, (az, el) in enumerate(zip(poses['azimuth'], poses['elevation'])):
+            configs[orbit_angle_id(az, el)] = {
+                'name': f"Orbit {az:.1f}° / {el:g}°",
+                'description': f"Turntable pose, azimuth {az:.1f}°, elevation {el:g}°",
+                'position': tuple(poses['position'][i]),
+                'rotation': (90.0 - el, 0.0, az),  # Pitch, yaw, roll (degrees)
+                'target': target,
+                'quaternion': tuple(poses['quaternion'][i]),
+            }
+        return configs
+
+    def get_positions(self, distance, table_height_mm=750):
+        """Standard angle configs merged with the orbit poses"""
+        positions = CameraPositions.get_positions(distance, table_height_mm)
+        positions.update(self.get_orbit_positions(distance, table_height_mm))
+        return positions
+
+    def get_standard_set(self):
+        """All orbit angle IDs, in turntable order"""
+        return orbit_angle_ids(self.steps, self.elevations)
@@ -7,6 +7,7 @@ ensuring consistent perspectives across all furniture models.
 """
 
 import math
+import re
 
 class CameraPositions:
     """Standard camera angles for furniture photography"""
@@ -178,35 +179,116 @@ DIMENSION_PRESETS = {
 }
 
 
-def get_model_dimensions(model_name):
+# Default top thickness for sizes parsed from file names
+DEFAULT_THICKNESS_MM = 40
+
+# '150x80', '200 x 100(1)', '150x80(3?)' -> centimeters
+SIZE_NAME_PATTERN = re.compile(r'^\s*(\d+(?:[.,]\d+)?)\s*[xX×]\s*(\d+(?:[.,]\d+)?)')
+
+# Variant suffixes such as '(1)' or '(3?)' after the base name
+VARIANT_SUFFIX_PATTERN = re.compile(r'\s*\([^)]*\)\s*$')
+
+
+def parse_model_dimensions(model_name):
+    """
+    Derive dimensions from a model file name.
+
+    Variant suffixes are stripped first, so '150x80(3?)' uses the '150x80'
+    preset. Other 'LxW' names are read as centimeters.
+
+    Args:
+        model_name: Model identifier (e.g., '150x80(1)', '200x100')
+
+    Returns:
+        dict: Dimension specifications or None if the name has no size
+    """
+    base = model_name
+    while VARIANT_SUFFIX_PATTERN.search(base):
+        base = VARIANT_SUFFIX_PATTERN.sub('', base)
+    if base in DIMENSION_PRESETS:
+        return dict(DIMENSION_PRESETS[base])
+
+    match = SIZE_NAME_PATTERN.match(base)
+    if not match:
+        return None
+    length_cm, width_cm = (float(v.replace(',', '.')) for v in match.groups())
+    if length_cm <= 0 or width_cm <= 0:
+        return None
+    length, width = max(length_cm, width_cm) * 10, min(length_cm, width_cm) * 10
+    return {
+        'length': length,
+        'width': width,
+        'thickness': DEFAULT_THICKNESS_MM,
+        'ratio': round(length / width, 2),
+        'category': 'rectangular'
+    }
+
+
+def get_model_dimensions(model_name, catalog=None):
     """
     Get dimensions for a model by name.
 
     Args:
-        model_name: Model identifier (e.g., '150x80', '600')
+        model_name: Model identifier (e.g., '150x80', '600', '150x80(1)')
+        catalog: Optional ModelCatalog consulted first
 
     Returns:
         dict: Dimension specifications or None if not found
     """
-    return DIMENSION_PRESETS.get(model_name)
+    if catalog is not None:
+        dims = catalog.dimensions(model_name)
+        if dims:
+            return dims
+    if model_name in DIMENSION_PRESETS:
+        return DIMENSION_PRESETS[model_name]
+    return parse_model_dimensions(model_name)
 
 
-def calculate_optimal_camera_distance(model_name):
+def calculate_optimal_camera_distance(model_name, catalog=None):
     """
     Calculate optimal camera distance for a specific model.
 
     Args:
         model_name: Model identifier (e.g., '150x80')
+        catalog: Optional ModelCatalog consulted first
 
     Returns:
         float: Camera distance in meters, or 3.0 as default
     """
-    dims = get_model_dimensions(model_name)
+    dims = get_model_dimensions(model_name, catalog)
     if dims:
         return CameraPositions.calculate_distance(dims['length'], dims['width'])
     return 3.0  # Default fallback
 
 
+def calculate_framing_distance(bbox_min, bbox_max, fill=0.8, lens_mm=50, sensor_mm=36,
+                               aspect=1.0):
+    """
+    Camera distance at which a model fills a target share of the frame.
+    Uses the bounding sphere of the box, so the model fits from every angle.
+
+    Args:
+        bbox_min: (x, y, z) world-space bounding box minimum in meters
+        bbox_max: (x, y, z) world-space bounding box maximum in meters
+        fill: Share of the frame's shorter side the model should span (0-1)
+        lens_mm: Focal length in millimeters
+        sensor_mm: Sensor width in millimeters (fitted to the longer image side)
+        aspect: Image width / height
+
+    Returns:
+        float: Camera distance from the box center in meters
+    """
+    size = [hi - lo for lo, hi in zip(bbox_min, bbox_max)]
+    radius = 0.5 * math.sqrt(sum(s * s for s in size))
+
+    # Half field of view across the shorter image side
+    half_fov = math.atan(sensor_mm / 2 / lens_mm * min(aspect, 1 / aspect))
+
+    # Angular radius the sphere should subtend
+    target = math.atan(fill * math.tan(half_fov))
+    return radius / math.sin(target)
+
+
 if __name__ == "__main__":
     # Demo: Show camera positions for 150x80 table
     print("="*60)
@@ -10,43 +10,118 @@ This module configures:
 
 import bpy
 import math
+import numpy as np
+
+from studio_lighting import LIGHT_COLOR, LIGHT_GROUPS, WORLD_BACKGROUND_COLOR, WORLD_LIGHT_GROUP
+
+
+RED_MATERIAL_NAME = "Tabletop_Red"
+GREEN_MATERIAL_NAME = "Legs_Green"
+GROUND_PLANE_NAME = "Ground_Plane"
+STUDIO_LIGHT_NAMES = ("Key_Light", "Fill_Light", "Rim_Light")
+
+# Red/green material definitions (Principled BSDF inputs)
+MATERIAL_PARAMS = {
+    RED_MATERIAL_NAME: {
+        'base_color': (0.8, 0.05, 0.05, 1.0),  # Bright red
+        'roughness': 0.7,  # Matte finish
+        'specular': 0.3
+    },
+    GREEN_MATERIAL_NAME: {
+        'base_color': (0.05, 0.8, 0.05, 1.0),  # Bright green
+        'roughness': 0.6,
+        'specular': 0.4
+    }
+}
+
+# Three-point lighting: area softboxes, 5500K daylight (LIGHT_COLOR)
+LIGHTING_PARAMS = {
+    'Key_Light': {  # Main light, 45° left, 30° elevation
+        'location': (2.0, -3.0, 2.5),
+        'energy': 250,  # Watts
+        'size': 1.2,  # Softbox size in meters
+        'rotation_deg': (45, 0, 45)
+    },
+    'Fill_Light': {  # Softer, opposite side, 50% of key
+        'location': (-2.0, -3.0, 2.0),
+        'energy': 125,
+        'size': 1.0,
+        'rotation_deg': (45, 0, -45)
+    },
+    'Rim_Light': {  # Back lighting for edge definition
+        'location': (0, 2.0, 2.5),
+        'energy': 100,
+        'size': 0.8,
+        'rotation_deg': (135, 0, 0)
+    }
+}
+
+# Material pass indices (IndexMA pass, masks in render_passes.py)
+MATERIAL_PASS_INDEX = {RED_MATERIAL_NAME: 1, GREEN_MATERIAL_NAME: 2}
+
+
+def scene_parameters():
+    """
+    Material, lighting and world parameters that affect rendered pixels.
+    Used as part of the render cache key.
+
+    Returns:
+        dict: JSON-serializable parameter snapshot
+    """
+    return {
+        'materials': MATERIAL_PARAMS,
+        'lights': LIGHTING_PARAMS,
+        'light_color': LIGHT_COLOR,
+        'world': WORLD_BACKGROUND_COLOR,
+        'ground': {'name': GROUND_PLANE_NAME, 'size': 10, 'shadow_catcher': True}
+    }
+
+
+def _principled_material(name, base_color, roughness, specular):
+    """Return the named Principled BSDF material, creating it only if missing"""
+    mat = bpy.data.materials.get(name)
+    if mat is None:
+        mat = bpy.data.materials.new(name=name)
+        mat.use_nodes = True
+    mat.use_fake_user = True  # Survives purge_orphans() between models
+
+    bsdf = mat.node_tree.nodes.get("Principled BSDF")
+    bsdf.inputs['Base Color'].default_value = base_color
+    bsdf.inputs['Roughness'].default_value = roughness
+    bsdf.inputs['Specular'].default_value = specular
+    bsdf.inputs['Metallic'].default_value = 0.0
+    mat.pass_index = MATERIAL_PASS_INDEX.get(name, 0)
+    return mat
+
 
+def get_red_green_materials():
+    """
+    Get the red tabletop and green leg materials.
+    Existing datablocks are reused, so repeated setup never creates
+    Tabletop_Red.001, Tabletop_Red.002, ... copies.
 
-def setup_red_green_materials(model_obj):
+    Returns:
+        tuple: (red_mat, green_mat)
+    """
+    red_mat = _principled_material(RED_MATERIAL_NAME, **MATERIAL_PARAMS[RED_MATERIAL_NAME])
+    green_mat = _principled_material(GREEN_MATERIAL_NAME, **MATERIAL_PARAMS[GREEN_MATERIAL_NAME])
+    return red_mat, green_mat
+
+
+def setup_red_green_materials(model_obj, objects=None):
     """
     Apply red tabletop and green leg materials to maintain color coding for AI.
 
     Args:
         model_obj: Imported Blender object (furniture model)
+        objects: Every object of the import (see model_mesh_objects)
 
     Notes:
         - Red marks tabletop surfaces for wood texture replacement
         - Green marks legs/frame for powder coat replacement
         - Colors must be bright and distinct for AI recognition
     """
-    # Create red material for tabletop
-    red_mat = bpy.data.materials.new(name="Tabletop_Red")
-    red_mat.use_nodes = True
-    nodes = red_mat.node_tree.nodes
-
-    # Configure Principled BSDF for red tabletop
-    bsdf = nodes.get("Principled BSDF")
-    bsdf.inputs['Base Color'].default_value = (0.8, 0.05, 0.05, 1.0)  # Bright red
-    bsdf.inputs['Roughness'].default_value = 0.7  # Matte finish
-    bsdf.inputs['Specular'].default_value = 0.3
-    bsdf.inputs['Metallic'].default_value = 0.0
-
-    # Create green material for legs
-    green_mat = bpy.data.materials.new(name="Legs_Green")
-    green_mat.use_nodes = True
-    nodes = green_mat.node_tree.nodes
-
-    # Configure Principled BSDF for green legs
-    bsdf = nodes.get("Principled BSDF")
-    bsdf.inputs['Base Color'].default_value = (0.05, 0.8, 0.05, 1.0)  # Bright green
-    bsdf.inputs['Roughness'].default_value = 0.6
-    bsdf.inputs['Specular'].default_value = 0.4
-    bsdf.inputs['Metallic'].default_value = 0.0
+    red_mat, green_mat = get_red_green_materials()
 
     # Assign materials to object
     # Clear existing materials first
@@ -57,16 +132,65 @@ def setup_red_green_materials(model_obj):
     model_obj.data.materials.append(green_mat)
 
     # If the model has multiple objects, apply to all
-    if hasattr(model_obj, 'children'):
-        for child in model_obj.children:
-            if child.type == 'MESH':
-                child.data.materials.clear()
-                child.data.materials.append(red_mat)
-                child.data.materials.append(green_mat)
+    for child in model_mesh_objects(model_obj, objects):
+        if child is not model_obj:
+            child.data.materials.clear()
+            child.data.materials.append(red_mat)
+            child.data.materials.append(green_mat)
 
     print("✓ Materials configured (red tabletop, green legs)")
 
 
+def _link_to_scene(obj):
+    """Link a new object into the active scene's master collection"""
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def _add_area_light(name, location, energy, size, rotation_deg):
+    """Create an area light object through the data API (no operators)"""
+    light_data = bpy.data.lights.new(name=name, type='AREA')
+    light_data.energy = energy  # Watts
+    light_data.color = LIGHT_COLOR
+    light_data.size = size  # Softbox size in meters
+
+    light = _link_to_scene(bpy.data.objects.new(name, light_data))
+    light.location = location
+    light.rotation_euler = tuple(math.radians(r) for r in rotation_deg)
+    light.lightgroup = LIGHT_GROUPS.get(name, '')
+    return light
+
+
+def remove_object(obj):
+    """Remove an object and its data block if nothing else uses it"""
+    data = obj.data
+    bpy.data.objects.remove(obj, do_unlink=True)
+    if data is not None and data.users == 0:
+        if isinstance(data, bpy.types.Mesh):
+            bpy.data.meshes.remove(data)
+        elif isinstance(data, bpy.types.Light):
+            bpy.data.lights.remove(data)
+        elif isinstance(data, bpy.types.Camera):
+            bpy.data.cameras.remove(data)
+
+
+def purge_orphans():
+    """
+    Remove data blocks with no users (meshes, materials, images, ...).
+    Keeps memory flat when many models are imported in one session; the
+    shared red/green materials carry a fake user and are kept.
+    """
+    if hasattr(bpy.data, 'orphans_purge'):
+        bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+        return
+
+    for collection in (bpy.data.meshes, bpy.data.materials, bpy.data.images,
+                       bpy.data.lights, bpy.data.cameras):
+        for block in list(collection):
+            if block.users == 0:
+                collection.remove(block)
+
+
 def setup_lighting():
     """
     Create three-point studio lighting setup.
@@ -78,38 +202,13 @@ def setup_lighting():
     - Rim light: 100W, backlight
     """
     # Remove existing lights
-    bpy.ops.object.select_all(action='DESELECT')
-    for obj in bpy.data.objects:
+    for obj in list(bpy.data.objects):
         if obj.type == 'LIGHT':
-            obj.select_set(True)
-    bpy.ops.object.delete()
-
-    # Key Light (main light, 45° left, 30° elevation)
-    bpy.ops.object.light_add(type='AREA', location=(2.0, -3.0, 2.5))
-    key_light = bpy.context.active_object
-    key_light.name = "Key_Light"
-    key_light.data.energy = 250  # Watts
-    key_light.data.color = (1.0, 1.0, 0.95)  # 5500K daylight (slightly warm white)
-    key_light.data.size = 1.2  # Softbox size in meters
-    key_light.rotation_euler = (math.radians(45), 0, math.radians(45))
-
-    # Fill Light (softer, opposite side, 50% power)
-    bpy.ops.object.light_add(type='AREA', location=(-2.0, -3.0, 2.0))
-    fill_light = bpy.context.active_object
-    fill_light.name = "Fill_Light"
-    fill_light.data.energy = 125  # 50% of key light
-    fill_light.data.color = (1.0, 1.0, 0.95)
-    fill_light.data.size = 1.0
-    fill_light.rotation_euler = (math.radians(45), 0, math.radians(-45))
-
-    # Rim Light (back lighting for edge definition)
-    bpy.ops.object.light_add(type='AREA', location=(0, 2.0, 2.5))
-    rim_light = bpy.context.active_object
-    rim_light.name = "Rim_Light"
-    rim_light.data.energy = 100
-    rim_light.data.color = (1.0, 1.0, 0.95)
-    rim_light.data.size = 0.8
-    rim_light.rotation_euler = (math.radians(135), 0, 0)
+            remove_object(obj)
+
+    # Key, fill and rim softboxes (see LIGHTING_PARAMS)
+    for name, params in LIGHTING_PARAMS.items():
+        _add_area_light(name, **params)
 
     print("✓ Three-point studio lighting configured")
     print("  • Key light: 250W, 45° left, 5500K")
@@ -123,18 +222,26 @@ def setup_ground_plane():
     Allows realistic contact shadows while maintaining transparent or solid background.
     """
     # Remove existing ground planes
-    for obj in bpy.data.objects:
-        if obj.name.startswith("Ground_Plane"):
-            bpy.data.objects.remove(obj, do_unlink=True)
-
-    # Create new ground plane
-    bpy.ops.mesh.primitive_plane_add(size=10, location=(0, 0, 0))
-    ground = bpy.context.active_object
-    ground.name = "Ground_Plane"
+    for obj in list(bpy.data.objects):
+        if obj.name.startswith(GROUND_PLANE_NAME):
+            remove_object(obj)
+
+    # Create new 10m ground plane
+    half = 5.0
+    mesh = bpy.data.meshes.new(GROUND_PLANE_NAME)
+    mesh.from_pydata(
+        [(-half, -half, 0), (half, -half, 0), (half, half, 0), (-half, half, 0)],
+        [],
+        [(0, 1, 2, 3)]
+    )
+    mesh.update()
+    ground = _link_to_scene(bpy.data.objects.new(GROUND_PLANE_NAME, mesh))
 
     # Shadow catcher material
-    shadow_mat = bpy.data.materials.new(name="Shadow_Catcher")
-    shadow_mat.use_nodes = True
+    shadow_mat = bpy.data.materials.get("Shadow_Catcher")
+    if shadow_mat is None:
+        shadow_mat = bpy.data.materials.new(name="Shadow_Catcher")
+        shadow_mat.use_nodes = True
     ground.data.materials.append(shadow_mat)
 
     # Enable shadow catcher (Cycles only)
@@ -150,7 +257,7 @@ def setup_ground_plane():
     print("✓ Ground plane with shadow catcher configured")
 
 
-def setup_world_background(color=(0.95, 0.95, 0.95)):
+def setup_world_background(color=WORLD_BACKGROUND_COLOR):
     """
     Configure world background color.
 
@@ -164,23 +271,108 @@ def setup_world_background(color=(0.95, 0.95, 0.95)):
     if bg_node:
         bg_node.inputs['Color'].default_value = (*color, 1.0)
         bg_node.inputs['Strength'].default_value = 1.0
+    world.lightgroup = WORLD_LIGHT_GROUP
 
     print(f"✓ World background set to RGB{color}")
 
 
-def apply_material_by_geometry(model_obj, z_threshold=0.5):
+def model_mesh_objects(model_obj, objects=None):
+    """
+    The model object plus every other mesh of the import.
+
+    OBJ and glTF imports create one root object per part, siblings of the
+    model object rather than children, so the importer's object list is
+    the reliable source; without it the model's mesh descendants are used.
+
+    Args:
+        model_obj: Imported furniture model
+        objects: Every object of the import, or None
+
+    Returns:
+        list: Mesh objects, model_obj first
+    """
+    if objects is None:
+        objects = model_obj.children_recursive
+    meshes = [model_obj] if model_obj.type == 'MESH' else []
+    meshes += [obj for obj in objects if obj.type == 'MESH' and obj is not model_obj]
+    return meshes
+
+
+def classify_faces(normal_z, center_z, z_threshold=0.5):
+    """
+    Classify faces as tabletop (red) or legs (green) with array masks.
+
+    Args:
+        normal_z: Array of face normal Z components (mesh space)
+        center_z: Array of face center heights in meters (mesh space)
+        z_threshold: Height threshold (meters) to distinguish tabletop from legs
+
+    Returns:
+        numpy.ndarray: int32 material indices (0 = red tabletop, 1 = green legs)
+    """
+    # Horizontal, upward-facing and elevated faces are tabletop
+    is_top = (normal_z > 0.9) & (center_z > z_threshold)
+    return np.where(is_top, 0, 1).astype(np.int32)
+
+
+def apply_material_by_geometry(model_obj, z_threshold=0.5, objects=None):
     """
     Advanced: Apply materials based on geometry (top surfaces = red, rest = green).
     Useful if imported .obj doesn't have pre-assigned materials.
 
+    Face normals and centers are read in bulk with foreach_get, classified
+    with NumPy masks and written back with a single foreach_set per mesh,
+    so million-face CAD exports take well under a second. Applies to every
+    mesh of the import, each classified in its own mesh coordinates like
+    apply_material_by_geometry_loop.
+
     Args:
         model_obj: Mesh object
         z_threshold: Height threshold (meters) to distinguish tabletop from legs
+        objects: Every object of the import (see model_mesh_objects)
 
     Notes:
         This is an automated approach that detects horizontal top surfaces.
         May need adjustment based on your specific 3D model structure.
     """
+    mesh_objects = model_mesh_objects(model_obj, objects)
+    if not mesh_objects:
+        print(f"⚠ Cannot apply materials to non-mesh object: {model_obj.name}")
+        return
+
+    face_count = 0
+    for obj in mesh_objects:
+        mesh = obj.data
+
+        # Ensure we have materials
+        if len(mesh.materials) < 2:
+            print(f"⚠ {obj.name} needs 2 material slots. Use setup_red_green_materials() first.")
+            continue
+
+        count = len(mesh.polygons)
+        normals = np.empty(count * 3, dtype=np.float32)
+        centers = np.empty(count * 3, dtype=np.float32)
+        mesh.polygons.foreach_get('normal', normals)
+        mesh.polygons.foreach_get('center', centers)
+
+        indices = classify_faces(normals[2::3], centers[2::3], z_threshold)
+        mesh.polygons.foreach_set('material_index', indices)
+        mesh.update()
+        face_count += count
+
+    print(f"✓ Materials assigned by geometry (z_threshold={z_threshold}m, "
+          f"{face_count:,} faces, {len(mesh_objects)} meshes)")
+
+
+def apply_material_by_geometry_loop(model_obj, z_threshold=0.5):
+    """
+    Reference per-face implementation of apply_material_by_geometry.
+    Kept for benchmark_materials.py; use apply_material_by_geometry instead.
+
+    Args:
+        model_obj: Mesh object
+        z_threshold: Height threshold (meters) to distinguish tabletop from legs
+    """
     if model_obj.type != 'MESH':
         print(f"⚠ Cannot apply materials to non-mesh object: {model_obj.name}")
         return
@@ -212,23 +404,24 @@ def apply_material_by_geometry(model_obj, z_threshold=0.5):
     print(f"✓ Materials assigned by geometry (z_threshold={z_threshold}m)")
 
 
-def complete_scene_setup(model_obj, auto_assign_materials=False):
+def complete_scene_setup(model_obj, auto_assign_materials=False, objects=None):
     """
     Complete scene setup with all components.
 
     Args:
         model_obj: Imported furniture model
         auto_assign_materials: If True, attempts automatic material assignment by geometry
+        objects: Every object of the import (see model_mesh_objects)
     """
     print("\n" + "="*60)
     print("Setting up complete rendering scene")
     print("="*60 + "\n")
 
     # Setup materials
-    setup_red_green_materials(model_obj)
+    setup_red_green_materials(model_obj, objects)
 
     if auto_assign_materials:
-        apply_material_by_geometry(model_obj)
+        apply_material_by_geometry(model_obj, objects=objects)
 
     # Setup lighting
     setup_lighting()
@@ -244,6 +437,31 @@ def complete_scene_setup(model_obj, auto_assign_materials=False):
     print("="*60 + "\n")
 
 
+def studio_is_built():
+    """Check whether the persistent studio (lights, ground, materials) exists"""
+    names = (*STUDIO_LIGHT_NAMES, GROUND_PLANE_NAME)
+    return (all(name in bpy.data.objects for name in names)
+            and RED_MATERIAL_NAME in bpy.data.materials
+            and GREEN_MATERIAL_NAME in bpy.data.materials)
+
+
+def setup_studio():
+    """
+    Build the model-independent studio once: lighting, ground plane,
+    world background and the red/green materials.
+    Calling it again is a no-op while the studio is intact.
+    """
+    if studio_is_built():
+        return
+
+    get_red_green_materials()
+    setup_lighting()
+    setup_ground_plane()
+    setup_world_background()
+
+    print("✓ Persistent studio built")
+
+
 if __name__ == "__main__":
     # Demo: This would run inside Blender's Python environment
     print("="*60)
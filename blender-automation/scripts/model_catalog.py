@@ -0,0 +1,336 @@
+"""
+SQLite model catalog.
+
+One database holds what the pipeline knows about each model:
+- models:  name, file path, SHA-256, category, nominal dimensions
+  (DIMENSION_PRESETS seed rows, or parsed from the file name) and the
+  bounding box measured from the mesh
+- renders: status/output/duration per (model, angle, tier)
+
+Lookups by name, dimensions, category and file hash are indexed, and
+batch planning ("which angles still need a final render?") is one query
+instead of a directory walk plus manifest replay. Files are only re-hashed
+when their size or modification time changes.
+
+The database runs in WAL mode with a busy timeout, so the coordinator and
+--workers processes can share it.
+
+Usage:
+    python model_catalog.py catalog.sqlite add ../../references/3D-Models
+    python model_catalog.py catalog.sqlite list [--category rectangular]
+    python model_catalog.py catalog.sqlite pending --tier final
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+
+from camera_positions import CameraPositions, DIMENSION_PRESETS, parse_model_dimensions
+from model_formats import find_model_files
+from render_cache import hash_file
+
+
+CATALOG_NAME = 'catalog.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    name         TEXT PRIMARY KEY,
+    path         TEXT,
+    file_hash    TEXT,
+    file_size    INTEGER,
+    file_mtime   INTEGER,
+    category     TEXT,
+    length_mm    REAL,
+    width_mm     REAL,
+    thickness_mm REAL,
+    dims_source  TEXT,    -- 'preset' or 'filename'
+    bbox_x_mm    REAL,    -- Measured from the imported mesh
+    bbox_y_mm    REAL,
+    bbox_z_mm    REAL,
+    vertices     INTEGER,
+    updated      TEXT
+);
+CREATE INDEX IF NOT EXISTS models_dims ON models (length_mm, width_mm);
+CREATE INDEX IF NOT EXISTS models_category ON models (category);
+CREATE INDEX IF NOT EXISTS models_hash ON models (file_hash);
+
+CREATE TABLE IF NOT EXISTS renders (
+    model    TEXT NOT NULL,
+    angle    TEXT NOT NULL,
+    tier     TEXT NOT NULL,
+    status   TEXT NOT NULL,
+    output   TEXT,
+    duration REAL,
+    updated  TEXT,
+    PRIMARY KEY (model, angle, tier)
+);
+CREATE INDEX IF NOT EXISTS renders_tier_status ON renders (tier, status);
+"""
+
+
+def _now():
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+class ModelCatalog:
+    """SQLite store of models, their dimensions and render status"""
+
+    def __init__(self, path, timeout=30.0):
+        """
+        Open (or create) a catalog and seed it with DIMENSION_PRESETS.
+
+        Args:
+            path: SQLite database file
+            timeout: Seconds to wait for another process's write lock
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path), timeout=timeout)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+        with self.db:
+            for name, dims in DIMENSION_PRESETS.items():
+                self.db.execute(
+                    "INSERT OR IGNORE INTO models (name, category, length_mm, width_mm, "
+                    "thickness_mm, dims_source, updated) VALUES (?, ?, ?, ?, ?, 'preset', ?)",
+                    (name, dims['category'], dims['length'], dims['width'],
+                     dims['thickness'], _now())
+                )
+
+    def close(self):
+        """Close the database connection"""
+        self.db.close()
+
+    # ---- Models ---------------------------------------------------------
+
+    def register_file(self, model_path, category=None):
+        """
+        Add or refresh a model file.
+
+        The file is hashed only if it is new or its size/mtime changed.
+        Nominal dimensions come from the presets or the file name.
+
+        Args:
+            model_path: Model file path (the stem is the model name)
+            category: Category (default: parent directory name, lowercased)
+
+        Returns:
+            sqlite3.Row: The model's row
+        """
+        model_path = Path(model_path).resolve()
+        name = model_path.stem
+        stat = model_path.stat()
+        category = category or model_path.parent.name.lower()
+
+        row = self.get(name)
+        if (row is not None and row['path'] == str(model_path)
+                and row['file_size'] == stat.st_size and row['file_mtime'] == stat.st_mtime_ns):
+            return row
+
+        dims = parse_model_dimensions(name)
+        dims_source = 'preset' if name in DIMENSION_PRESETS else ('filename' if dims else None)
+        with self.db:
+            self.db.execute(
+                "INSERT INTO models (name, path, file_hash, file_size, file_mtime, category, "
+                "length_mm, width_mm, thickness_mm, dims_source, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET path=excluded.path, "
+                "file_hash=excluded.file_hash, file_size=excluded.file_size, "
+                "file_mtime=excluded.file_mtime, category=excluded.category, "
+                "length_mm=excluded.length_mm, width_mm=excluded.width_mm, "
+                "thickness_mm=excluded.thickness_mm, dims_source=excluded.dims_source, "
+                "bbox_x_mm=NULL, bbox_y_mm=NULL, bbox_z_mm=NULL, vertices=NULL, "
+                "updated=excluded.updated",
+                (name, str(model_path), hash_file(model_path), stat.st_size, stat.st_mtime_ns,
+                 category,
+                 dims['length'] if dims else None, dims['width'] if dims else None,
+                 dims['thickness'] if dims else None, dims_source, _now())
+            )
+        return self.get(name)
+
+    def sync_files(self, model_paths):
+        """
+        Register many model files.
+
+        Returns:
+            list: Rows in the order of model_paths
+        """
+        return [self.register_file(path) for path in model_paths]
+
+    def get(self, name):
+        """Look up a model by name (None if unknown)"""
+        return self.db.execute("SELECT * FROM models WHERE name = ?", (name,)).fetchone()
+
+    def by_hash(self, file_hash):
+        """All models whose file has this SHA-256"""
+        return self.db.execute("SELECT * FROM models WHERE file_hash = ? ORDER BY name",
+                               (file_hash,)).fetchall()
+
+    def find(self, category=None, length_mm=None, width_mm=None, tolerance_mm=0.0):
+        """
+        Query models by category and/or nominal dimensions.
+
+        Args:
+            category: Category name (e.g., 'rectangular')
+            length_mm: Nominal length
+            width_mm: Nominal width
+            tolerance_mm: Allowed difference for dimension matches
+
+        Returns:
+            list: Matching rows ordered by name
+        """
+        clauses, params = [], []
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        for column, value in (('length_mm', length_mm), ('width_mm', width_mm)):
+            if value is not None:
+                clauses.append(f"{column} BETWEEN ? AND ?")
+                params += [value - tolerance_mm, value + tolerance_mm]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.db.execute(f"SELECT * FROM models {where} ORDER BY name", params).fetchall()
+
+    def dimensions(self, name):
+        """
+        Nominal dimensions of a model, in the DIMENSION_PRESETS format.
+
+        Returns:
+            dict: {'length', 'width', 'thickness', 'ratio', 'category'} or None
+        """
+        row = self.get(name)
+        if row is None or row['length_mm'] is None:
+            return None
+        return {
+            'length': row['length_mm'],
+            'width': row['width_mm'],
+            'thickness': row['thickness_mm'],
+            'ratio': round(row['length_mm'] / row['width_mm'], 2),
+            'category': row['category'],
+        }
+
+    def update_measurement(self, name, bbox_min, bbox_max, vertices=None):
+        """
+        Store the bounding box measured from the imported mesh.
+
+        Args:
+            name: Model name
+            bbox_min, bbox_max: World bounding box in meters
+            vertices: Vertex count of the imported model
+        """
+        size = [(hi - lo) * 1000.0 for lo, hi in zip(bbox_min, bbox_max)]
+        with self.db:
+            self.db.execute(
+                "UPDATE models SET bbox_x_mm = ?, bbox_y_mm = ?, bbox_z_mm = ?, "
+                "vertices = COALESCE(?, vertices), updated = ? WHERE name = ?",
+                (*size, vertices, _now(), name)
+            )
+
+    # ---- Render status --------------------------------------------------
+
+    def record_render(self, name, angle_id, tier, status, output=None, duration=None):
+        """Record the latest result of one (model, angle, tier)"""
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO renders (model, angle, tier, status, output, duration, "
+                "updated) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, angle_id, tier, status, str(output) if output else None,
+                 round(duration, 3) if duration is not None else None, _now())
+            )
+
+    def completed_files(self, name, angles, tier=None):
+        """
+        Output paths of angles completed at a tier whose files still exist.
+
+        Returns:
+            dict: {angle_id: Path}
+        """
+        query = "SELECT angle, output FROM renders WHERE model = ? AND status = 'success'"
+        params = [name]
+        if tier is not None:
+            query += " AND tier = ?"
+            params.append(tier)
+        done = {}
+        for row in self.db.execute(query, params):
+            if row['angle'] in angles and row['output'] and Path(row['output']).exists():
+                done[row['angle']] = Path(row['output'])
+        return done
+
+    def pending_angles(self, name, angles, tier=None):
+        """Requested angles not yet completed at a tier"""
+        done = self.completed_files(name, angles, tier)
+        return [a for a in angles if a not in done]
+
+    def pending_models(self, names, angles, tier):
+        """
+        Plan a batch: angles still to render for each model.
+
+        Args:
+            names: Model names
+            angles: Requested angle IDs
+            tier: Render tier
+
+        Returns:
+            dict: {name: [angle_id, ...]} for models with pending angles
+        """
+        done = {}
+        for row in self.db.execute(
+                "SELECT model, angle, output FROM renders WHERE tier = ? AND status = 'success'",
+                (tier,)):
+            if row['output'] and Path(row['output']).exists():
+                done.setdefault(row['model'], set()).add(row['angle'])
+
+        plan = {}
+        for name in names:
+            pending = [a for a in angles if a not in done.get(name, ())]
+            if pending:
+                plan[name] = pending
+        return plan
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Model catalog (SQLite)')
+    parser.add_argument('database', help='Catalog .sqlite file')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help='Register model files from a directory')
+    add.add_argument('directory')
+
+    listing = commands.add_parser('list', help='List catalogued models')
+    listing.add_argument('--category')
+
+    pending = commands.add_parser('pending', help='Show angles still to render')
+    pending.add_argument('--tier', default='final')
+    pending.add_argument('-a', '--angles', nargs='+')
+
+    args = parser.parse_args()
+    catalog = ModelCatalog(args.database)
+
+    if args.command == 'add':
+        paths = find_model_files(args.directory)
+        catalog.sync_files(paths)
+        print(f"✓ Registered {len(paths)} model files in {args.database}")
+
+    elif args.command == 'list':
+        for row in catalog.find(category=args.category):
+            dims = (f"{row['length_mm']:.0f}×{row['width_mm']:.0f}mm ({row['dims_source']})"
+                    if row['length_mm'] else "no nominal size")
+            measured = (f", measured {row['bbox_x_mm']:.0f}×{row['bbox_y_mm']:.0f}×"
+                        f"{row['bbox_z_mm']:.0f}mm" if row['bbox_x_mm'] else "")
+            print(f"  {row['name']:20} {row['category'] or '-':18} {dims}{measured}")
+
+    elif args.command == 'pending':
+        angles = args.angles or CameraPositions.get_standard_set()
+        names = [row['name'] for row in catalog.find() if row['path']]
+        plan = catalog.pending_models(names, angles, args.tier)
+        for name, missing in plan.items():
+            print(f"  {name:20} {' '.join(missing)}")
+        print(f"✓ {len(plan)}/{len(names)} models have pending {args.tier} angles")
+
+    catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Geometry fingerprints for deduplicating repeated model exports.
+
+Catalog folders collect repeated exports of the same table (150x80.obj,
+150x80(1).obj, 150x80(3).obj) that differ in bytes (timestamps, vertex
+order, object or group names) but not in shape. The fingerprint hashes a
+canonical form of the geometry:
+
+- vertex positions quantized to a power-of-ten step of about a millionth
+  of the model's size, so float formatting noise does not matter
+- only referenced vertices, deduplicated and sorted, so vertex order and
+  stray vertices do not matter
+- faces re-indexed to the sorted vertices, each rotated to start at its
+  lowest index (winding kept), tagged with its material's order of first
+  use in the file (not its name), and sorted
+
+obj_scanner.py computes it in a second pass of the pre-flight scan for
+valid OBJ files that share face, triangle and material counts with another
+file (index field 'geometry'; None for the others). find_duplicates()
+groups models with the same fingerprint and the same camera framing;
+batch_process_directory renders one model per group and links its outputs
+to the others.
+"""
+
+import hashlib
+import math
+from pathlib import Path
+
+import numpy as np
+
+
+FINGERPRINT_VERSION = 1
+PRECISION = 1e-6  # Quantization step relative to the largest extent
+
+
+def geometry_fingerprint(vertices, corners, sizes, materials=None):
+    """
+    Hash the canonical form of a mesh.
+
+    Args:
+        vertices: (N, 3) float vertex positions
+        corners: Flat 0-based vertex index of every face corner
+        sizes: Corner count of every face (faces below 3 corners are skipped)
+        materials: Material ordinal of every face (None = all the same)
+
+    Returns:
+        str: Hex SHA-256 fingerprint, or None for a mesh without faces
+    """
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    corners = np.asarray(corners, dtype=np.int64)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    materials = (np.zeros(len(sizes), dtype=np.int64) if materials is None
+                 else np.asarray(materials, dtype=np.int64))
+    if not len(sizes) or not len(corners):
+        return None
+
+    # Referenced vertices only, quantized, deduplicated and sorted
+    used, corners = np.unique(corners, return_inverse=True)
+    points = vertices[used]
+    extent = float((points.max(axis=0) - points.min(axis=0)).max())
+    exponent = math.floor(math.log10(extent * PRECISION)) if extent > 0 else 0
+    quantized = np.round(points / 10.0 ** exponent).astype(np.int64)
+    canonical, remap = np.unique(quantized, axis=0, return_inverse=True)
+    corners = remap.reshape(-1)[corners]
+
+    digest = hashlib.sha256()
+    digest.update(f"v{FINGERPRINT_VERSION} e{exponent} n{len(canonical)}".encode())
+    digest.update(canonical.tobytes())
+
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    for size in np.unique(sizes):
+        if size < 3:
+            continue
+        rows = sizes == size
+        faces = corners[starts[rows][:, None] + np.arange(size)]
+        # Same cycle, same winding: start every face at its lowest vertex
+        shift = faces.argmin(axis=1)[:, None]
+        faces = np.take_along_axis(faces, (shift + np.arange(size)) % size, axis=1)
+        faces = np.column_stack([faces, materials[rows]])
+        faces = faces[np.lexsort(faces.T[::-1])]
+        digest.update(f"f{size} n{len(faces)}".encode())
+        digest.update(np.ascontiguousarray(faces).tobytes())
+    return digest.hexdigest()
+
+
+def find_duplicates(model_files, index, framing=None):
+    """
+    Group models whose renders would be identical.
+
+    Args:
+        model_files: Model paths
+        index: {resolved path: entry} from obj_scanner.load_index
+        framing: Optional callable(path) -> hashable camera framing; models
+            only match if it is equal (e.g. preset distances from the name)
+
+    Returns:
+        dict: {alias path: canonical path} for every model that need not be
+            rendered; the canonical model is the shortest name in its group
+    """
+    groups = {}
+    for model_file in model_files:
+        entry = index.get(str(Path(model_file).resolve()))
+        if not entry or not entry.get('valid') or not entry.get('geometry'):
+            continue
+        key = (entry['geometry'], framing(model_file) if framing else None)
+        groups.setdefault(key, []).append(model_file)
+
+    aliases = {}
+    for members in groups.values():
+        canonical = min(members, key=lambda p: (len(Path(p).stem), str(p)))
+        for member in members:
+            if member != canonical:
+                aliases[member] = canonical
+    return aliases
+
@@ -0,0 +1,26 @@
+"""
+Model file types the pipeline can import.
+
+Shared by the importer (mesh_cache.py), the catalog (model_catalog.py) and
+the batch entry points, so none of them depends on another for the list.
+"""
+
+from pathlib import Path
+
+
+# See mesh_cache.import_file for the importer of each type
+MODEL_EXTENSIONS = ('.obj', '.glb', '.gltf', '.stl', '.ply')
+
+
+def find_model_files(directory):
+    """
+    Model files in a directory tree.
+
+    Args:
+        directory: Directory searched recursively
+
+    Returns:
+        list: Sorted Paths with one of MODEL_EXTENSIONS (any case)
+    """
+    return sorted(p for p in Path(directory).glob('**/*')
+                  if p.suffix.lower() in MODEL_EXTENSIONS and p.is_file())
@@ -0,0 +1,478 @@
+"""
+Pre-flight OBJ scanner.
+Checks model files before any Blender render worker is started.
+
+Each .obj file is streamed in fixed-size chunks (memory stays bounded by
+the chunk size, whatever the file size) and summarized:
+- vertex, face and triangle counts
+- object (o), group (g) and material (usemtl) names
+- bounding box and a units guess (m / cm / mm)
+- parse errors: malformed vertices, faces with fewer than 3 corners,
+  face indices that reference undefined vertices, non-finite coordinates
+
+The canonical geometry fingerprint (model_dedup.py) needs the whole mesh
+in memory, so it is computed in a second pass, and only for valid files
+that could be duplicates: those sharing face, triangle and material
+counts with another file of the scan. Other entries keep 'geometry' None.
+
+Files are scanned in a process pool and the results are written to an
+index (model_index.json). Entries are reused while a file's size and
+modification time are unchanged. batch_process_directory() reads the index
+to skip invalid models and to hand the heaviest models out first.
+
+Runs with any Python 3 + NumPy.
+
+Usage:
+    python obj_scanner.py <input_dir> [-o model_index.json] [-j 8]
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from camera_positions import get_model_dimensions
+from model_dedup import geometry_fingerprint
+
+
+INDEX_NAME = 'model_index.json'
+INDEX_VERSION = 2
+CHUNK_SIZE = 4 * 1024 * 1024
+MAX_ERRORS = 20  # Parse errors kept per file (all are counted)
+MAX_NAMES = 100  # Object/group/material names kept per file
+
+# Candidate source units and their scale to meters
+UNIT_SCALES = {'m': 1.0, 'cm': 0.01, 'mm': 0.001}
+
+# Plausible largest dimension of a furniture model, in meters
+PLAUSIBLE_SIZE_M = (0.2, 5.0)
+
+
+class _ObjStats:
+    """Running totals for one OBJ file, fed line batches chunk by chunk"""
+
+    def __init__(self, keep_geometry=False):
+        self.vertices = 0
+        self.faces = 0
+        self.triangles = 0
+        self.objects = []
+        self.groups = []
+        self.materials = []
+        self.bbox_min = np.full(3, np.inf)
+        self.bbox_max = np.full(3, -np.inf)
+        self.errors = []
+        self.error_count = 0
+        # Geometry kept for the fingerprint (second pass only)
+        self.keep_geometry = keep_geometry
+        self.coords = []
+        self.corners = []
+        self.sizes = []
+        self.face_materials = []
+        self.material_ids = {}
+        self.material = 0
+
+    def error(self, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(message)
+
+    def add_name(self, names, line):
+        parts = line.split(None, 1)
+        name = parts[1].decode('utf-8', 'replace').strip() if len(parts) > 1 else ''
+        if name and name not in names and len(names) < MAX_NAMES:
+            names.append(name)
+
+    def feed(self, lines):
+        """Process one chunk of complete lines"""
+        vertex_lines = []
+        face_lines = []
+        face_bases = []  # Vertices defined before each face, for negative indices
+        face_materials = []
+        for line in lines:
+            line = line.strip()
+            if line.startswith(b'v '):
+                vertex_lines.append(line)
+            elif line.startswith(b'f '):
+                face_lines.append(line)
+                face_bases.append(self.vertices + len(vertex_lines))
+                face_materials.append(self.material)
+            elif line.startswith(b'o '):
+                self.add_name(self.objects, line)
+            elif line.startswith(b'g '):
+                self.add_name(self.groups, line)
+            elif line.startswith(b'usemtl'):
+                self.add_name(self.materials, line)
+                # Order of first use, so renamed materials still match
+                self.material = self.material_ids.setdefault(line.split(None, 1)[-1],
+                                                             len(self.material_ids))
+
+        # Faces may reference any vertex defined up to the end of the chunk
+        self.feed_vertices(vertex_lines)
+        self.feed_faces(face_lines, face_bases, face_materials)
+
+    def feed_vertices(self, lines):
+        if not lines:
+            return
+        first = self.vertices + 1
+        try:
+            coords = np.array([line.split()[1:4] for line in lines], dtype=np.float64)
+            if coords.ndim != 2 or coords.shape[1] != 3:
+                raise ValueError
+        except ValueError:
+            # Slow path only for chunks with malformed lines
+            rows = []
+            for i, line in enumerate(lines):
+                try:
+                    row = [float(x) for x in line.split()[1:4]]
+                    if len(row) != 3:
+                        raise ValueError
+                    rows.append(row)
+                except ValueError:
+                    self.error(f"vertex {first + i}: malformed '{line[:60].decode('utf-8', 'replace')}'")
+            coords = np.array(rows, dtype=np.float64).reshape(-1, 3)
+
+        self.vertices += len(lines)
+        if self.keep_geometry:
+            self.coords.append(coords)
+        finite = np.isfinite(coords).all(axis=1)
+        if not finite.all():
+            self.error(f"{int((~finite).sum())} non-finite vertex coordinates "
+                       f"(first near vertex {first + int(np.argmin(finite))})")
+            coords = coords[finite]
+        if len(coords):
+            self.bbox_min = np.minimum(self.bbox_min, coords.min(axis=0))
+            self.bbox_max = np.maximum(self.bbox_max, coords.max(axis=0))
+
+    def feed_faces(self, lines, bases, materials):
+        if not lines:
+            return
+        first = self.faces + 1
+        self.faces += len(lines)
+
+        corners = [line.split()[1:] for line in lines]
+        sizes = np.fromiter((len(c) for c in corners), dtype=np.int64, count=len(corners))
+        short = sizes < 3
+        if short.any():
+            self.error(f"{int(short.sum())} faces with fewer than 3 vertices "
+                       f"(first: face {first + int(np.argmax(short))})")
+        self.triangles += int(np.maximum(sizes - 2, 0).sum())
+
+        try:
+            refs = np.array([token.split(b'/', 1)[0] for c in corners for token in c],
+                            dtype=np.int64)
+        except ValueError:
+            self.error(f"faces {first}-{first + len(lines) - 1}: non-integer vertex reference")
+            return
+
+        # Positive indices are 1-based, negative ones count back from the end
+        bad = (refs == 0) | (refs > self.vertices) | (refs < -self.vertices)
+        if bad.any():
+            self.error(f"{int(bad.sum())} face corners reference undefined vertices "
+                       f"(e.g. index {int(refs[bad][0])} with {self.vertices} vertices defined)")
+            return
+
+        if not self.keep_geometry:
+            return
+        bases = np.repeat(np.asarray(bases, dtype=np.int64), sizes)
+        self.corners.append(np.where(refs < 0, bases + refs, refs - 1))
+        self.sizes.append(sizes)
+        self.face_materials.append(np.asarray(materials, dtype=np.int64))
+
+    def fingerprint(self):
+        """Canonical geometry fingerprint (None without kept geometry or once any error was found)"""
+        if not self.keep_geometry or self.error_count or not self.sizes:
+            return None
+        return geometry_fingerprint(np.concatenate(self.coords), np.concatenate(self.corners),
+                                    np.concatenate(self.sizes),
+                                    np.concatenate(self.face_materials))
+
+
+def guess_units(model_name, bbox_min, bbox_max):
+    """
+    Guess the unit an OBJ was exported in.
+
+    Uses the model's preset length when known, otherwise picks the unit that
+    puts the largest dimension in a plausible furniture size range.
+
+    Args:
+        model_name: Model identifier (e.g. '150x80')
+        bbox_min, bbox_max: Bounding box in file units
+
+    Returns:
+        tuple: (unit name, scale to meters)
+    """
+    extent = float(np.max(np.asarray(bbox_max) - np.asarray(bbox_min)))
+    if extent <= 0:
+        return 'm', 1.0
+
+    dims = get_model_dimensions(model_name)
+    if dims:
+        expected = dims['length'] / 1000.0
+        unit = min(UNIT_SCALES, key=lambda u: abs(np.log(extent * UNIT_SCALES[u] / expected)))
+        return unit, UNIT_SCALES[unit]
+
+    low, high = PLAUSIBLE_SIZE_M
+    for unit, scale in UNIT_SCALES.items():
+        if low <= extent * scale <= high:
+            return unit, scale
+    return 'm', 1.0
+
+
+def scan_obj(path, chunk_size=CHUNK_SIZE, fingerprint=False):
+    """
+    Stream one OBJ file and summarize it.
+
+    Args:
+        path: .obj file path
+        chunk_size: Bytes read per chunk
+        fingerprint: If True, keep the parsed geometry and fill in the
+            'geometry' fingerprint (memory grows with the file)
+
+    Returns:
+        dict: Index entry (see module docstring)
+    """
+    path = Path(path)
+    start = time.perf_counter()
+    stats = _ObjStats(keep_geometry=fingerprint)
+
+    try:
+        stat = path.stat()
+        remainder = b''
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                lines = (remainder + chunk).split(b'\n')
+                remainder = lines.pop()
+                stats.feed(lines)
+        if remainder:
+            stats.feed([remainder])
+    except OSError as e:
+        return {'path': str(path), 'valid': False, 'errors': [f"unreadable: {e}"],
+                'error_count': 1, 'version': INDEX_VERSION}
+
+    if stats.vertices == 0:
+        stats.error("no vertices")
+    if stats.faces == 0:
+        stats.error("no faces")
+
+    entry = {
+        'path': str(path),
+        'name': path.stem,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'version': INDEX_VERSION,
+        'valid': stats.error_count == 0,
+        'vertices': stats.vertices,
+        'faces': stats.faces,
+        'triangles': stats.triangles,
+        'objects': stats.objects,
+        'groups': stats.groups,
+        'materials': stats.materials,
+        'bbox_min': None,
+        'bbox_max': None,
+        'units': None,
+        'scale_to_m': None,
+        'geometry': stats.fingerprint(),
+        'errors': stats.errors,
+        'error_count': stats.error_count,
+        'scan_seconds': round(time.perf_counter() - start, 3),
+    }
+    if np.isfinite(stats.bbox_min).all():
+        entry['bbox_min'] = stats.bbox_min.tolist()
+        entry['bbox_max'] = stats.bbox_max.tolist()
+        entry['units'], entry['scale_to_m'] = guess_units(path.stem, stats.bbox_min,
+                                                          stats.bbox_max)
+    return entry
+
+
+def fingerprint_obj(path):
+    """Second pass over one OBJ file: its geometry fingerprint, or None"""
+    return scan_obj(path, fingerprint=True).get('geometry')
+
+
+def fingerprint_candidates(models):
+    """
+    Valid entries that may duplicate another model and lack a fingerprint.
+
+    Identical geometry always has the same face, triangle and material
+    counts (vertex counts and bounding boxes may differ by stray vertices),
+    so entries unique in those counts cannot have a duplicate.
+
+    Args:
+        models: {resolved path: entry}
+
+    Returns:
+        list: Resolved paths to fingerprint
+    """
+    groups = {}
+    for key, entry in models.items():
+        if entry.get('valid'):
+            counts = (entry['faces'], entry['triangles'], len(entry['materials']))
+            groups.setdefault(counts, []).append(key)
+    return [key for members in groups.values() if len(members) > 1
+            for key in members if not models[key].get('geometry')]
+
+
+def _map(func, paths, workers):
+    """func over paths in a process pool (in this process for one worker)"""
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, paths))
+    return [func(path) for path in paths]
+
+
+def is_current(entry, path):
+    """Whether an index entry still describes the file on disk"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return False
+    return (entry.get('version') == INDEX_VERSION and entry.get('size') == stat.st_size
+            and entry.get('mtime_ns') == stat.st_mtime_ns)
+
+
+def load_index(index_path):
+    """
+    Read a model index.
+
+    Returns:
+        dict: {resolved path: entry} (empty if missing or unreadable)
+    """
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            return json.load(f).get('models', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def write_index(models, index_path):
+    """Write the model index atomically"""
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                   'models': models}, f, indent=2)
+    os.replace(tmp_path, index_path)
+
+
+def scan_files(obj_files, index_path, workers=None):
+    """
+    Scan OBJ files in a process pool and update the index.
+
+    Args:
+        obj_files: .obj paths
+        index_path: Index file to read (reuse unchanged entries) and write
+        workers: Scanner processes (None = one per CPU)
+
+    Returns:
+        dict: {resolved path: entry} for the given files
+    """
+    previous = load_index(index_path)
+    models = {}
+    to_scan = []
+    for obj_file in obj_files:
+        key = str(Path(obj_file).resolve())
+        if key in previous and is_current(previous[key], key):
+            models[key] = previous[key]
+        else:
+            to_scan.append(key)
+
+    if to_scan:
+        models.update(zip(to_scan, _map(scan_obj, to_scan, workers)))
+
+    # Second pass: fingerprints of possible duplicates only
+    candidates = fingerprint_candidates(models)
+    if candidates:
+        for key, geometry in zip(candidates, _map(fingerprint_obj, candidates, workers)):
+            models[key] = {**models[key], 'geometry': geometry}
+
+    # Keep entries for files outside this scan (e.g. another input directory)
+    write_index({**previous, **models}, index_path)
+    print(f"✓ Pre-flight scan: {len(to_scan)} scanned, "
+          f"{len(models) - len(to_scan)} unchanged, {len(candidates)} fingerprinted "
+          f"({index_path})")
+    return models
+
+
+def plan_models(model_files, models):
+    """
+    Split model files into renderable and invalid using a scan result.
+
+    Args:
+        model_files: Model paths (non-OBJ or unscanned files are kept)
+        models: {resolved path: entry} from scan_files()
+
+    Returns:
+        tuple: (renderable paths, heaviest first; {path: entry} of invalid files)
+    """
+    renderable = []
+    invalid = {}
+    for model_file in model_files:
+        entry = models.get(str(Path(model_file).resolve()))
+        if entry is not None and not entry['valid']:
+            invalid[model_file] = entry
+        else:
+            renderable.append(model_file)
+
+    def weight(model_file):
+        entry = models.get(str(Path(model_file).resolve()))
+        return entry.get('triangles', 0) if entry else 0
+
+    renderable.sort(key=weight, reverse=True)  # Stable: unscanned keep their order
+    return renderable, invalid
+
+
+def print_scan_report(models):
+    """Print a per-file table of a scan result"""
+    print(f"\n{'='*60}")
+    print("PRE-FLIGHT SCAN")
+    print(f"{'='*60}")
+    for entry in sorted(models.values(), key=lambda e: e['path']):
+        name = Path(entry['path']).name
+        if entry['valid']:
+            size = np.subtract(entry['bbox_max'], entry['bbox_min'])
+            print(f"✓ {name}: {entry['vertices']:,} vertices, {entry['faces']:,} faces, "
+                  f"{size[0]:.3g}×{size[1]:.3g}×{size[2]:.3g} (units: {entry['units']}), "
+                  f"{len(entry['objects']) + len(entry['groups'])} objects/groups")
+        else:
+            print(f"❌ {name}: {entry['error_count']} errors")
+            for error in entry['errors']:
+                print(f"    {error}")
+    valid = sum(1 for e in models.values() if e['valid'])
+    print(f"{'='*60}")
+    print(f"Valid: {valid}/{len(models)}  "
+          f"Total vertices: {sum(e.get('vertices', 0) for e in models.values()):,}")
+    print(f"{'='*60}\n")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Pre-flight scan of .obj models (no Blender needed)')
+    parser.add_argument('input', help='Directory searched recursively for .obj files, or one .obj file')
+    parser.add_argument('-o', '--index', help=f'Index file (default: <input>/{INDEX_NAME})')
+    parser.add_argument('-j', '--jobs', type=int, help='Scanner processes (default: one per CPU)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only print the summary line')
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if input_path.is_dir():
+        obj_files = sorted(p for p in input_path.glob('**/*') if p.suffix.lower() == '.obj')
+        index_path = Path(args.index) if args.index else input_path / INDEX_NAME
+    else:
+        obj_files = [input_path]
+        index_path = Path(args.index) if args.index else input_path.with_name(INDEX_NAME)
+
+    models = scan_files(obj_files, index_path, workers=args.jobs)
+    if not args.quiet:
+        print_scan_report(models)
+    sys.exit(0 if all(e['valid'] for e in models.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
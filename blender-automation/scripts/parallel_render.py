@@ -0,0 +1,354 @@
+"""
+Multi-process batch rendering coordinator.
+Shards a model list across several headless Blender processes.
+
+This module does not import bpy, so the coordinator can run inside a
+Blender session (batch_render.py --workers N) or from plain Python.
+Each worker is a separate `blender --background` process that renders its
+shard with batch_render.py and writes a results JSON file, which the
+coordinator merges into a single summary.
+"""
+
+import heapq
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+
+
+SCRIPT_DIR = Path(__file__).parent
+BATCH_SCRIPT = SCRIPT_DIR / 'batch_render.py'
+
+
+def shard_models(obj_files, workers):
+    """
+    Split model files into round-robin shards.
+
+    Args:
+        obj_files: List of .obj paths
+        workers: Number of shards
+
+    Returns:
+        list: One list of paths per worker (empty shards are dropped)
+    """
+    shards = [[] for _ in range(workers)]
+    for i, obj_file in enumerate(obj_files):
+        shards[i % workers].append(obj_file)
+    return [shard for shard in shards if shard]
+
+
+def balance_jobs(jobs, workers):
+    """
+    Assign jobs to workers greedily: each job, in order, goes to the worker
+    whose queue finishes earliest (longest-processing-time-first when the
+    jobs come sorted longest first).
+
+    Each job dict gets 'worker' and 'finish' (estimated seconds from the
+    start until it is done).
+
+    Args:
+        jobs: Job dicts with estimated 'seconds' (render_cost.plan_jobs)
+        workers: Number of shards
+
+    Returns:
+        list: One list of jobs per worker (empty shards are dropped)
+    """
+    shards = [[] for _ in range(workers)]
+    loads = [(0.0, i) for i in range(workers)]
+    for job in jobs:
+        load, i = heapq.heappop(loads)
+        load += job['seconds']
+        job['worker'], job['finish'] = i, load
+        shards[i].append(job)
+        heapq.heappush(loads, (load, i))
+    return [shard for shard in shards if shard]
+
+
+def merge_model_result(results, model_name, result):
+    """
+    Add one model's result, combined with an earlier result for the same
+    model (a model can be rendered as several jobs, e.g. hero angle first).
+
+    Args:
+        results: {model_name: result} to update
+        model_name: Model name
+        result: {'status', 'files' or 'error', ...}
+    """
+    previous = results.get(model_name)
+    if previous is None:
+        results[model_name] = result
+        return
+    merged = {**previous, **result,
+              'files': {**previous.get('files', {}), **result.get('files', {})}}
+    if 'failed' in (previous['status'], result['status']):
+        merged['status'] = 'failed'
+        merged['error'] = result.get('error') or previous.get('error')
+    if not (previous.get('resumed') and result.get('resumed')):
+        merged.pop('resumed', None)
+    if 'cache' in previous and 'cache' in result:
+        merged['cache'] = {k: previous['cache'][k] + result['cache'].get(k, 0)
+                           for k in previous['cache']}
+    results[model_name] = merged
+
+
+def parse_core_list(spec):
+    """
+    Parse a CPU core list such as '0-7,16,18'.
+
+    Args:
+        spec: Comma-separated core ids and inclusive ranges
+
+    Returns:
+        list: Sorted core ids
+    """
+    cores = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            cores.update(range(int(start), int(end) + 1))
+        else:
+            cores.add(int(part))
+    return sorted(cores)
+
+
+def format_core_list(cores):
+    """Format core ids back into the '0-7,16' form accepted by parse_core_list"""
+    cores = sorted(cores)
+    parts = []
+    start = prev = None
+    for core in cores:
+        if start is None:
+            start = prev = core
+        elif core == prev + 1:
+            prev = core
+        else:
+            parts.append(f"{start}-{prev}" if start != prev else str(start))
+            start = prev = core
+    if start is not None:
+        parts.append(f"{start}-{prev}" if start != prev else str(start))
+    return ','.join(parts)
+
+
+def available_cores():
+    """Return the cores this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_core_affinity(workers, cores=None):
+    """
+    Divide available cores into contiguous, non-overlapping groups.
+
+    Args:
+        workers: Number of worker processes
+        cores: Core ids to divide (None = cores available to this process)
+
+    Returns:
+        list: One list of core ids per worker
+    """
+    cores = available_cores() if cores is None else sorted(cores)
+    per_worker = max(1, len(cores) // workers)
+    groups = []
+    for i in range(workers):
+        group = cores[i * per_worker:(i + 1) * per_worker]
+        # Oversubscribed: wrap around rather than leave a worker unpinned
+        groups.append(group or [cores[i % len(cores)]])
+    return groups
+
+
+def apply_core_affinity(spec):
+    """
+    Pin the current process to the given cores (Linux only).
+    Render threads started afterwards inherit the mask.
+
+    Args:
+        spec: Core list string, e.g. '0-7'
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        print("⚠ CPU affinity not supported on this platform, ignoring")
+        return
+    cores = parse_core_list(spec)
+    os.sched_setaffinity(0, cores)
+    print(f"✓ Worker pinned to cores {format_core_list(cores)}")
+
+
+def build_worker_command(blender_binary, shard_file, results_file, output_dir,
+                         angles=None, resolution=(2048, 2048), threads=None,
+                         cores=None, worker_args=()):
+    """
+    Build the command line for one headless Blender worker.
+
+    Args:
+        shard_file: Worker input (None for workers that take jobs from a queue)
+        results_file: Results JSON the worker writes (None = no results file)
+        worker_args: Extra batch_render.py flags forwarded to every worker
+
+    Returns:
+        list: Command arguments for subprocess
+    """
+    command = [
+        str(blender_binary), '--background', '--factory-startup',
+        '--python', str(BATCH_SCRIPT), '--',
+    ]
+    if shard_file is not None:
+        command.append(str(shard_file))
+    command += ['-o', str(output_dir), '-r', str(resolution[0]), str(resolution[1])]
+    if results_file is not None:
+        command += ['--results-json', str(results_file)]
+    if angles:
+        command += ['-a', *angles]
+    if threads:
+        command += ['--threads', str(threads)]
+    if cores:
+        command += ['--cpu-affinity', format_core_list(cores)]
+    command += list(worker_args)
+    return command
+
+
+def merge_results(result_files):
+    """
+    Merge per-worker results JSON files into one results dict.
+
+    Args:
+        result_files: Paths written by workers (missing files are skipped)
+
+    Returns:
+        dict: {model_name: result}
+    """
+    merged = {}
+    for result_file in result_files:
+        result_file = Path(result_file)
+        if not result_file.exists():
+            continue
+        with open(result_file) as f:
+            for model_name, result in json.load(f).items():
+                merge_model_result(merged, model_name, result)
+    return merged
+
+
+def run_parallel_batch(obj_files, output_dir, workers, blender_binary,
+                       angles=None, resolution=(2048, 2048),
+                       threads_per_worker=None, pin_cores=False,
+                       worker_args=(), shards=None):
+    """
+    Render models across several Blender processes and merge their results.
+
+    Args:
+        obj_files: List of .obj paths to render
+        output_dir: Output directory for renders
+        workers: Number of Blender processes to launch
+        blender_binary: Path to the Blender executable
+        angles: List of angle IDs to render (None = standard 4 angles)
+        resolution: Output resolution tuple (width, height)
+        threads_per_worker: Cycles threads per worker (None = cores / workers)
+        pin_cores: If True, pin each worker to its own group of cores
+        worker_args: Extra batch_render.py flags forwarded to every worker
+        shards: Job lists per worker from balance_jobs() (None = split
+            obj_files round-robin)
+
+    Returns:
+        dict: Merged {model_name: result} for all workers
+    """
+    output_dir = Path(output_dir)
+    work_dir = output_dir / '.workers'
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    if shards is None:
+        shards = [[{'path': p, 'angles': None} for p in shard]
+                  for shard in shard_models(obj_files, workers)]
+    core_groups = plan_core_affinity(len(shards))
+    if threads_per_worker is None:
+        threads_per_worker = max(1, len(available_cores()) // len(shards))
+
+    print(f"✓ Launching {len(shards)} Blender workers, "
+          f"{threads_per_worker} threads each"
+          f"{' (pinned)' if pin_cores else ''}")
+
+    processes = []
+    for i, shard in enumerate(shards):
+        shard_file = work_dir / f"shard_{i}.json"
+        results_file = work_dir / f"results_{i}.json"
+        log_file = work_dir / f"worker_{i}.log"
+
+        with open(shard_file, 'w') as f:
+            json.dump([{'path': str(job['path']), 'angles': job['angles']} for job in shard],
+                      f, indent=2)
+        if results_file.exists():
+            results_file.unlink()
+
+        command = build_worker_command(
+            blender_binary, shard_file, results_file, output_dir,
+            angles=angles, resolution=resolution, threads=threads_per_worker,
+            cores=core_groups[i] if pin_cores else None,
+            worker_args=worker_args
+        )
+        log = open(log_file, 'w')
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+        processes.append((i, process, log, results_file, shard))
+        print(f"  • Worker {i}: {len(shard)} jobs, log {log_file.name}")
+
+    start = time.time()
+    for i, process, log, results_file, shard in processes:
+        return_code = process.wait()
+        log.close()
+        status = '✓' if return_code == 0 else '❌'
+        print(f"{status} Worker {i} finished (exit {return_code}) "
+              f"after {time.time() - start:.0f}s")
+
+    results = merge_results(p[3] for p in processes)
+
+    # Models from a worker that died before writing results count as failed
+    for i, process, log, results_file, shard in processes:
+        for job in shard:
+            model_name = Path(job['path']).stem
+            if model_name not in results:
+                results[model_name] = {
+                    'status': 'failed',
+                    'error': f"worker {i} exited with code {process.returncode}"
+                }
+
+    return results
+
+
+def load_shard(shard_file):
+    """
+    Read a shard file written by run_parallel_batch.
+
+    Returns:
+        list: (model path, angle IDs or None for the default set) jobs
+    """
+    with open(shard_file) as f:
+        return [(Path(job['path']), job['angles']) for job in json.load(f)]
+
+
+def write_results(results, results_file):
+    """
+    Write a results dict as JSON (paths are stored as strings).
+
+    Args:
+        results: {model_name: result} from batch processing
+        results_file: Destination JSON path
+    """
+    results_file = Path(results_file)
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = results_file.with_suffix(results_file.suffix + '.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    os.replace(tmp_file, results_file)
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("Parallel Render Coordinator")
+    print("="*60)
+    cores = available_cores()
+    print(f"\nAvailable cores: {format_core_list(cores)} ({len(cores)})")
+    for workers in (2, 4, 8):
+        groups = plan_core_affinity(workers, cores)
+        print(f"  {workers} workers: {[format_core_list(g) for g in groups]}")
+    print("="*60)
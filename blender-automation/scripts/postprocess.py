@@ -0,0 +1,296 @@
+"""
+Post-processing of finished renders: web formats and derivative sizes.
+
+Runs outside Blender, so encoding never blocks the renderer. A follower
+process tails <output>/manifest.jsonl and hands every newly finished
+master PNG to a process pool, which writes, next to the master:
+
+    <model>/web/angle_<id>.webp          full resolution
+    <model>/web/angle_<id>_1024.webp     derivative pyramid
+    <model>/web/angle_<id>_512.jpg       ...
+
+With --backgrounds, transparent masters (batch_render.py --transparent)
+are also composited onto each background color (backgrounds.py).
+
+Each master is decoded once; smaller sizes are resized from the previous
+level (Lanczos), so one render produces every published size. Outputs
+newer than their master are skipped, so re-running is cheap.
+
+Requires Pillow in the Python that runs this script (Blender's bundled
+Python usually does not have it; see --postprocess-python in
+batch_render.py).
+
+Usage:
+    python postprocess.py <output_dir>                       # existing renders, then exit
+    python postprocess.py <output_dir> --follow --until-pid 1234
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:  # Checked in main() so the module still imports without Pillow
+    Image = None
+
+from backgrounds import composite_master, parse_background
+from render_manifest import MANIFEST_NAME
+
+
+DEFAULT_FORMATS = ('webp', 'jpeg')
+DEFAULT_SIZES = (1024, 512, 256)
+WEB_DIR_NAME = 'web'
+
+# Encoder settings per format
+FORMAT_OPTIONS = {
+    'webp': {'ext': 'webp', 'save': {'quality': 90, 'method': 4}},
+    'jpeg': {'ext': 'jpg', 'save': {'quality': 90, 'optimize': True, 'progressive': True}},
+    'png': {'ext': 'png', 'save': {'optimize': False, 'compress_level': 6}},
+}
+
+# Background for formats without alpha (JPEG)
+MATTE_COLOR = (255, 255, 255)
+
+
+def derivative_paths(master_path, formats, sizes, master_size):
+    """
+    Output paths for one master render.
+
+    Args:
+        master_path: angle_<id>.png path
+        formats: Format names (keys of FORMAT_OPTIONS)
+        sizes: Derivative long-side sizes in pixels
+        master_size: Long side of the master in pixels
+
+    Returns:
+        list: (size or None for full resolution, format, Path)
+    """
+    master_path = Path(master_path)
+    web_dir = master_path.parent / WEB_DIR_NAME
+    levels = [None] + sorted((s for s in sizes if s < master_size), reverse=True)
+    paths = []
+    for size in levels:
+        suffix = '' if size is None else f"_{size}"
+        for fmt in formats:
+            paths.append((size, fmt, web_dir / f"{master_path.stem}{suffix}.{FORMAT_OPTIONS[fmt]['ext']}"))
+    return paths
+
+
+def _save_atomic(image, path, fmt):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    if fmt == 'jpeg' and image.mode in ('RGBA', 'LA'):
+        matte = Image.new('RGB', image.size, MATTE_COLOR)
+        matte.paste(image, mask=image.getchannel('A'))
+        image = matte
+    elif fmt == 'jpeg' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    image.save(tmp_path, format=fmt.upper(), **FORMAT_OPTIONS[fmt]['save'])
+    os.replace(tmp_path, path)
+
+
+def process_master(master_path, formats=DEFAULT_FORMATS, sizes=DEFAULT_SIZES, backgrounds=()):
+    """
+    Encode all formats and sizes of one master render.
+
+    Args:
+        master_path: Rendered PNG
+        formats: Output formats
+        sizes: Derivative long-side sizes in pixels
+        backgrounds: (name, color) background variants to composite
+
+    Returns:
+        dict: {'master', 'written': [paths], 'skipped': count, 'seconds'}
+    """
+    start = time.perf_counter()
+    master_path = Path(master_path)
+    master_mtime = master_path.stat().st_mtime
+
+    with Image.open(master_path) as image:
+        image.load()
+        targets = derivative_paths(master_path, formats, sizes, max(image.size))
+        todo = [(size, fmt, path) for size, fmt, path in targets
+                if not (path.exists() and path.stat().st_mtime >= master_mtime)]
+
+        written = []
+        current = image
+        for size in sorted({size for size, _, _ in todo}, key=lambda s: -(s or 1 << 30)):
+            if size is not None:
+                scale = size / max(current.size)
+                current = current.resize((max(1, round(current.width * scale)),
+                                          max(1, round(current.height * scale))),
+                                         Image.LANCZOS)
+            for level, fmt, path in todo:
+                if level == size:
+                    _save_atomic(current, path, fmt)
+                    written.append(str(path))
+
+    skipped = len(targets) - len(todo)
+    if backgrounds:
+        variants = composite_master(master_path, backgrounds)
+        written += variants['written']
+        skipped += variants['skipped']
+
+    return {'master': str(master_path), 'written': written,
+            'skipped': skipped,
+            'seconds': round(time.perf_counter() - start, 3)}
+
+
+def process_alive(pid):
+    """Whether a process with this ID is still running"""
+    if os.name == 'nt':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class ManifestFollower:
+    """Reads new successful records from a growing manifest.jsonl"""
+
+    def __init__(self, manifest_path):
+        self.path = Path(manifest_path)
+        self.offset = 0
+        self.seen = {}  # output path -> master mtime already submitted
+
+    def new_masters(self):
+        """
+        Master PNGs finished (or re-rendered) since the last call.
+
+        Returns:
+            list: Paths, in manifest order
+        """
+        if not self.path.exists():
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1  # Leave a partially written last line for later
+        self.offset += end
+
+        masters = []
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict) or record.get('status') != 'success':
+                continue
+            output = record.get('output')
+            if not output:
+                continue
+            try:
+                mtime = Path(output).stat().st_mtime_ns
+            except OSError:
+                continue
+            if self.seen.get(output) != mtime:
+                self.seen[output] = mtime
+                masters.append(Path(output))
+        return masters
+
+
+def run(output_dir, formats=DEFAULT_FORMATS, sizes=DEFAULT_SIZES, workers=None,
+        follow=False, until_pid=None, poll_interval=0.5, backgrounds=()):
+    """
+    Post-process renders recorded in <output_dir>/manifest.jsonl.
+
+    Args:
+        output_dir: Render output directory
+        formats: Output formats
+        sizes: Derivative sizes in pixels
+        workers: Encoder processes (None = one per CPU)
+        follow: Keep watching the manifest for new renders
+        until_pid: In follow mode, stop once this process (the renderer)
+            has exited and its last renders are encoded
+        backgrounds: (name, color) background variants of every master
+
+    Returns:
+        dict: {'masters', 'written', 'failed'} counts
+    """
+    follower = ManifestFollower(Path(output_dir) / MANIFEST_NAME)
+    totals = {'masters': 0, 'written': 0, 'failed': 0}
+    pending = []
+
+    def collect(block):
+        still_pending = []
+        for future in pending:
+            if not block and not future.done():
+                still_pending.append(future)
+                continue
+            try:
+                result = future.result()
+                totals['written'] += len(result['written'])
+                if result['written']:
+                    print(f"✓ {Path(result['master']).parent.name}/{Path(result['master']).name}: "
+                          f"{len(result['written'])} files in {result['seconds']:.2f}s")
+            except Exception as e:
+                totals['failed'] += 1
+                print(f"❌ Post-processing failed: {e}")
+        pending[:] = still_pending
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            renderer_gone = until_pid is not None and not process_alive(until_pid)
+            for master in follower.new_masters():
+                pending.append(pool.submit(process_master, master, formats, sizes, backgrounds))
+                totals['masters'] += 1
+            collect(block=False)
+
+            if not follow or renderer_gone:
+                break  # A renderer that has exited writes nothing new
+            time.sleep(poll_interval)
+        collect(block=True)
+
+    return totals
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Encode web formats and derivative sizes of renders')
+    parser.add_argument('output', help='Render output directory (contains manifest.jsonl)')
+    parser.add_argument('--formats', nargs='+', choices=list(FORMAT_OPTIONS),
+                        default=list(DEFAULT_FORMATS), help='Output formats (default: webp jpeg)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES),
+                        help='Derivative long-side sizes in pixels (default: 1024 512 256)')
+    parser.add_argument('--backgrounds', nargs='+', default=[], metavar='COLOR',
+                        help='Also composite transparent renders onto these colors '
+                             '(preset, #rrggbb or name=#rrggbb)')
+    parser.add_argument('-j', '--jobs', type=int, help='Encoder processes (default: one per CPU)')
+    parser.add_argument('--follow', action='store_true', help='Keep encoding renders as they finish')
+    parser.add_argument('--until-pid', type=int, help='With --follow, exit after this process exits')
+    args = parser.parse_args()
+
+    if Image is None:
+        print(f"❌ Pillow is required: {sys.executable} -m pip install Pillow")
+        sys.exit(1)
+    try:
+        backgrounds = [parse_background(spec) for spec in args.backgrounds]
+    except ValueError as e:
+        parser.error(str(e))
+
+    totals = run(args.output, args.formats, args.sizes, workers=args.jobs,
+                 follow=args.follow, until_pid=args.until_pid, backgrounds=backgrounds)
+    print(f"✓ Post-processing complete: {totals['masters']} renders, "
+          f"{totals['written']} files written, {totals['failed']} failed")
+    sys.exit(1 if totals['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Lighting variants recombined from light-group passes, without Blender.
+
+Renders with --passes lights (batch_render.py) write the key, fill, rim
+and world lighting of every angle as separate linear layers of
+angle_<id>.lights.exr (see render_passes.py). Light transport is linear,
+so any other key/fill ratio or light color is a weighted sum of those
+layers:
+
+    image = Σ gain[group] × tint(temperature[group]) × layer[group]
+
+followed by the Standard view transform the renders use (sRGB, no look).
+Gains of 1 and no temperatures reproduce the rendered image. Variants are
+written as <model>/lighting/<name>/angle_<id>.png, RGBA where the render
+used a transparent film (the shadow catcher's alpha is kept as rendered).
+
+Temperatures are converted to linear Rec.709 colors along the Planckian
+locus (Kang et al. 2002), normalized to unit luminance, and applied
+relative to the color the lights were rendered with (studio_lighting.py).
+
+--check recombines every angle with unit gains and compares it with the
+beauty PNG, to confirm the groups add up to the render for a given scene
+setup (shadow catcher, transparent film, crop) before variants are used.
+
+Requires the OpenEXR Python bindings and Pillow.
+
+Usage:
+    python relight.py <output_dir> --name soft-key --gains key=0.7 fill=0.9
+    python relight.py <output_dir> --name warm --temperatures key=3200 rim=7500
+    python relight.py <output_dir> --check
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from studio_lighting import LIGHT_COLOR, light_group_colors
+
+try:
+    import Imath
+    import OpenEXR
+except ImportError:  # Checked in main() so the module still imports without OpenEXR
+    OpenEXR = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+LIGHTING_DIR_NAME = 'lighting'
+LIGHTS_SUFFIX = '.lights.exr'
+
+# Colors the groups were rendered with (material_setup.py builds the
+# lights and the world from the same values)
+RENDERED_COLORS = light_group_colors()
+
+# --check: mean difference (8-bit levels, covered pixels) still counted as
+# the same image; Blender dithers its 8-bit output by about one level
+CHECK_TOLERANCE = 1.0
+
+MIN_TEMPERATURE, MAX_TEMPERATURE = 1667, 25000  # Range of the locus approximation
+
+REC709_LUMINANCE = np.array([0.2126, 0.7152, 0.0722])
+XYZ_TO_REC709 = np.array([[3.2404542, -1.5371385, -0.4985314],
+                          [-0.9692660, 1.8760108, 0.0415560],
+                          [0.0556434, -0.2040259, 1.0572252]])
+
+
+def temperature_rgb(kelvin):
+    """
+    Linear Rec.709 color of a black body, normalized to unit luminance.
+
+    Args:
+        kelvin: Color temperature (1667-25000K)
+
+    Returns:
+        np.ndarray: (3,) RGB
+    """
+    if not MIN_TEMPERATURE <= kelvin <= MAX_TEMPERATURE:
+        raise ValueError(f"Temperature {kelvin}K outside {MIN_TEMPERATURE}-{MAX_TEMPERATURE}K")
+    t = float(kelvin)
+    if t <= 4000:
+        x = -0.2661239e9 / t**3 - 0.2343589e6 / t**2 + 0.8776956e3 / t + 0.179910
+    else:
+        x = -3.0258469e9 / t**3 + 2.1070379e6 / t**2 + 0.2226347e3 / t + 0.240390
+    if t <= 2222:
+        y = -1.1063814 * x**3 - 1.34811020 * x**2 + 2.18555832 * x - 0.20219683
+    elif t <= 4000:
+        y = -0.9549476 * x**3 - 1.37418593 * x**2 + 2.09137015 * x - 0.16748867
+    else:
+        y = 3.0817580 * x**3 - 5.87338670 * x**2 + 3.75112997 * x - 0.37001483
+    rgb = np.clip(XYZ_TO_REC709 @ np.array([x / y, 1.0, (1 - x - y) / y]), 0.0, None)
+    return rgb / (rgb @ REC709_LUMINANCE)
+
+
+def parse_assignments(specs, convert=float):
+    """
+    Parse 'group=value' arguments.
+
+    Args:
+        specs: Strings like 'key=1.5'
+        convert: Value type
+
+    Returns:
+        dict: {group: value}
+
+    Raises:
+        ValueError: If an argument is not group=value
+    """
+    values = {}
+    for spec in specs or ():
+        group, sep, value = spec.partition('=')
+        if not sep or not group:
+            raise ValueError(f"Expected group=value, got '{spec}'")
+        values[group.lower()] = convert(value)
+    return values
+
+
+def light_factors(groups, gains=None, temperatures=None):
+    """
+    Per-group RGB multipliers for a lighting variant.
+
+    Args:
+        groups: Light group names in the passes
+        gains: {group: intensity multiplier} (missing = 1)
+        temperatures: {group: kelvin} (missing = color as rendered)
+
+    Returns:
+        dict: {group: (3,) RGB factor}
+
+    Raises:
+        ValueError: If a gain or temperature names a group not in the passes
+    """
+    gains, temperatures = gains or {}, temperatures or {}
+    unknown = (set(gains) | set(temperatures)) - set(groups)
+    if unknown:
+        raise ValueError(f"Unknown light group {', '.join(sorted(unknown))} "
+                         f"(passes have {', '.join(groups)})")
+
+    factors = {}
+    for group in groups:
+        factor = np.full(3, float(gains.get(group, 1.0)))
+        if group in temperatures:
+            rendered = np.array(RENDERED_COLORS.get(group, LIGHT_COLOR))
+            factor *= temperature_rgb(temperatures[group]) / (rendered / (rendered @ REC709_LUMINANCE))
+        factors[group] = factor
+    return factors
+
+
+def read_light_layers(exr_path):
+    """
+    Read the light group layers of a lights EXR.
+
+    Args:
+        exr_path: angle_<id>.lights.exr
+
+    Returns:
+        tuple: ({group: (H, W, 3) float32 linear RGB}, (H, W) alpha or None)
+    """
+    exr = OpenEXR.InputFile(str(exr_path))
+    try:
+        header = exr.header()
+        window = header['dataWindow']
+        width, height = window.max.x - window.min.x + 1, window.max.y - window.min.y + 1
+        pixel_type = Imath.PixelType(Imath.PixelType.FLOAT)
+
+        def channel(name):
+            return np.frombuffer(exr.channel(name, pixel_type), dtype=np.float32).reshape(height, width)
+
+        channels = list(header['channels'])
+        layers, alpha = {}, None
+        for layer in dict.fromkeys(name.rsplit('.', 1)[0] for name in channels if '.' in name):
+            if layer == 'Alpha':
+                alpha = channel(next(c for c in channels if c.startswith('Alpha.')))
+            elif all(f"{layer}.{c}" in channels for c in 'RGB'):
+                layers[layer] = np.dstack([channel(f"{layer}.{c}") for c in 'RGB'])
+        return layers, alpha
+    finally:
+        exr.close()
+
+
+def srgb_encode(linear):
+    """Standard view transform: clip to 0-1 and apply the sRGB curve"""
+    linear = np.clip(linear, 0.0, 1.0)
+    return np.where(linear <= 0.0031308, linear * 12.92,
+                    1.055 * np.power(linear, 1 / 2.4) - 0.055)
+
+
+def recombine(layers, factors, alpha=None):
+    """
+    Weighted sum of light group layers, as an 8-bit image.
+
+    Args:
+        layers: {group: (H, W, 3) linear RGB}, premultiplied by alpha
+        factors: {group: (3,) RGB factor} from light_factors()
+        alpha: (H, W) film alpha, or None for an opaque render
+
+    Returns:
+        np.ndarray: (H, W, 3) or (H, W, 4) uint8 image, straight alpha
+    """
+    linear = sum(layers[group] * factors[group] for group in layers)
+    if alpha is None or alpha.min() >= 1.0:
+        return np.round(srgb_encode(linear) * 255).astype(np.uint8)
+    covered = np.maximum(alpha, 1e-6)[..., None]
+    rgb = srgb_encode(np.where(alpha[..., None] > 0, linear / covered, 0.0))
+    return np.round(np.dstack([rgb, np.clip(alpha, 0.0, 1.0)]) * 255).astype(np.uint8)
+
+
+def variant_path(exr_path, name):
+    """<model>/angle_<id>.lights.exr -> <model>/lighting/<name>/angle_<id>.png"""
+    exr_path = Path(exr_path)
+    stem = exr_path.name[:-len(LIGHTS_SUFFIX)]
+    return exr_path.parent / LIGHTING_DIR_NAME / name / f"{stem}.png"
+
+
+def relight_angle(exr_path, name, gains=None, temperatures=None):
+    """
+    Write one lighting variant of one rendered angle.
+
+    Args:
+        exr_path: angle_<id>.lights.exr
+        name: Variant name (output folder)
+        gains: {group: intensity multiplier}
+        temperatures: {group: kelvin}
+
+    Returns:
+        dict: {'path', 'seconds'}
+    """
+    start = time.perf_counter()
+    layers, alpha = read_light_layers(exr_path)
+    image = recombine(layers, light_factors(list(layers), gains, temperatures), alpha)
+
+    path = variant_path(exr_path, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    Image.fromarray(image).save(tmp_path, format='PNG', compress_level=3)
+    os.replace(tmp_path, path)
+    return {'path': str(path), 'seconds': round(time.perf_counter() - start, 3)}
+
+
+def check_angle(exr_path):
+    """
+    Compare the unit-gain sum of an angle's light groups with its beauty PNG.
+
+    Args:
+        exr_path: angle_<id>.lights.exr (angle_<id>.png next to it)
+
+    Returns:
+        dict: {'path', 'mean', 'p99', 'max'} absolute differences in 8-bit
+            levels over the pixels the film covers (alpha > 0), alpha included
+    """
+    exr_path = Path(exr_path)
+    layers, alpha = read_light_layers(exr_path)
+    image = recombine(layers, light_factors(list(layers)), alpha)
+    beauty_path = exr_path.with_name(exr_path.name[:-len(LIGHTS_SUFFIX)] + '.png')
+    with Image.open(beauty_path) as beauty:
+        beauty = np.asarray(beauty.convert('RGBA' if image.shape[2] == 4 else 'RGB'))
+
+    diff = np.abs(image.astype(np.int16) - beauty.astype(np.int16))
+    if alpha is not None:
+        diff = diff[alpha > 0]  # Unrendered (crop) and clear pixels have no color
+    diff = diff.reshape(-1)
+    if not len(diff):
+        return {'path': str(exr_path), 'mean': 0.0, 'p99': 0.0, 'max': 0}
+    return {'path': str(exr_path), 'mean': round(float(diff.mean()), 3),
+            'p99': float(np.percentile(diff, 99)), 'max': int(diff.max())}
+
+
+def find_light_passes(output_dir):
+    """Lights EXRs of every model in an output directory"""
+    return sorted(Path(output_dir).glob(f"*/angle_*{LIGHTS_SUFFIX}"))
+
+
+def check_passes(passes, jobs=None):
+    """
+    Run check_angle() over lights EXRs and print the result.
+
+    Returns:
+        int: Exit status, 1 if an angle differs by more than CHECK_TOLERANCE
+    """
+    differing = failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(check_angle, path): path for path in passes}
+        for future, path in futures.items():
+            name = f"{path.parent.name}/{path.name[:-len(LIGHTS_SUFFIX)]}"
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+                continue
+            if result['mean'] > CHECK_TOLERANCE:
+                differing += 1
+                print(f"⚠ {name}: light groups differ from the render by {result['mean']:.2f} "
+                      f"levels on average (99%: {result['p99']:.0f}, max {result['max']})")
+
+    print(f"✓ Light group check: {len(passes) - differing - failed} of {len(passes)} angles "
+          f"sum to the render within {CHECK_TOLERANCE:g} level, {differing} differ, "
+          f"{failed} failed")
+    return 1 if differing or failed else 0
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Recombine light-group passes into lighting variants')
+    parser.add_argument('output', help='Render output directory (renders with --passes lights)')
+    parser.add_argument('--name', help='Variant name: <model>/lighting/<name>/')
+    parser.add_argument('--check', action='store_true',
+                        help='Compare the unit-gain sum of the light groups with each beauty PNG')
+    parser.add_argument('--gains', nargs='+', default=[], metavar='GROUP=GAIN',
+                        help='Intensity multipliers, e.g. key=1.5 fill=0.5 (groups: key, fill, rim, world)')
+    parser.add_argument('--temperatures', nargs='+', default=[], metavar='GROUP=KELVIN',
+                        help='Light colors as black-body temperatures, e.g. key=3200 rim=7500')
+    parser.add_argument('-j', '--jobs', type=int, help='Processes (default: one per CPU)')
+    args = parser.parse_args()
+
+    if not args.name and not args.check:
+        parser.error('--name is required (or --check)')
+    if OpenEXR is None or Image is None:
+        print(f"❌ OpenEXR and Pillow are required: {sys.executable} -m pip install OpenEXR Pillow")
+        sys.exit(1)
+    try:
+        gains = parse_assignments(args.gains)
+        temperatures = parse_assignments(args.temperatures)
+        for kelvin in temperatures.values():
+            temperature_rgb(kelvin)
+    except ValueError as e:
+        parser.error(str(e))
+
+    passes = find_light_passes(args.output)
+    if not passes:
+        print(f"❌ No light passes in {args.output} (render with --passes lights)")
+        sys.exit(1)
+
+    if args.check:
+        sys.exit(check_passes(passes, args.jobs))
+
+    start = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(relight_angle, path, args.name, gains, temperatures): path
+                   for path in passes}
+        for future, path in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {path.parent.name}/{path.name}: {e}")
+
+    print(f"✓ Lighting variant '{args.name}': {len(passes) - failed} angles in "
+          f"{time.perf_counter() - start:.2f}s, {failed} failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
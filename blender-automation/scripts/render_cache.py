@@ -0,0 +1,207 @@
+"""
+Content-addressed render cache.
+Skips Cycles renders whose inputs have not changed since a previous run.
+
+The cache key combines:
+- SHA-256 of the model file bytes
+- The camera framing for the angle (CameraPositions.get_positions config,
+  or the auto-framing parameters for bounding-box framed models)
+- Render settings (resolution, samples, seed, ...)
+- Material, lighting and world parameters from material_setup.py
+
+Entries are PNG files under <cache_dir>/<key[:2]>/<key>.png. A cache hit is
+materialized into the output directory as a hardlink (or copy across
+filesystems). Eviction is least-recently-used by file modification time,
+which is refreshed on every hit, so several worker processes can share one
+cache directory without a separate index. store() runs it whenever this
+process has added EVICT_CHECK_SHARE of the size limit since the last check,
+so every code path that fills the cache (batches, tiles, queue workers,
+variants, the render service) keeps it bounded.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+
+CACHE_KEY_VERSION = 3
+EVICT_CHECK_SHARE = 0.05  # Check the size after storing this share of max_bytes
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """
+    SHA-256 of a file, read in chunks.
+
+    Args:
+        path: File path
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def render_key(model_hash, camera, render_settings):
+    """
+    Build the cache key for one rendered angle.
+
+    Args:
+        model_hash: SHA-256 of the model file
+        camera: JSON-serializable dict that determines the camera pose
+        render_settings: Dict of everything else that affects pixels
+
+    Returns:
+        str: Hex digest
+    """
+    payload = {
+        'version': CACHE_KEY_VERSION,
+        'model': model_hash,
+        'camera': camera,
+        'settings': render_settings,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def link_file(source, target):
+    """
+    Place a file at target as a hardlink to source (a copy across devices).
+
+    Args:
+        source: Existing file
+        target: Destination path (replaced atomically)
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+class RenderCache:
+    """Size-bounded LRU cache of rendered PNGs"""
+
+    def __init__(self, cache_dir, max_bytes=20 * 1024**3):
+        """
+        Initialize render cache.
+
+        Args:
+            cache_dir: Cache directory (shared between runs and workers)
+            max_bytes: Evict least recently used entries above this size
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._file_hashes = {}
+        self._stored_bytes = 0  # Added since the last eviction check
+
+    def model_hash(self, obj_path):
+        """Hash a model file, memoized by path, size and modification time"""
+        stat = Path(obj_path).stat()
+        memo_key = (str(Path(obj_path).resolve()), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._file_hashes:
+            self._file_hashes[memo_key] = hash_file(obj_path)
+        return self._file_hashes[memo_key]
+
+    def entry_path(self, key):
+        """Path of the cached PNG for a key"""
+        return self.cache_dir / key[:2] / f"{key}.png"
+
+    def lookup(self, key):
+        """
+        Check for a cached render and refresh its LRU timestamp.
+
+        Args:
+            key: Cache key from render_key()
+
+        Returns:
+            Path: Cached file, or None on a miss
+        """
+        entry = self.entry_path(key)
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def materialize(self, entry, output_path):
+        """
+        Place a cached render at the output path (hardlink, else copy).
+
+        Args:
+            entry: Cached file from lookup()
+            output_path: Destination PNG path
+        """
+        link_file(entry, output_path)
+
+    def store(self, key, rendered_path):
+        """
+        Add a finished render to the cache.
+
+        Args:
+            key: Cache key from render_key()
+            rendered_path: Rendered PNG to copy into the cache
+        """
+        entry = self.entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_entry = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        shutil.copy2(rendered_path, tmp_entry)
+        os.replace(tmp_entry, entry)
+        os.utime(entry)
+
+        self._stored_bytes += entry.stat().st_size
+        if self._stored_bytes >= self.max_bytes * EVICT_CHECK_SHARE:
+            self.evict()
+
+    def size_bytes(self):
+        """Total size of all cache entries"""
+        return sum(p.stat().st_size for p in self.cache_dir.glob('*/*.png'))
+
+    def evict(self):
+        """
+        Delete least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        self._stored_bytes = 0
+        entries = []
+        for path in self.cache_dir.glob('*/*.png'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted concurrently by another worker
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            print(f"✓ Render cache evicted {removed} entries "
+                  f"({total / 1024**3:.2f}GB remaining)")
+        return removed
+
+    def stats(self):
+        """Hit/miss counters for the batch summary"""
+        return {'hits': self.hits, 'misses': self.misses}
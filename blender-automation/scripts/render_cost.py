@@ -0,0 +1,295 @@
+"""
+Render-cost model and job planning.
+
+Predicts the seconds per angle of a render from its vertex count,
+resolution, sample budget and tier with a log-linear model
+
+    log(seconds) = a + b·log(pixels × samples) + c·log(vertices) + tier offset
+
+fitted to the 'render' records of earlier runs (<output>/.stats/*.jsonl,
+see render_stats.py). The fit is a ridge regression towards default
+coefficients (about 3 minutes for a 2048² final render of a 50k-vertex
+table, the figure in the README), so a fresh output directory still gets
+estimates: a few renders calibrate the overall speed of the machine, and
+the slopes follow the measurements once the history covers several
+resolutions, sample counts and model sizes.
+
+plan_jobs() turns models into jobs (a model and the angles to render in
+one import) with estimated durations, ordered by a policy:
+
+- longest-first: the most expensive models first, so a giant model is
+  not left rendering alone while the other workers sit idle
+- hero-first: the hero angle (the first requested) of every model, then
+  the remaining angles, so the whole catalog has its main image early
+
+balance_jobs() (parallel_render.py) gives each job to the least loaded
+worker and print_estimate() prints the expected finish time.
+"""
+
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+from render_stats import load_records
+from render_tiers import DEFAULT_LOD_THRESHOLD, DEFAULT_TIER, RENDER_TIERS, get_tier
+
+
+SCHEDULE_POLICIES = ('longest-first', 'hero-first')
+DEFAULT_POLICY = 'longest-first'
+
+# Default model: the reference render and how its time scales
+REFERENCE_PIXEL_SAMPLES = 2048 * 2048 * 256
+REFERENCE_VERTICES = 50_000
+DEFAULT_SECONDS = 180.0  # Reference render on a typical CPU (README: 2-4 min per angle)
+DEFAULT_VERTEX_EXPONENT = 0.1  # BVH traversal grows far slower than the vertex count
+DEFAULT_SETUP_SECONDS = 3.0  # Scene setup, materials and camera per model
+DEFAULT_IMPORT_SECONDS_PER_VERTEX = 5e-6
+
+# Ridge penalties per coefficient (intercept, pixel-samples, vertices, tiers):
+# the intercept moves with little data, the slopes need varied history
+PRIOR_WEIGHTS = (0.1, 20.0, 20.0) + (5.0,) * (len(RENDER_TIERS) - 1)
+
+MAX_HISTORY_FILES = 50  # Newest stats files read for the fit
+OBJ_BYTES_PER_VERTEX = 60  # Rough size of a vertex and its share of faces, unscanned files
+SETUP_STAGES = ('setup_scene', 'materials', 'camera')
+
+_TIER_FEATURES = tuple(name for name in RENDER_TIERS if name != DEFAULT_TIER)
+
+
+def features(vertices, resolution, samples, tier):
+    """Regression features of one render"""
+    pixel_samples = resolution[0] * resolution[1] * samples
+    return ([1.0, math.log(pixel_samples / REFERENCE_PIXEL_SAMPLES),
+             math.log(max(vertices, 1) / REFERENCE_VERTICES)]
+            + [1.0 if tier == name else 0.0 for name in _TIER_FEATURES])
+
+
+def default_coefficients():
+    """Coefficients of the default model"""
+    return np.array([math.log(DEFAULT_SECONDS), 1.0, DEFAULT_VERTEX_EXPONENT]
+                    + [0.0] * len(_TIER_FEATURES))
+
+
+class CostModel:
+    """Predicts render seconds per angle and per-model overhead"""
+
+    def __init__(self, coefficients=None, setup_seconds=DEFAULT_SETUP_SECONDS,
+                 import_seconds_per_vertex=DEFAULT_IMPORT_SECONDS_PER_VERTEX,
+                 renders=0, error=None):
+        """
+        Args:
+            coefficients: Log-linear coefficients (None = defaults)
+            setup_seconds: Per-model scene setup, materials and camera
+            import_seconds_per_vertex: Import time per vertex
+            renders: Number of renders the model was fitted to
+            error: Median relative error on those renders
+        """
+        self.coefficients = (default_coefficients() if coefficients is None
+                             else np.asarray(coefficients, dtype=float))
+        self.setup_seconds = setup_seconds
+        self.import_seconds_per_vertex = import_seconds_per_vertex
+        self.renders = renders
+        self.error = error
+
+    @classmethod
+    def fit(cls, records):
+        """
+        Fit to stage records (render_stats.load_records).
+
+        Args:
+            records: Stage records; successful full-frame 'render' records
+                with vertices, resolution and max_samples are used
+
+        Returns:
+            CostModel: Fitted model (the defaults if there is no usable record)
+        """
+        renders = [r for r in records
+                   if r.get('stage') == 'render' and 'status' not in r and r.get('wall')
+                   and r.get('vertices') and r.get('resolution') and r.get('max_samples')]
+        prior = default_coefficients()
+        coefficients, error = prior, None
+        if renders:
+            X = np.array([features(r['vertices'], r['resolution'], r['max_samples'],
+                                   r.get('tier', DEFAULT_TIER)) for r in renders])
+            y = np.log([r['wall'] for r in renders])
+            # Ridge towards the prior: minimize |y - Xβ|² + Σ w·(β - prior)²
+            A = X.T @ X + np.diag(PRIOR_WEIGHTS)
+            coefficients = prior + np.linalg.solve(A, X.T @ (y - X @ prior))
+            error = float(np.median(np.abs(np.exp(X @ coefficients - y) - 1)))
+
+        setup = DEFAULT_SETUP_SECONDS
+        setup_means = [np.mean([r['wall'] for r in records
+                                if r.get('stage') == stage and r.get('wall') is not None])
+                       for stage in SETUP_STAGES
+                       if any(r.get('stage') == stage for r in records)]
+        if setup_means:
+            setup = float(sum(setup_means))
+
+        per_vertex = DEFAULT_IMPORT_SECONDS_PER_VERTEX
+        imports = [r for r in records
+                   if r.get('stage') == 'import' and r.get('wall') and r.get('vertices')]
+        if imports:
+            per_vertex = sum(r['wall'] for r in imports) / sum(r['vertices'] for r in imports)
+
+        return cls(coefficients, setup, per_vertex, renders=len(renders), error=error)
+
+    @classmethod
+    def from_history(cls, stats_dir, max_files=MAX_HISTORY_FILES):
+        """
+        Fit to the newest stats files of an output directory.
+
+        Args:
+            stats_dir: Directory of stats .jsonl files (<output>/.stats)
+            max_files: Number of newest files to read
+
+        Returns:
+            CostModel: Fitted model (the defaults without history)
+        """
+        stats_dir = Path(stats_dir)
+        files = sorted(stats_dir.glob('*.jsonl'), key=lambda p: p.stat().st_mtime)
+        records = []
+        for path in files[-max_files:]:
+            records.extend(load_records(path))
+        return cls.fit(records)
+
+    def predict(self, vertices, resolution, samples, tier=DEFAULT_TIER):
+        """Estimated render seconds for one angle"""
+        return float(math.exp(np.dot(self.coefficients,
+                                     features(vertices, resolution, samples, tier))))
+
+    def model_seconds(self, vertices):
+        """Estimated per-model overhead (setup, import, materials, camera)"""
+        return self.setup_seconds + self.import_seconds_per_vertex * vertices
+
+    def describe(self):
+        """One-line summary of where the estimates come from"""
+        if not self.renders:
+            return "no render history yet, default estimates"
+        return (f"fitted to {self.renders} renders "
+                f"(median error {self.error:.0%})")
+
+
+def model_vertices(model_file, index=None):
+    """
+    Vertex count of a model file, from its pre-flight index entry.
+
+    Files without one (not scanned, not OBJ) are estimated from their size.
+
+    Args:
+        model_file: Model path
+        index: {resolved path: entry} from obj_scanner.load_index (optional)
+
+    Returns:
+        int: Vertex count
+    """
+    entry = (index or {}).get(str(Path(model_file).resolve()))
+    if entry and entry.get('vertices'):
+        return entry['vertices']
+    try:
+        return max(1, Path(model_file).stat().st_size // OBJ_BYTES_PER_VERTEX)
+    except OSError:
+        return REFERENCE_VERTICES
+
+
+def effective_vertices(vertices, tier, lod_threshold=DEFAULT_LOD_THRESHOLD):
+    """Vertex count actually rendered, after the tier's LOD decimation"""
+    ratio = get_tier(tier)['lod_ratio']
+    if ratio and lod_threshold and vertices >= lod_threshold:
+        return int(vertices * ratio)
+    return vertices
+
+
+def plan_jobs(model_angles, cost_model, resolution, samples, tier=DEFAULT_TIER,
+              index=None, lod_threshold=DEFAULT_LOD_THRESHOLD, policy=DEFAULT_POLICY,
+              hero_angle=None):
+    """
+    Split models into estimated jobs, ordered by a scheduling policy.
+
+    Args:
+        model_angles: (model path, angle IDs to render) pairs
+        cost_model: CostModel
+        resolution: Output resolution (width, height)
+        samples: Maximum Cycles samples
+        tier: Render tier
+        index: Pre-flight model index for vertex counts (optional)
+        lod_threshold: LOD threshold of the run
+        policy: 'longest-first' or 'hero-first'
+        hero_angle: Angle rendered first for every model under hero-first
+            (None = the first angle of each model)
+
+    Returns:
+        list: Job dicts {'path', 'angles', 'seconds', 'hero'} in order
+    """
+    if policy not in SCHEDULE_POLICIES:
+        raise ValueError(f"Unknown schedule policy '{policy}' "
+                         f"(choose from {', '.join(SCHEDULE_POLICIES)})")
+
+    models = []
+    for path, angles in model_angles:
+        vertices = effective_vertices(model_vertices(path, index), tier, lod_threshold)
+        per_angle = cost_model.predict(vertices, resolution, samples, tier)
+        models.append((path, list(angles), per_angle, cost_model.model_seconds(vertices)))
+    models.sort(key=lambda m: -(m[3] + m[2] * len(m[1])))  # Stable for equal estimates
+
+    def job(path, angles, per_angle, overhead, hero=False):
+        return {'path': path, 'angles': angles, 'seconds': overhead + per_angle * len(angles),
+                'hero': hero}
+
+    if policy == 'longest-first':
+        return [job(*m) for m in models if m[1]]
+
+    heroes, rest = [], []
+    for path, angles, per_angle, overhead in models:
+        hero = hero_angle if hero_angle in angles else (angles[0] if angles else None)
+        if hero is None:
+            continue
+        heroes.append(job(path, [hero], per_angle, overhead, hero=True))
+        others = [a for a in angles if a != hero]
+        if others:
+            rest.append(job(path, others, per_angle, overhead))
+    # Both passes stay longest-first
+    rest.sort(key=lambda j: -j['seconds'])
+    return heroes + rest
+
+
+def format_duration(seconds):
+    """Human-readable duration: 42s, 12m 05s, 3h 20m"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+def format_clock(offset_seconds):
+    """Wall-clock time offset_seconds from now (with the day if not today)"""
+    at = time.time() + offset_seconds
+    same_day = time.strftime('%Y%m%d', time.localtime(at)) == time.strftime('%Y%m%d')
+    return time.strftime('%H:%M' if same_day else '%a %d %b %H:%M', time.localtime(at))
+
+
+def print_estimate(jobs, cost_model, workers=1):
+    """
+    Print the estimated render time and completion of a planned run.
+
+    Args:
+        jobs: Planned jobs; balance_jobs() adds each job's 'finish' offset
+        cost_model: CostModel the estimates came from
+        workers: Number of Blender processes
+    """
+    if not jobs:
+        return
+    total = sum(job['seconds'] for job in jobs)
+    makespan = max(job.get('finish', 0.0) for job in jobs) or total
+    angles = sum(len(job['angles']) for job in jobs)
+    print(f"✓ Estimated {format_duration(total)} of rendering for {angles} angles, "
+          f"{format_duration(makespan)} on {workers} worker{'s' if workers != 1 else ''}: "
+          f"done around {format_clock(makespan)}")
+    heroes = [job.get('finish', 0.0) for job in jobs if job.get('hero')]
+    if heroes and max(heroes):
+        print(f"  • Hero angles of all {len(heroes)} models done around "
+              f"{format_clock(max(heroes))}")
+    print(f"  • Cost model: {cost_model.describe()}")
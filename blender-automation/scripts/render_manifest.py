@@ -0,0 +1,150 @@
+"""
+On-disk job manifest for resumable batch runs.
+
+One JSON line per finished (model, angle):
+    {"model": "150x80", "angle": "0deg", "status": "success",
+     "output": ".../150x80/angle_0deg.png", "duration": 182.4,
+     "error": null, "time": "2025-11-20T01:02:03"}
+
+Each record is appended with a single O_APPEND write and fsync'd, so a
+crash, OOM or kill loses at most the angle that was rendering, and
+several worker processes can share one manifest. The last record for a
+(model, angle) wins; a truncated final line is ignored on load.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+
+MANIFEST_NAME = 'manifest.jsonl'
+
+
+class RenderManifest:
+    """Append-only JSON-lines record of rendered angles"""
+
+    def __init__(self, path):
+        """
+        Open (or create) a manifest.
+
+        Args:
+            path: Manifest .jsonl path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.records = {}
+        self._needs_newline = False
+        self.load()
+
+    def load(self):
+        """
+        Read existing records, keeping the latest per (model, angle).
+
+        Returns:
+            int: Number of records read
+        """
+        self.records = {}
+        if not self.path.exists():
+            return 0
+
+        count = 0
+        line = '\n'
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    key = (record['model'], record['angle'])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue  # Partial line from an interrupted write
+                self.records[key] = record
+                count += 1
+
+        # Next append must not be glued onto a truncated final line
+        self._needs_newline = not line.endswith('\n')
+        return count
+
+    def record(self, model_name, angle_id, status, output=None, duration=None,
+               error=None, **extra):
+        """
+        Append one (model, angle) result.
+
+        Args:
+            model_name: Model identifier
+            angle_id: Angle identifier
+            status: 'success' or 'failed'
+            output: Output PNG path
+            duration: Seconds spent on this angle
+            error: Error message for failures
+            **extra: Additional fields (e.g. cached=True)
+        """
+        record = {
+            'model': model_name,
+            'angle': angle_id,
+            'status': status,
+            'output': str(output) if output else None,
+            'duration': round(duration, 3) if duration is not None else None,
+            'error': error,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            **extra
+        }
+        line = (json.dumps(record, default=str) + '\n').encode('utf-8')
+        if self._needs_newline:
+            line = b'\n' + line
+            self._needs_newline = False
+
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        self.records[(model_name, angle_id)] = record
+
+    def is_complete(self, model_name, angle_id, tier=None):
+        """
+        Check for a successful record whose output file still exists.
+
+        Args:
+            model_name: Model identifier
+            angle_id: Angle identifier
+            tier: If given, the record must also have been rendered at this tier
+        """
+        record = self.records.get((model_name, angle_id))
+        return (record is not None and record['status'] == 'success'
+                and (tier is None or record.get('tier') == tier)
+                and record['output'] is not None and Path(record['output']).exists())
+
+    def pending_angles(self, model_name, angles, tier=None):
+        """
+        Filter angles to those not yet completed (missing or failed).
+
+        Args:
+            model_name: Model identifier
+            angles: Requested angle IDs
+            tier: Render tier the angles must have been completed at
+
+        Returns:
+            list: Angle IDs still to render
+        """
+        return [a for a in angles if not self.is_complete(model_name, a, tier)]
+
+    def completed_files(self, model_name, angles, tier=None):
+        """
+        Output paths of completed angles.
+
+        Returns:
+            dict: {angle_id: Path}
+        """
+        return {
+            a: Path(self.records[(model_name, a)]['output'])
+            for a in angles if self.is_complete(model_name, a, tier)
+        }
+
+    def counts(self):
+        """Number of latest records per status"""
+        counts = {}
+        for record in self.records.values():
+            counts[record['status']] = counts.get(record['status'], 0) + 1
+        return counts
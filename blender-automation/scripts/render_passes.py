@@ -0,0 +1,315 @@
+"""
+Conditioning passes written from the same render as the beauty image.
+
+Cycles computes material index, object index, depth and normals while it
+path-traces; the compositor's File Output node writes them next to
+angle_<id>.png, so masks and depth for AI recoloring never need a second
+render or a color segmentation of the red/green image:
+
+    png (one file per output)                exr
+    angle_0deg.mask_tabletop.png  material   angle_0deg.passes.exr, layers
+    angle_0deg.mask_legs.png      material     IndexMA, IndexOB, Depth,
+    angle_0deg.object.png         object       Normal, Alpha
+    angle_0deg.depth.png          depth
+    angle_0deg.normal.png         normal
+    angle_0deg.alpha.png          alpha
+    angle_0deg.lights.exr         lights (always EXR)
+
+PNG masks are antialiased 8-bit coverage masks of the red tabletop and
+green leg materials (pass indices 1 and 2, see material_setup.py). The
+object PNG stores each model object's pass index as its gray level
+(1/255, 2/255, ...). Depth is 16-bit, white at the nearest corner of the
+model's bounding box and black at the farthest (the range is set per
+angle); normals are world space, mapped from [-1, 1] to [0, 1]. Alpha is
+the model's antialiased coverage (every model object, not the ground):
+one minus the ID mask of object index 0, which the ground and the
+background share. The EXR holds the raw float passes and the same alpha.
+
+The 'lights' pass writes the Cycles light groups of studio_lighting.py
+(key, fill, rim and world) as linear half-float layers of their own EXR,
+plus the film alpha. Every light and the world belongs to a group, so with
+unit gains the layers should add up to the beauty image, and relight.py
+recombines them with other gains and color temperatures without Blender.
+That is not verified for every scene setup (the Ground_Plane shadow
+catcher on a transparent film in particular); relight.py --check compares
+the sum with the rendered PNGs.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from material_setup import (GREEN_MATERIAL_NAME, LIGHT_GROUPS, MATERIAL_PASS_INDEX,
+                            RED_MATERIAL_NAME, WORLD_LIGHT_GROUP)
+
+
+PASSES = ('material', 'object', 'depth', 'normal', 'alpha', 'lights')
+PASS_FORMATS = ('png', 'exr')
+
+# Material masks written for the 'material' pass
+MASK_MATERIALS = {'tabletop': RED_MATERIAL_NAME, 'legs': GREEN_MATERIAL_NAME}
+
+# Render Layers output of each pass, and the EXR layer name
+PASS_SOCKETS = {'material': 'IndexMA', 'object': 'IndexOB', 'depth': 'Depth',
+                'normal': 'Normal', 'alpha': 'IndexOB'}
+EXR_LAYERS = {'material': 'IndexMA', 'object': 'IndexOB', 'depth': 'Depth',
+              'normal': 'Normal', 'alpha': 'Alpha'}
+
+
+# Light group layers of the 'lights' EXR
+LIGHT_GROUP_NAMES = tuple(LIGHT_GROUPS.values()) + (WORLD_LIGHT_GROUP,)
+
+
+def pass_outputs(passes, file_format='png'):
+    """
+    Files written per rendered angle.
+
+    Args:
+        passes: Pass names from PASSES
+        file_format: 'png' or 'exr'
+
+    Returns:
+        list: (suffix, format) pairs, e.g. [('mask_tabletop', 'png'),
+            ('depth', 'png'), ('lights', 'exr')] or [('passes', 'exr')]
+    """
+    outputs = []
+    data_passes = [name for name in passes if name != 'lights']
+    if data_passes and file_format == 'exr':
+        outputs.append(('passes', 'exr'))
+    elif data_passes:
+        for name in data_passes:
+            if name == 'material':
+                outputs += [(f"mask_{part}", 'png') for part in MASK_MATERIALS]
+            else:
+                outputs.append((name, 'png'))
+    if 'lights' in passes:
+        outputs.append(('lights', 'exr'))
+    return outputs
+
+
+def pass_path(output_path, suffix, file_format='png'):
+    """angle_0deg.png -> angle_0deg.<suffix>.png (or .exr)"""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.{suffix}.{file_format}")
+
+
+class PassOutput:
+    """Compositor setup that writes passes next to every rendered angle"""
+
+    def __init__(self, scene, passes, file_format='png'):
+        """
+        Enable the passes and build the compositor tree.
+
+        The tree keeps the beauty image going to the Composite node
+        unchanged and adds File Output nodes for the data passes and the
+        light groups.
+
+        Args:
+            scene: Scene to configure
+            passes: Pass names from PASSES
+            file_format: 'png' (separate files) or 'exr' (one multilayer EXR)
+        """
+        self.scene = scene
+        self.passes = list(passes)
+        self.file_format = file_format
+
+        view_layer = scene.view_layers[0]
+        view_layer.use_pass_material_index = 'material' in passes
+        view_layer.use_pass_object_index = bool({'object', 'alpha'} & set(passes))
+        view_layer.use_pass_z = 'depth' in passes
+        view_layer.use_pass_normal = 'normal' in passes
+        if 'lights' in passes:
+            for name in LIGHT_GROUP_NAMES:
+                if name not in view_layer.lightgroups:
+                    view_layer.lightgroups.add(name=name)
+
+        scene.use_nodes = True
+        scene.render.use_compositing = True
+        tree = scene.node_tree
+        tree.nodes.clear()
+        self.tree = tree
+        layers = tree.nodes.new('CompositorNodeRLayers')
+        composite = tree.nodes.new('CompositorNodeComposite')
+        tree.links.new(layers.outputs['Image'], composite.inputs['Image'])
+
+        self.output = self.lights_output = self.depth_range = None
+        if any(name != 'lights' for name in passes):
+            self.output = tree.nodes.new('CompositorNodeOutputFile')
+            if file_format == 'exr':
+                self.build_exr(layers)
+            else:
+                self.build_png(layers)
+        if 'lights' in passes:
+            self.build_lights(layers)
+
+    def _math(self, operation, value, operand):
+        node = self.tree.nodes.new('CompositorNodeMath')
+        node.operation = operation
+        self.tree.links.new(value, node.inputs[0])
+        node.inputs[1].default_value = operand
+        return node.outputs[0]
+
+    def _coverage(self, layers):
+        """Antialiased model coverage: 1 - ID mask of object index 0 (ground, background)"""
+        mask = self.tree.nodes.new('CompositorNodeIDMask')
+        mask.index = 0
+        mask.use_antialiasing = True
+        self.tree.links.new(layers.outputs['IndexOB'], mask.inputs[0])
+        invert = self.tree.nodes.new('CompositorNodeMath')
+        invert.operation = 'SUBTRACT'
+        invert.inputs[0].default_value = 1.0
+        self.tree.links.new(mask.outputs[0], invert.inputs[1])
+        return invert.outputs[0]
+
+    def _slot(self, suffix, color_mode='BW', color_depth='8', data=True):
+        """Add a PNG file slot; data passes bypass the view transform"""
+        slot = self.output.file_slots.new(f"{suffix}_")
+        slot.use_node_format = False
+        fmt = slot.format
+        fmt.file_format = 'PNG'
+        fmt.color_mode = color_mode
+        fmt.color_depth = color_depth
+        if data and hasattr(fmt, 'color_management'):  # Blender 3.2+
+            fmt.color_management = 'OVERRIDE'
+            fmt.view_settings.view_transform = 'Raw'
+        return self.output.inputs[-1]
+
+    def build_png(self, layers):
+        """One PNG per output: ID masks, scaled index, mapped depth and normals"""
+        links = self.tree.links
+        self.output.file_slots.clear()
+        for name in self.passes:
+            if name == 'lights':
+                continue
+            if name == 'material':
+                for part, material_name in MASK_MATERIALS.items():
+                    mask = self.tree.nodes.new('CompositorNodeIDMask')
+                    mask.index = MATERIAL_PASS_INDEX[material_name]
+                    mask.use_antialiasing = True
+                    links.new(layers.outputs['IndexMA'], mask.inputs[0])
+                    links.new(mask.outputs[0], self._slot(f"mask_{part}"))
+            elif name == 'object':
+                links.new(self._math('DIVIDE', layers.outputs['IndexOB'], 255.0),
+                          self._slot('object'))
+            elif name == 'alpha':
+                links.new(self._coverage(layers), self._slot('alpha'))
+            elif name == 'depth':
+                self.depth_range = self.tree.nodes.new('CompositorNodeMapRange')
+                self.depth_range.use_clamp = True
+                links.new(layers.outputs['Depth'], self.depth_range.inputs['Value'])
+                links.new(self.depth_range.outputs[0], self._slot('depth', color_depth='16'))
+            elif name == 'normal':
+                scale = self.tree.nodes.new('CompositorNodeMixRGB')
+                scale.blend_type = 'MULTIPLY'
+                scale.inputs[2].default_value = (0.5, 0.5, 0.5, 1.0)
+                links.new(layers.outputs['Normal'], scale.inputs[1])
+                offset = self.tree.nodes.new('CompositorNodeMixRGB')
+                offset.blend_type = 'ADD'
+                offset.inputs[2].default_value = (0.5, 0.5, 0.5, 1.0)
+                links.new(scale.outputs[0], offset.inputs[1])
+                links.new(offset.outputs[0], self._slot('normal', color_mode='RGB',
+                                                        color_depth='16'))
+
+    def build_exr(self, layers):
+        """All passes as float layers of one multilayer EXR"""
+        fmt = self.output.format
+        fmt.file_format = 'OPEN_EXR_MULTILAYER'
+        fmt.color_depth = '32'
+        fmt.exr_codec = 'ZIP'
+        self.output.layer_slots.clear()
+        for name in self.passes:
+            if name == 'lights':
+                continue
+            self.output.layer_slots.new(EXR_LAYERS[name])
+            value = layers.outputs[PASS_SOCKETS[name]]
+            if name == 'alpha':
+                value = self._coverage(layers)
+            self.tree.links.new(value, self.output.inputs[-1])
+
+    def build_lights(self, layers):
+        """Light group layers (Render Layers 'Combined_<group>') and alpha, half float"""
+        self.lights_output = self.tree.nodes.new('CompositorNodeOutputFile')
+        fmt = self.lights_output.format
+        fmt.file_format = 'OPEN_EXR_MULTILAYER'
+        fmt.color_depth = '16'
+        fmt.exr_codec = 'ZIP'
+        self.lights_output.layer_slots.clear()
+        for name in LIGHT_GROUP_NAMES:
+            self.lights_output.layer_slots.new(name)
+            self.tree.links.new(layers.outputs[f"Combined_{name}"], self.lights_output.inputs[-1])
+        self.lights_output.layer_slots.new('Alpha')
+        self.tree.links.new(layers.outputs['Alpha'], self.lights_output.inputs[-1])
+
+    def set_depth_range(self, camera_position, target, corners):
+        """
+        Map the model's depth range to white (near) .. black (far) for this angle.
+
+        Args:
+            camera_position: Camera location
+            target: Point the camera looks at
+            corners: (8, 3) model bounding-box corners
+        """
+        if self.depth_range is None:
+            return
+        position = np.asarray(camera_position, dtype=np.float64)
+        forward = np.asarray(target, dtype=np.float64) - position
+        forward /= np.linalg.norm(forward)
+        depths = (np.asarray(corners, dtype=np.float64) - position) @ forward
+        inputs = self.depth_range.inputs
+        inputs['From Min'].default_value = float(max(depths.min(), 0.0))
+        inputs['From Max'].default_value = float(depths.max())
+        inputs['To Min'].default_value = 1.0
+        inputs['To Max'].default_value = 0.0
+
+    def begin(self, output_path):
+        """
+        Point the File Output nodes at a scratch directory for one render.
+
+        Args:
+            output_path: Beauty PNG path of the angle
+        """
+        scratch = self.scratch_dir(output_path)
+        if scratch.exists():
+            shutil.rmtree(scratch)
+        scratch.mkdir(parents=True)
+        if self.output is not None and self.file_format == 'exr':
+            self.output.base_path = str(scratch / 'passes_')
+        elif self.output is not None:
+            self.output.base_path = str(scratch) + os.sep
+        if self.lights_output is not None:
+            self.lights_output.base_path = str(scratch / 'lights_')
+
+    def finish(self, output_path):
+        """
+        Move the written passes next to the beauty PNG.
+
+        The File Output node appends the frame number to every file name,
+        so each pass is written to a scratch directory first and renamed.
+
+        Args:
+            output_path: Beauty PNG path of the angle
+
+        Returns:
+            dict: {suffix: Path} of the pass files
+
+        Raises:
+            RuntimeError: If a pass file was not written
+        """
+        scratch = self.scratch_dir(output_path)
+        files = {}
+        for suffix, file_format in pass_outputs(self.passes, self.file_format):
+            written = sorted(scratch.glob(f"{suffix}_*.{file_format}"))
+            if not written:
+                raise RuntimeError(f"Pass '{suffix}' was not written for {Path(output_path).name}")
+            target = pass_path(output_path, suffix, file_format)
+            os.replace(written[-1], target)
+            files[suffix] = target
+        shutil.rmtree(scratch, ignore_errors=True)
+        return files
+
+    @staticmethod
+    def scratch_dir(output_path):
+        output_path = Path(output_path)
+        return output_path.with_name(f".{output_path.stem}.passes.partial")
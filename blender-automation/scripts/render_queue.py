@@ -0,0 +1,510 @@
+"""
+Multi-host render queue with job leases and timeouts.
+
+A SQLite file on storage every render host can reach holds one job per
+(model, angle, tier). Hosts run `batch_render.py --queue DB`, which starts
+a supervisor (run_host) and N Blender worker processes (work_queue):
+
+- A worker claims one job at a time with a time-limited lease, preferring
+  angles of the model it already has loaded.
+- The supervisor renews the leases of its live workers (heartbeat) and
+  kills a worker whose job runs longer than the job timeout, re-queues
+  that job and starts a fresh worker.
+- A worker that crashes has its jobs re-queued at once; a host that dies
+  stops renewing its leases, and any other host re-queues them once they
+  expire. Either way, only the jobs that were held are lost.
+- A job that has been claimed max_attempts times without finishing is
+  marked failed instead of being re-queued forever.
+
+The database uses SQLite's rollback journal rather than WAL (WAL needs
+shared memory, which only works on one host). Leases compare wall-clock
+time across hosts, so keep clocks in sync (NTP) and leases well above
+any expected skew.
+
+Usage:
+    python render_queue.py queue.sqlite status
+    python render_queue.py queue.sqlite retry --tier final
+"""
+
+import os
+import socket
+import sqlite3
+import subprocess
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from parallel_render import available_cores, build_worker_command, plan_core_affinity
+
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_JOB_TIMEOUT = 3600
+DEFAULT_MAX_ATTEMPTS = 3
+
+JOB_STATES = ('queued', 'leased', 'success', 'failed')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY,
+    model         TEXT NOT NULL,
+    path          TEXT NOT NULL,
+    angle         TEXT NOT NULL,
+    tier          TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'queued',  -- queued, leased, success, failed
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    worker        TEXT,
+    started       REAL,    -- Unix time of the current claim
+    lease_expires REAL,
+    output        TEXT,
+    error         TEXT,
+    duration      REAL,
+    updated       TEXT,
+    UNIQUE (model, angle, tier)
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (tier, status, id);
+CREATE INDEX IF NOT EXISTS jobs_worker ON jobs (worker, status);
+"""
+
+
+def _now():
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+class RenderQueue:
+    """SQLite queue of (model, angle, tier) render jobs with leases"""
+
+    def __init__(self, path, lease_seconds=DEFAULT_LEASE_SECONDS,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, timeout=60.0):
+        """
+        Open (or create) a queue.
+
+        Args:
+            path: SQLite database file on storage shared by all hosts
+            lease_seconds: How long a claim stays valid without a heartbeat
+            max_attempts: Claims per job before it is marked failed
+            timeout: Seconds to wait for another process's write lock
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.db = sqlite3.connect(str(self.path), timeout=timeout, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=DELETE')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection"""
+        self.db.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front"""
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        self.db.execute('COMMIT')
+
+    # ---- Producers ------------------------------------------------------
+
+    def enqueue(self, model_paths, angles, tier, retry_failed=False):
+        """
+        Add a job for every (model, angle) at a tier.
+
+        Jobs that already exist keep their state, so enqueueing the same
+        batch twice only adds what is new.
+
+        Args:
+            model_paths: Model files (the stem is the model name)
+            angles: Angle IDs
+            tier: Render tier
+            retry_failed: If True, also re-queue failed jobs of these models
+
+        Returns:
+            int: Number of jobs added or re-queued
+        """
+        added = 0
+        with self._transaction():
+            for model_path in model_paths:
+                model_path = Path(model_path).resolve()
+                for angle_id in angles:
+                    cursor = self.db.execute(
+                        "INSERT OR IGNORE INTO jobs (model, path, angle, tier, updated) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (model_path.stem, str(model_path), angle_id, tier, _now())
+                    )
+                    added += cursor.rowcount
+                    if retry_failed and not cursor.rowcount:
+                        added += self.db.execute(
+                            "UPDATE jobs SET status = 'queued', attempts = 0, error = NULL, "
+                            "path = ?, updated = ? "
+                            "WHERE model = ? AND angle = ? AND tier = ? AND status = 'failed'",
+                            (str(model_path), _now(), model_path.stem, angle_id, tier)
+                        ).rowcount
+        return added
+
+    def retry_failed(self, tier=None):
+        """Re-queue all failed jobs (of one tier); returns the count"""
+        query = ("UPDATE jobs SET status = 'queued', attempts = 0, error = NULL, updated = ? "
+                 "WHERE status = 'failed'")
+        params = [_now()]
+        if tier is not None:
+            query += " AND tier = ?"
+            params.append(tier)
+        with self._transaction():
+            return self.db.execute(query, params).rowcount
+
+    # ---- Workers --------------------------------------------------------
+
+    def claim(self, worker, tier, prefer_model=None):
+        """
+        Lease the next queued job.
+
+        Expired leases are re-queued first, so any live worker recovers
+        the jobs of a dead host.
+
+        Args:
+            worker: Unique worker id
+            tier: Only jobs of this tier are claimed
+            prefer_model: Model name to prefer (already loaded in the scene)
+
+        Returns:
+            dict: Job row, or None if nothing is queued
+        """
+        now = time.time()
+        with self._transaction():
+            self._expire(now)
+            row = self.db.execute(
+                "SELECT * FROM jobs WHERE tier = ? AND status = 'queued' "
+                "ORDER BY model = ? DESC, id LIMIT 1",
+                (tier, prefer_model)
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, attempts = attempts + 1, "
+                "started = ?, lease_expires = ?, updated = ? WHERE id = ?",
+                (worker, now, now + self.lease_seconds, _now(), row['id'])
+            )
+        return {**dict(row), 'worker': worker, 'attempts': row['attempts'] + 1, 'started': now}
+
+    def heartbeat(self, worker):
+        """
+        Renew every lease a worker holds.
+
+        Returns:
+            int: Number of leases renewed
+        """
+        with self._transaction():
+            return self.db.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE worker = ? AND status = 'leased'",
+                (time.time() + self.lease_seconds, worker)
+            ).rowcount
+
+    def finish(self, job_id, worker, status, output=None, error=None, duration=None):
+        """
+        Record a job result, if the worker still holds its lease.
+
+        Returns:
+            bool: False if the lease expired and the job went to another worker
+        """
+        with self._transaction():
+            return self.db.execute(
+                "UPDATE jobs SET status = ?, output = ?, error = ?, duration = ?, "
+                "lease_expires = NULL, updated = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (status, str(output) if output else None, error,
+                 round(duration, 3) if duration is not None else None, _now(), job_id, worker)
+            ).rowcount == 1
+
+    def held(self, worker):
+        """Jobs currently leased by a worker"""
+        return [dict(row) for row in self.db.execute(
+            "SELECT * FROM jobs WHERE worker = ? AND status = 'leased'", (worker,))]
+
+    def release(self, worker, error):
+        """
+        Re-queue the jobs of a worker that crashed or was killed.
+
+        Jobs claimed max_attempts times are marked failed instead.
+
+        Returns:
+            list: Released job rows
+        """
+        with self._transaction():
+            jobs = self.held(worker)
+            for job in jobs:
+                self._requeue(job, error)
+        return jobs
+
+    def expire(self):
+        """
+        Re-queue jobs whose lease has expired (dead or partitioned hosts).
+
+        Returns:
+            list: Expired job rows
+        """
+        with self._transaction():
+            return self._expire(time.time())
+
+    def _expire(self, now):
+        jobs = [dict(row) for row in self.db.execute(
+            "SELECT * FROM jobs WHERE status = 'leased' AND lease_expires < ?", (now,))]
+        for job in jobs:
+            self._requeue(job, f"lease of {job['worker']} expired")
+        return jobs
+
+    def _requeue(self, job, error):
+        status = 'failed' if job['attempts'] >= self.max_attempts else 'queued'
+        self.db.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, error = ?, "
+            "updated = ? WHERE id = ?",
+            (status, error, _now(), job['id'])
+        )
+
+    # ---- Status ---------------------------------------------------------
+
+    def counts(self, tier=None):
+        """
+        Number of jobs per state.
+
+        Returns:
+            dict: {state: count} for every state in JOB_STATES
+        """
+        query = "SELECT status, COUNT(*) AS n FROM jobs"
+        params = []
+        if tier is not None:
+            query += " WHERE tier = ?"
+            params.append(tier)
+        counts = dict.fromkeys(JOB_STATES, 0)
+        for row in self.db.execute(query + " GROUP BY status", params):
+            counts[row['status']] = row['n']
+        return counts
+
+    def failed_jobs(self, tier=None):
+        """Failed job rows (of one tier), by model and angle"""
+        query = "SELECT * FROM jobs WHERE status = 'failed'"
+        params = []
+        if tier is not None:
+            query += " AND tier = ?"
+            params.append(tier)
+        return [dict(row) for row in self.db.execute(query + " ORDER BY model, angle", params)]
+
+
+def work_queue(automation, queue, worker):
+    """
+    Render queued jobs until none of the worker's tier are left.
+
+    Runs inside a Blender worker process; leases are renewed by the
+    supervisor (run_host), which also enforces the job timeout.
+
+    Args:
+        automation: Warm BlenderAutomation instance (its tier selects jobs)
+        queue: RenderQueue
+        worker: Worker id given by the supervisor
+
+    Returns:
+        int: Number of jobs processed
+    """
+    processed = 0
+    while True:
+        loaded = automation.loaded_model[2] if automation.loaded_model else None
+        job = queue.claim(worker, automation.tier_name, prefer_model=loaded)
+        if job is None:
+            return processed
+
+        print(f"\n✓ Claimed job {job['id']}: {job['model']} {job['angle']} "
+              f"(attempt {job['attempts']})")
+        start = time.time()
+        output, error = None, None
+        try:
+            files = automation.process_model(Path(job['path']), job['model'], [job['angle']],
+                                             reuse_loaded=True)
+            output = files.get(job['angle'])
+            if output is None:
+                error = f"Unknown angle: {job['angle']}"
+        except Exception as e:
+            error = str(e)
+
+        status = 'success' if output else 'failed'
+        if not queue.finish(job['id'], worker, status, output, error, time.time() - start):
+            print(f"⚠ Lease on job {job['id']} was lost; result not recorded")
+        processed += 1
+
+
+def run_host(queue_path, output_dir, workers, blender_binary, tier,
+             resolution=(2048, 2048), threads_per_worker=None, pin_cores=False,
+             worker_args=(), job_timeout=DEFAULT_JOB_TIMEOUT,
+             lease_seconds=DEFAULT_LEASE_SECONDS, poll_interval=2.0):
+    """
+    Supervise this host's Blender workers until the queue is drained.
+
+    Args:
+        queue_path: Shared queue database
+        output_dir: Output directory (shared by all hosts)
+        workers: Blender worker processes on this host
+        blender_binary: Path to the Blender executable
+        tier: Tier whose jobs this host renders
+        resolution: Output resolution tuple (width, height)
+        threads_per_worker: Cycles threads per worker (None = cores / workers)
+        pin_cores: If True, pin each worker to its own group of cores
+        worker_args: Extra batch_render.py flags forwarded to every worker
+        job_timeout: Seconds a single job may run before its worker is killed
+        lease_seconds: Lease length of this host's workers; renewed every third of it
+
+    Returns:
+        dict: Job counts per state for the tier when the host stops
+    """
+    queue = RenderQueue(queue_path, lease_seconds=lease_seconds)
+    host = f"{socket.gethostname()}-{os.getpid()}"
+    work_dir = Path(output_dir) / '.workers'
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    core_groups = plan_core_affinity(workers)
+    if threads_per_worker is None:
+        threads_per_worker = max(1, len(available_cores()) // workers)
+    heartbeat_interval = lease_seconds / 3
+
+    print(f"✓ Render host {host}: {workers} workers, {tier} tier, "
+          f"job timeout {job_timeout:.0f}s, lease {lease_seconds:.0f}s")
+
+    slots = [None] * workers  # (worker id, process, log) per slot
+    launches = 0
+    crashes_in_a_row = 0
+    finished_before = None
+    last_heartbeat = 0.0
+
+    def launch(i):
+        nonlocal launches
+        launches += 1
+        worker = f"{host}-w{i}-{launches}"
+        log_file = work_dir / f"queue_worker_{i}.log"
+        command = build_worker_command(
+            blender_binary, None, None, output_dir,
+            resolution=resolution, threads=threads_per_worker,
+            cores=core_groups[i] if pin_cores else None,
+            worker_args=[*worker_args, '--queue', str(queue_path), '--queue-worker', worker,
+                         '--tier', tier, '--lease', f"{lease_seconds:g}"]
+        )
+        log = open(log_file, 'a')
+        slots[i] = (worker, subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT), log)
+        print(f"  • Worker {worker} started, log {log_file.name}")
+
+    while True:
+        now = time.time()
+        renew = now - last_heartbeat >= heartbeat_interval
+        for i, slot in enumerate(slots):
+            if slot is None:
+                continue
+            worker, process, log = slot
+            return_code = process.poll()
+
+            if return_code is None:
+                overdue = [job for job in queue.held(worker)
+                           if now - job['started'] > job_timeout]
+                if not overdue:
+                    if renew:
+                        queue.heartbeat(worker)
+                    continue
+                # Stuck (e.g. a hung import): kill, re-queue, replace
+                process.kill()
+                process.wait()
+                log.close()
+                for job in queue.release(worker, f"timed out after {job_timeout:.0f}s"):
+                    print(f"❌ Job {job['id']} ({job['model']} {job['angle']}) timed out, "
+                          f"worker {worker} killed")
+                slots[i] = None
+                continue
+
+            log.close()
+            released = queue.release(worker, f"worker exited with code {return_code}")
+            if return_code != 0 or released:
+                crashes_in_a_row += 1
+                print(f"❌ Worker {worker} exited with code {return_code}, "
+                      f"re-queued {len(released)} jobs")
+            slots[i] = None
+        if renew:
+            last_heartbeat = now
+
+        queue.expire()
+        counts = queue.counts(tier)
+        finished = counts['success'] + counts['failed']
+        if finished != finished_before:
+            crashes_in_a_row = 0  # Workers are making progress
+            finished_before = finished
+
+        if crashes_in_a_row > 3 * workers:
+            print(f"❌ Workers keep crashing without finishing jobs, stopping host {host}")
+            for slot in slots:
+                if slot is not None:
+                    slot[1].kill()
+                    slot[1].wait()
+                    slot[2].close()
+                    queue.release(slot[0], "host stopped")
+            break
+
+        if counts['queued']:
+            for i, slot in enumerate(slots):
+                if slot is None:
+                    launch(i)
+        elif not counts['leased'] and all(slot is None for slot in slots):
+            break  # Drained; nothing left that could be re-queued
+
+        time.sleep(poll_interval)
+
+    counts = queue.counts(tier)
+    queue.close()
+    return counts
+
+
+def print_queue_status(queue, tier=None):
+    """Print job counts and the most recent failures"""
+    counts = queue.counts(tier)
+    total = sum(counts.values())
+    print(f"\n{'='*60}")
+    print(f"RENDER QUEUE: {queue.path}{f' ({tier})' if tier else ''}")
+    print(f"{'='*60}")
+    for state in JOB_STATES:
+        print(f"  {state:8} {counts[state]:6}")
+    print(f"  {'total':8} {total:6}")
+    failed = queue.failed_jobs(tier)
+    for job in failed[:20]:
+        print(f"  ❌ {job['model']} {job['angle']} ({job['tier']}): {job['error']}")
+    if len(failed) > 20:
+        print(f"  ... and {len(failed) - 20} more failed jobs")
+    print(f"{'='*60}\n")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Multi-host render queue (SQLite)')
+    parser.add_argument('database', help='Queue .sqlite file')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    status = commands.add_parser('status', help='Show job counts and failures')
+    status.add_argument('--tier')
+
+    retry = commands.add_parser('retry', help='Re-queue failed jobs')
+    retry.add_argument('--tier')
+
+    commands.add_parser('expire', help='Re-queue jobs whose lease has expired')
+
+    args = parser.parse_args()
+    queue = RenderQueue(args.database)
+
+    if args.command == 'status':
+        print_queue_status(queue, args.tier)
+    elif args.command == 'retry':
+        print(f"✓ Re-queued {queue.retry_failed(args.tier)} failed jobs")
+    elif args.command == 'expire':
+        print(f"✓ Re-queued {len(queue.expire())} jobs with expired leases")
+
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
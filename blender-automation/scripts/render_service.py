@@ -0,0 +1,271 @@
+"""
+Resident render worker service.
+Keeps one Blender process warm and renders jobs dropped into a job directory.
+
+A one-off `blender --background --python batch_render.py` call pays for
+Blender startup, addon loading and Cycles device setup before every render.
+The service pays that once, then serves jobs from a directory:
+
+    <job_dir>/incoming/<job_id>.json   submitted jobs
+    <job_dir>/active/<job_id>.json     jobs claimed by the service
+    <job_dir>/done/<job_id>.json       results {status, files | error}
+
+Job format:
+    {"type": "render_angle", "model": "/path/150x80.obj", "angle": "45deg_left"}
+    {"type": "process_model", "model": "/path/150x80.obj", "angles": ["0deg"]}
+    {"type": "shutdown"}
+
+Identical jobs waiting at the same time are merged into one render and every
+submitter receives the same result. This module does not import bpy; the
+serve loop drives a BlenderAutomation instance passed in by batch_render.py.
+"""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+
+JOB_TYPES = ('render_angle', 'process_model', 'shutdown')
+
+
+def job_dirs(job_dir):
+    """
+    Create and return the job directory layout.
+
+    Args:
+        job_dir: Root job directory
+
+    Returns:
+        tuple: (incoming, active, done) Paths
+    """
+    job_dir = Path(job_dir)
+    dirs = tuple(job_dir / name for name in ('incoming', 'active', 'done'))
+    for d in dirs:
+        d.mkdir(parents=True, exist_ok=True)
+    return dirs
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file and rename, so readers never see partial files"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def job_key(job):
+    """
+    Canonical key for merging identical jobs.
+
+    Args:
+        job: Job dict
+
+    Returns:
+        str: SHA-1 of the job's render-relevant fields
+    """
+    angles = [job.get('angle')] if job['type'] == 'render_angle' else job.get('angles')
+    canonical = {
+        'model': str(Path(job['model']).resolve()),
+        'model_name': job.get('model_name'),
+        'angles': sorted(angles) if angles else None,
+    }
+    encoded = json.dumps(canonical, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def submit_job(job_dir, job):
+    """
+    Submit a job to a running service.
+
+    Args:
+        job_dir: Root job directory
+        job: Job dict (see module docstring)
+
+    Returns:
+        str: Job id used for the result file
+    """
+    if job.get('type') not in JOB_TYPES:
+        raise ValueError(f"Unknown job type: {job.get('type')}")
+    incoming, _, _ = job_dirs(job_dir)
+    job_id = job.get('id') or uuid.uuid4().hex
+    write_json_atomic(incoming / f"{job_id}.json", {**job, 'id': job_id})
+    return job_id
+
+
+def wait_for_result(job_dir, job_id, timeout=600, poll_interval=0.25):
+    """
+    Wait for a job result written by the service.
+
+    Args:
+        job_dir: Root job directory
+        job_id: Id returned by submit_job
+        timeout: Seconds to wait before giving up
+
+    Returns:
+        dict: Result {id, status, files | error}
+    """
+    result_path = Path(job_dir) / 'done' / f"{job_id}.json"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if result_path.exists():
+            with open(result_path) as f:
+                return json.load(f)
+        time.sleep(poll_interval)
+    raise TimeoutError(f"No result for job {job_id} after {timeout}s")
+
+
+def claim_pending_jobs(job_dir):
+    """
+    Move every waiting job from incoming/ to active/.
+
+    Returns:
+        list: Claimed job dicts, oldest first
+    """
+    incoming, active, _ = job_dirs(job_dir)
+    pending = sorted(incoming.glob('*.json'), key=lambda p: p.stat().st_mtime)
+
+    jobs = []
+    for job_path in pending:
+        claimed_path = active / job_path.name
+        try:
+            os.replace(job_path, claimed_path)
+        except FileNotFoundError:
+            continue  # Claimed by another service on the same directory
+        try:
+            with open(claimed_path) as f:
+                job = json.load(f)
+            job.setdefault('id', job_path.stem)
+        except (OSError, json.JSONDecodeError) as e:
+            job = {'id': job_path.stem, 'type': 'invalid', 'error': str(e)}
+        jobs.append(job)
+    return jobs
+
+
+def requeue_orphaned_jobs(job_dir):
+    """
+    Return jobs a previous service left in active/ to incoming/.
+
+    A service that crashed or was killed mid-render never writes results
+    for the jobs it had claimed; without this their clients wait until
+    wait_for_result() times out. Jobs that already have a result are only
+    removed from active/. Call before serving, while no other service is
+    using the directory.
+
+    Returns:
+        int: Number of jobs queued again
+    """
+    incoming, active, done = job_dirs(job_dir)
+    requeued = 0
+    for job_path in sorted(active.glob('*.json'), key=lambda p: p.stat().st_mtime):
+        if (done / job_path.name).exists():
+            job_path.unlink(missing_ok=True)
+            continue
+        try:
+            os.replace(job_path, incoming / job_path.name)
+        except FileNotFoundError:
+            continue
+        requeued += 1
+    return requeued
+
+
+def group_jobs(jobs):
+    """
+    Merge identical jobs.
+
+    Args:
+        jobs: Claimed job dicts
+
+    Returns:
+        list: (representative_job, [job_ids]) in arrival order
+    """
+    groups = {}
+    for job in jobs:
+        if job.get('type') not in ('render_angle', 'process_model') or 'model' not in job:
+            groups[job['id']] = (job, [job['id']])
+            continue
+        key = job_key(job)
+        if key in groups:
+            groups[key][1].append(job['id'])
+        else:
+            groups[key] = (job, [job['id']])
+    return list(groups.values())
+
+
+def run_job(automation, job):
+    """
+    Execute one render job on a warm BlenderAutomation instance.
+
+    Returns:
+        dict: {status, files} or {status, error}
+    """
+    if job.get('type') not in ('render_angle', 'process_model'):
+        return {'status': 'failed', 'error': job.get('error', f"Unknown job type: {job.get('type')}")}
+    if 'model' not in job:
+        return {'status': 'failed', 'error': "Job is missing 'model'"}
+
+    angles = [job.get('angle')] if job['type'] == 'render_angle' else job.get('angles')
+
+    try:
+        files = automation.process_model(
+            Path(job['model']), job.get('model_name'), angles, reuse_loaded=True
+        )
+        missing = [a for a in (angles or []) if a not in files]
+        if missing:
+            return {'status': 'failed', 'error': f"Unknown angles: {', '.join(map(str, missing))}"}
+        return {'status': 'success', 'files': {k: str(v) for k, v in files.items()}}
+    except Exception as e:
+        return {'status': 'failed', 'error': str(e)}
+
+
+def serve(automation, job_dir, poll_interval=0.25):
+    """
+    Serve render jobs until a shutdown job arrives.
+
+    Args:
+        automation: Warm BlenderAutomation instance
+        job_dir: Root job directory
+        poll_interval: Seconds between scans of incoming/
+    """
+    _, active, done = job_dirs(job_dir)
+    requeued = requeue_orphaned_jobs(job_dir)
+    if requeued:
+        print(f"⚠ Re-queued {requeued} jobs left active by a previous run")
+    print(f"✓ Render service listening on {Path(job_dir).resolve()}")
+
+    while True:
+        jobs = claim_pending_jobs(job_dir)
+        if not jobs:
+            time.sleep(poll_interval)
+            continue
+
+        shutdown = False
+        for job, job_ids in group_jobs(jobs):
+            if job.get('type') == 'shutdown':
+                # Finish everything claimed in this round before exiting
+                shutdown = True
+                for job_id in job_ids:
+                    write_json_atomic(done / f"{job_id}.json", {'id': job_id, 'status': 'success'})
+                    (active / f"{job_id}.json").unlink(missing_ok=True)
+                continue
+
+            start = time.time()
+            result = run_job(automation, job)
+            result['duration'] = round(time.time() - start, 3)
+            result['merged'] = len(job_ids)
+
+            for job_id in job_ids:
+                write_json_atomic(done / f"{job_id}.json", {'id': job_id, **result})
+                (active / f"{job_id}.json").unlink(missing_ok=True)
+
+            status = '✓' if result['status'] == 'success' else '❌'
+            merged = f" (merged {len(job_ids)} requests)" if len(job_ids) > 1 else ''
+            print(f"{status} Job {job.get('type')} {job.get('model', '')}{merged} "
+                  f"in {result['duration']:.1f}s")
+
+        if shutdown:
+            print("✓ Render service shutting down")
+            return
@@ -0,0 +1,308 @@
+"""
+Per-stage timing and resource instrumentation.
+
+Each stage of a render (scene setup, import, materials, camera, render and
+its Cycles phases, cache, stitching) is recorded as one JSON line:
+
+    {"stage": "render", "model": "150x80", "angle": "0deg", "start": 1732064523.41,
+     "wall": 182.4, "cpu": 1411.9, "peak_rss_mb": 2210.5, "pid": 4121,
+     "vertices": 48211, "samples": 512}
+
+wall is elapsed time, cpu is process CPU time over the stage (all render
+threads, so cpu / wall is the effective parallelism) and peak_rss_mb is
+the process's peak resident memory so far. Render sub-stages
+('render.sync', 'render.path_trace', 'render.denoise', 'render.write')
+come from Blender's render_stats/render_post handlers (see RenderPhases).
+
+Records are appended with one O_APPEND write each, so every worker of a
+run can share one file. The file converts to a Chrome trace
+(chrome://tracing or https://ui.perfetto.dev) and a per-stage summary.
+
+Usage:
+    python render_stats.py <output>/.stats/run-20251120-010203-4121.jsonl [--trace trace.json]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+STATS_DIR_NAME = '.stats'
+
+# Cycles status text -> phase, first match wins
+PHASE_KEYWORDS = (
+    ('denoise', ('denoising',)),
+    ('path_trace', ('sample', 'path tracing', 'rendering tile')),
+    ('finish', ('finished', 'cancel')),
+    ('sync', ('synchroniz', 'updating', 'loading', 'building', 'bvh', 'initializ',
+              'compil', 'waiting')),
+)
+SAMPLE_PATTERN = re.compile(r'Sample (\d+)/(\d+)')
+
+
+def default_stats_path(output_dir):
+    """Per-run stats file under <output>/.stats/"""
+    run_id = f"run-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    return Path(output_dir) / STATS_DIR_NAME / f"{run_id}.jsonl"
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MiB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class RenderStats:
+    """Records stage timings to a JSON-lines file"""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Stats .jsonl file (None = time stages but write nothing)
+        """
+        self.path = Path(path) if path else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name, model=None, angle=None, **fields):
+        """
+        Time a block as one stage.
+
+        The yielded dict can be filled with fields known only at the end
+        (e.g. samples). A stage that raises is recorded with status 'failed'.
+
+        Args:
+            name: Stage name (e.g. 'import', 'render')
+            model: Model identifier
+            angle: Angle identifier
+            **fields: Extra fields (vertices, resolution, ...)
+        """
+        start = time.time()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        status = 'success'
+        try:
+            yield fields
+        except BaseException:
+            status = 'failed'
+            raise
+        finally:
+            self.record(name, model, angle, start=start,
+                        wall=time.perf_counter() - wall_start,
+                        cpu=time.process_time() - cpu_start,
+                        **({'status': status} if status != 'success' else {}), **fields)
+
+    def record(self, name, model=None, angle=None, start=None, wall=None, cpu=None, **fields):
+        """Append one stage record measured by the caller"""
+        if self.path is None:
+            return
+        record = {
+            'stage': name,
+            'model': model,
+            'angle': angle,
+            'start': round(start if start is not None else time.time(), 6),
+            'wall': round(wall, 6) if wall is not None else None,
+            'cpu': round(cpu, 6) if cpu is not None else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'pid': os.getpid(),
+            **fields
+        }
+        line = (json.dumps(record, default=str) + '\n').encode('utf-8')
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+class RenderPhases:
+    """
+    Splits one render into phases from Cycles status updates.
+
+    Blender calls render_stats handlers with the status line shown in the
+    console ("... | Synchronizing object | Table", "... | Sample 64/512",
+    "... | Denoising"); render_post marks the start of image output.
+    Status lines that match no phase keep the current phase.
+    """
+
+    def __init__(self):
+        self.marks = []  # (phase, epoch, perf_counter, process_time)
+        self.samples = None
+        self.mark('sync')
+
+    def mark(self, phase):
+        """Start a phase now (no-op if it is already the current one)"""
+        if self.marks and self.marks[-1][0] == phase:
+            return
+        self.marks.append((phase, time.time(), time.perf_counter(), time.process_time()))
+
+    def on_stats(self, text):
+        """Handle one render_stats status line"""
+        lowered = text.lower()
+        match = SAMPLE_PATTERN.search(text)
+        if match:
+            self.samples = int(match.group(1))
+        for phase, keywords in PHASE_KEYWORDS:
+            if any(k in lowered for k in keywords):
+                if phase != 'finish':
+                    self.mark(phase)
+                return
+
+    def segments(self):
+        """
+        Consecutive phase segments up to now.
+
+        Returns:
+            list: (phase, start epoch, wall seconds, cpu seconds)
+        """
+        end = ('end', time.time(), time.perf_counter(), time.process_time())
+        marks = self.marks + [end]
+        return [(phase, start, marks[i + 1][2] - wall, marks[i + 1][3] - cpu)
+                for i, (phase, start, wall, cpu) in enumerate(self.marks)]
+
+    def record(self, stats, model=None, angle=None):
+        """Write each phase segment as a 'render.<phase>' stage"""
+        for phase, start, wall, cpu in self.segments():
+            stats.record(f"render.{phase}", model, angle, start=start, wall=wall, cpu=cpu)
+
+
+def load_records(path):
+    """Read stage records, skipping partial lines"""
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and 'stage' in record:
+                records.append(record)
+    return records
+
+
+def write_chrome_trace(records, trace_path):
+    """
+    Write records as a Chrome trace (one track per process).
+
+    Args:
+        records: Stage records
+        trace_path: Output .json path
+    """
+    origin = min((r['start'] for r in records), default=0.0)
+    events = []
+    for pid in sorted({r['pid'] for r in records}):
+        events.append({'ph': 'M', 'name': 'process_name', 'pid': pid, 'tid': 0,
+                       'args': {'name': f"blender {pid}"}})
+    for r in records:
+        args = {k: v for k, v in r.items() if k not in ('stage', 'start', 'wall', 'pid')}
+        label = ' '.join(str(p) for p in (r['stage'], r.get('model'), r.get('angle')) if p)
+        events.append({
+            'name': label, 'cat': r['stage'].split('.')[0], 'ph': 'X',
+            'ts': round((r['start'] - origin) * 1e6), 'dur': round((r['wall'] or 0) * 1e6),
+            'pid': r['pid'], 'tid': 0, 'args': args,
+        })
+    trace_path = Path(trace_path)
+    trace_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(trace_path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def summarize(records):
+    """
+    Aggregate records per stage.
+
+    Returns:
+        list: {'stage', 'count', 'wall', 'mean', 'max', 'cpu', 'peak_rss_mb'}
+            dicts, slowest total first
+    """
+    stages = {}
+    for r in records:
+        s = stages.setdefault(r['stage'], {'stage': r['stage'], 'count': 0, 'wall': 0.0,
+                                           'max': 0.0, 'cpu': 0.0, 'peak_rss_mb': None})
+        wall = r.get('wall') or 0.0
+        s['count'] += 1
+        s['wall'] += wall
+        s['max'] = max(s['max'], wall)
+        s['cpu'] += r.get('cpu') or 0.0
+        if r.get('peak_rss_mb') is not None:
+            s['peak_rss_mb'] = max(s['peak_rss_mb'] or 0.0, r['peak_rss_mb'])
+    for s in stages.values():
+        s['mean'] = s['wall'] / s['count']
+    return sorted(stages.values(), key=lambda s: -s['wall'])
+
+
+def print_stage_summary(records, slowest=5):
+    """Print the per-stage table and the slowest rendered angles"""
+    print(f"\n{'='*60}")
+    print("STAGE TIMINGS")
+    print(f"{'='*60}")
+    print(f"{'stage':18} {'count':>5} {'total s':>9} {'mean s':>8} {'max s':>8} "
+          f"{'cpu/wall':>8} {'rss MiB':>8}")
+    for s in summarize(records):
+        parallel = f"{s['cpu'] / s['wall']:.1f}" if s['wall'] else '-'
+        rss = f"{s['peak_rss_mb']:.0f}" if s['peak_rss_mb'] is not None else '-'
+        print(f"{s['stage']:18} {s['count']:5} {s['wall']:9.1f} {s['mean']:8.2f} "
+              f"{s['max']:8.2f} {parallel:>8} {rss:>8}")
+
+    renders = sorted((r for r in records if r['stage'] == 'render'),
+                     key=lambda r: -(r.get('wall') or 0))[:slowest]
+    if renders:
+        print("Slowest angles:")
+        for r in renders:
+            detail = ', '.join(f"{k} {r[k]:,}" for k in ('vertices', 'samples')
+                               if r.get(k) is not None)
+            print(f"  • {r['model']} {r['angle']}: {r['wall']:.1f}s"
+                  f"{f' ({detail})' if detail else ''}")
+    print(f"{'='*60}\n")
+
+
+def report(stats_path, trace_path=None):
+    """
+    Print the summary of a stats file and write its Chrome trace.
+
+    Args:
+        stats_path: Stats .jsonl file
+        trace_path: Trace output (default: next to the stats file, .trace.json)
+
+    Returns:
+        Path: Trace path, or None if there were no records
+    """
+    stats_path = Path(stats_path)
+    records = load_records(stats_path) if stats_path.exists() else []
+    if not records:
+        return None
+    trace_path = Path(trace_path) if trace_path else stats_path.with_suffix('.trace.json')
+    write_chrome_trace(records, trace_path)
+    print_stage_summary(records)
+    print(f"✓ Stage stats: {stats_path}")
+    print(f"✓ Chrome trace: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+    return trace_path
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Summarize render stage stats')
+    parser.add_argument('stats', help='Stats .jsonl file')
+    parser.add_argument('--trace', help='Chrome trace output (default: <stats>.trace.json)')
+    args = parser.parse_args()
+
+    if report(args.stats, args.trace) is None:
+        print(f"❌ No stage records in {args.stats}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
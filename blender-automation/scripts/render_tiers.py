@@ -0,0 +1,87 @@
+"""
+Render quality tiers for Cycles.
+
+Each tier bundles adaptive sampling, light-path bounce limits, an optional
+per-frame time limit and the denoiser, so a quick customer proof and the
+final storefront image come from the same pipeline:
+
+- draft:  seconds per angle on CPU, for layout and framing checks
+- proof:  clean enough to show a customer
+- final:  storefront quality (the original 256-sample setup)
+
+Draft and proof tiers also decimate heavy meshes (lod_ratio) before
+rendering; final always renders the full imported geometry.
+"""
+
+
+RENDER_TIERS = {
+    'draft': {
+        'description': 'Fast preview for framing checks',
+        'adaptive_threshold': 0.1,
+        'min_samples': 0,  # 0 = Cycles picks automatically
+        'max_samples': 32,
+        'time_limit': 10,  # Seconds per frame (0 = unlimited)
+        'max_bounces': 4,
+        'diffuse_bounces': 2,
+        'glossy_bounces': 2,
+        'transmission_bounces': 2,
+        'transparent_max_bounces': 4,
+        'caustics': False,
+        'denoiser': 'OPENIMAGEDENOISE',
+        'lod_ratio': 0.1,  # Keep 10% of faces on meshes above the LOD threshold
+    },
+    'proof': {
+        'description': 'Customer proof, clean shadows',
+        'adaptive_threshold': 0.05,
+        'min_samples': 16,
+        'max_samples': 128,
+        'time_limit': 60,
+        'max_bounces': 8,
+        'diffuse_bounces': 3,
+        'glossy_bounces': 4,
+        'transmission_bounces': 6,
+        'transparent_max_bounces': 8,
+        'caustics': False,
+        'denoiser': 'OPENIMAGEDENOISE',
+        'lod_ratio': 0.35,
+    },
+    'final': {
+        'description': 'Storefront quality',
+        'adaptive_threshold': 0.01,
+        'min_samples': 64,
+        'max_samples': 256,
+        'time_limit': 0,
+        'max_bounces': 12,
+        'diffuse_bounces': 4,
+        'glossy_bounces': 4,
+        'transmission_bounces': 12,
+        'transparent_max_bounces': 8,
+        'caustics': True,
+        'denoiser': 'OPENIMAGEDENOISE',
+        'lod_ratio': None,  # Full geometry
+    },
+}
+
+DEFAULT_TIER = 'final'
+
+# Meshes with fewer vertices than this are never decimated
+DEFAULT_LOD_THRESHOLD = 50_000
+
+
+def get_tier(name):
+    """
+    Look up a render tier by name.
+
+    Args:
+        name: 'draft', 'proof' or 'final'
+
+    Returns:
+        dict: Tier settings
+
+    Raises:
+        ValueError: If the tier is unknown
+    """
+    if name not in RENDER_TIERS:
+        raise ValueError(f"Unknown render tier '{name}' "
+                         f"(choose from {', '.join(RENDER_TIERS)})")
+    return RENDER_TIERS[name]
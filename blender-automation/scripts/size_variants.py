@@ -0,0 +1,197 @@
+"""
+Parametric size variants of a table model.
+
+A product line is one design in many sizes (150x80, 200x80, 240x110...).
+Instead of importing one OBJ per size, a base model is imported once and
+resized to each entry of the dimension table in place:
+
+- Along each horizontal axis the model is split into two outer bands,
+  from the edge of the top to the inner face of the legs, and the core in
+  between. The bands move outwards or inwards rigidly; only the core is
+  stretched. Leg cross-sections, leg inset and overhang stay as modeled.
+- The longer horizontal axis of the base takes the variant's length, the
+  shorter one its width.
+- The top takes the variant's thickness. Its upper surface stays at the
+  table height; the underside moves and everything below it (legs,
+  aprons) is scaled vertically to meet it, so the table height is kept.
+
+Legs are found as the geometry in the lower half of the model. When the
+lower half reaches into the middle of an axis (pedestal bases, subdivided
+stretchers) there is no rigid band and that axis is scaled uniformly.
+
+The top's thickness is measured at the model's outer edge, which only the
+top reaches when it overhangs the legs. When the legs are flush with the
+edge or the measured slab is implausibly thick, the modeled thickness is
+kept.
+"""
+
+import numpy as np
+
+from camera_positions import DIMENSION_PRESETS, get_model_dimensions
+
+
+VARIANT_METHOD = 'leg-bands-2'  # Part of render cache keys; bump when resizing changes
+MIN_CORE_SHARE = 0.1  # Below this share of the half-extent, scale the axis uniformly
+EDGE_SHARE = 0.01  # Vertices this close to the outer edge (share of the extent) are the top's
+MAX_TOP_SHARE = 0.25  # Thicker "tops" than this share of the height are not a top slab
+
+
+def stretch(offsets, half, band, new_half):
+    """
+    Map offsets from the center so the half-extent becomes new_half,
+    moving the outer band rigidly and scaling the core.
+
+    Args:
+        offsets: Coordinates relative to the center along one axis
+        half: Current half-extent
+        band: Width of the rigid outer band
+        new_half: Target half-extent
+
+    Returns:
+        np.ndarray: New offsets
+    """
+    core, new_core = half - band, new_half - band
+    magnitude = np.abs(offsets)
+    return np.where(magnitude <= core, offsets * (new_core / core),
+                    np.sign(offsets) * (magnitude + new_half - half))
+
+
+def leg_band(offsets, lower, half):
+    """
+    Width of the rigid band along one axis: edge of the top to the inner
+    face of the legs (0 = no legs clear of the middle, scale uniformly).
+    """
+    if not lower.any():
+        return 0.0
+    band = half - float(np.abs(offsets[lower]).min())
+    return band if half - band >= MIN_CORE_SHARE * half else 0.0
+
+
+def top_thickness(vertices):
+    """
+    Thickness of the table top, measured at the outer edge of the model.
+
+    Args:
+        vertices: (N, 3) vertex positions in meters, Z up
+
+    Returns:
+        float: Thickness in meters, or None if the edge is not only the top
+            (legs flush with the edge, or no clear slab)
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    bbox_min, bbox_max = vertices.min(axis=0), vertices.max(axis=0)
+    extent = bbox_max - bbox_min
+    if extent[2] <= 0:
+        return None
+
+    # On both horizontal axes, only the top reaches the outer edge
+    thickness = 0.0
+    for axis in (0, 1):
+        tolerance = extent[axis] * EDGE_SHARE
+        edge = ((vertices[:, axis] <= bbox_min[axis] + tolerance)
+                | (vertices[:, axis] >= bbox_max[axis] - tolerance))
+        thickness = max(thickness, bbox_max[2] - float(vertices[edge, 2].min()))
+    if not 0 < thickness <= MAX_TOP_SHARE * extent[2]:
+        return None
+    return thickness
+
+
+def set_top_thickness(vertices, thickness_m):
+    """
+    Give the table top a new thickness, keeping the table height.
+
+    Args:
+        vertices: (N, 3) vertex positions in meters, Z up
+        thickness_m: Target top thickness
+
+    Returns:
+        tuple: (np.ndarray (N, 3) vertices, bool changed); unchanged if the
+            top cannot be measured (see top_thickness) or would not fit
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    current = top_thickness(vertices)
+    floor, top = float(vertices[:, 2].min()), float(vertices[:, 2].max())
+    if current is None or not 0 < thickness_m < (top - floor) / 2:
+        return vertices, False
+
+    # Piecewise linear in Z: [floor, underside] and [underside, top] each
+    # map onto their new ranges; the top surface and the floor stay put
+    underside, new_underside = top - current, top - thickness_m
+    z = vertices[:, 2]
+    resized = vertices.copy()
+    resized[:, 2] = np.where(
+        z >= underside,
+        top - (top - z) * (thickness_m / current),
+        floor + (z - floor) * ((new_underside - floor) / (underside - floor)))
+    return resized, True
+
+
+def resize_table(vertices, length_m, width_m, thickness_m=None):
+    """
+    Resize table geometry to a new length, width and top thickness.
+
+    Args:
+        vertices: (N, 3) world-space vertex positions in meters, Z up
+        length_m: Target length (longer horizontal side)
+        width_m: Target width
+        thickness_m: Target top thickness (None = keep the modeled one)
+
+    Returns:
+        np.ndarray: (N, 3) resized vertices
+
+    Raises:
+        ValueError: If a target side is too short to keep the legs
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    bbox_min, bbox_max = vertices.min(axis=0), vertices.max(axis=0)
+    center, extent = (bbox_min + bbox_max) / 2, bbox_max - bbox_min
+    lower = vertices[:, 2] < bbox_min[2] + extent[2] / 2
+    axes = (0, 1) if extent[0] >= extent[1] else (1, 0)
+
+    resized = vertices.copy()
+    for axis, target in zip(axes, (length_m, width_m)):
+        half, new_half = extent[axis] / 2, target / 2
+        if half <= 0:
+            continue
+        offsets = vertices[:, axis] - center[axis]
+        band = leg_band(offsets, lower, half)
+        if new_half <= band:
+            raise ValueError(f"{target * 1000:.0f}mm leaves no room between legs "
+                             f"{band * 1000:.0f}mm in from each edge")
+        resized[:, axis] = center[axis] + stretch(offsets, half, band, new_half)
+
+    if thickness_m is not None:
+        resized, _ = set_top_thickness(resized, thickness_m)
+    return resized
+
+
+def variant_sizes(base_name, names=None, catalog=None):
+    """
+    Resolve the variant list of a base model.
+
+    Args:
+        base_name: Base model name (its preset decides the default list)
+        names: Size names ('200x80', preset keys or 'LxW' in cm); None or
+            empty = every preset of the base model's category
+        catalog: Optional ModelCatalog consulted for dimensions
+
+    Returns:
+        dict: {variant name: dimension dict}, in order
+
+    Raises:
+        ValueError: If a name has no known dimensions
+    """
+    if not names:
+        base = get_model_dimensions(base_name, catalog)
+        category = base.get('category') if base else 'rectangular'
+        names = [name for name, dims in DIMENSION_PRESETS.items()
+                 if dims.get('category') == category]
+
+    sizes = {}
+    for name in names:
+        dims = get_model_dimensions(name, catalog)
+        if dims is None:
+            raise ValueError(f"No dimensions for variant '{name}' "
+                             f"(use a preset or an LxW size in cm, e.g. 180x90)")
+        sizes[name] = dims
+    return sizes
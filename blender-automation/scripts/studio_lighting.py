@@ -0,0 +1,31 @@
+"""
+Studio light colors and Cycles light groups.
+
+material_setup.py builds the lights and the world from these values;
+relight.py needs the same colors to re-tint the light-group passes, and
+runs without Blender, so they live here rather than in material_setup.py.
+
+This module does not import bpy.
+"""
+
+
+LIGHT_COLOR = (1.0, 1.0, 0.95)  # 5500K daylight (slightly warm white)
+
+WORLD_BACKGROUND_COLOR = (0.95, 0.95, 0.95)  # Light gray
+
+# Cycles light groups: each light (and the world) is also rendered into its
+# own pass for relighting after the render (render_passes.py, relight.py)
+LIGHT_GROUPS = {'Key_Light': 'key', 'Fill_Light': 'fill', 'Rim_Light': 'rim'}
+WORLD_LIGHT_GROUP = 'world'
+
+
+def light_group_colors():
+    """
+    Color each light group is rendered with.
+
+    Returns:
+        dict: {group: (r, g, b) linear color}, softboxes and world
+    """
+    colors = {group: LIGHT_COLOR for group in LIGHT_GROUPS.values()}
+    colors[WORLD_LIGHT_GROUP] = WORLD_BACKGROUND_COLOR
+    return colors
@@ -0,0 +1,169 @@
+"""
+Synthetic table models for benchmarks.
+
+Generates OBJ tables (a tabletop and four legs) at the DIMENSION_PRESETS
+sizes with a controlled face count, so benchmarks do not depend on the
+reference models, which are not versioned with the scripts. The top and
+bottom of the tabletop are subdivided into a grid to reach the requested
+face count; output is deterministic, so the same arguments always produce
+byte-identical files (and render cache keys).
+
+Files are named '<preset> (<faces>).obj', e.g. '150x80 (100k).obj', so
+the preset dimensions still apply (the variant suffix is ignored when
+matching presets). Coordinates are meters, written Y-up like CAD exports.
+
+Usage:
+    python synthetic_models.py ../bench-models --faces 10000 100000 1000000
+"""
+
+import math
+from pathlib import Path
+
+import numpy as np
+
+from camera_positions import DIMENSION_PRESETS
+
+
+TABLE_HEIGHT_MM = 750
+LEG_SIZE_MM = 60
+LEG_INSET_MM = 80
+
+
+def box_mesh(x0, x1, y0, y1, z0, z1, nx=1, ny=1):
+    """
+    Closed box whose top and bottom faces are nx × ny quad grids.
+
+    Returns:
+        tuple: (vertices (N, 3) float array, quads (M, 4) int array, 0-based)
+    """
+    xs, ys = np.linspace(x0, x1, nx + 1), np.linspace(y0, y1, ny + 1)
+    gx, gy = np.meshgrid(xs, ys, indexing='ij')
+    grid = np.stack([gx.ravel(), gy.ravel()], axis=-1)
+    count = len(grid)
+    vertices = np.concatenate([
+        np.column_stack([grid, np.full(count, z1)]),  # Top
+        np.column_stack([grid, np.full(count, z0)]),  # Bottom
+    ])
+
+    index = np.arange(count).reshape(nx + 1, ny + 1)
+    a, b = index[:-1, :-1].ravel(), index[1:, :-1].ravel()
+    c, d = index[1:, 1:].ravel(), index[:-1, 1:].ravel()
+    top = np.stack([a, b, c, d], axis=-1)
+    bottom = np.stack([a, d, c, b], axis=-1) + count  # Reversed winding, facing down
+
+    # Perimeter of the grid, counter-clockwise seen from above
+    ring = np.concatenate([index[:, 0], index[-1, 1:], index[-2::-1, -1], index[0, -2:0:-1]])
+    following = np.roll(ring, -1)
+    sides = np.stack([ring + count, following + count, following, ring], axis=-1)
+
+    return vertices, np.concatenate([top, bottom, sides])
+
+
+def table_parts(length_mm, width_mm, thickness_mm, faces=10_000, height_mm=TABLE_HEIGHT_MM):
+    """
+    Tabletop and legs of a table with about `faces` quads in total.
+
+    Args:
+        length_mm, width_mm, thickness_mm: Tabletop dimensions
+        faces: Target face count (the tabletop grid absorbs nearly all of it)
+        height_mm: Floor to tabletop surface
+
+    Returns:
+        list: (name, vertices in meters (Z up), quads) per part
+    """
+    length, width = length_mm / 1000.0, width_mm / 1000.0
+    top, thickness = height_mm / 1000.0, thickness_mm / 1000.0
+    leg, inset = LEG_SIZE_MM / 1000.0, LEG_INSET_MM / 1000.0
+
+    # top + bottom = 2·nx·ny quads, plus the sides and 4 legs of 6 quads
+    cells = max(1.0, (faces - 24) / 2)
+    nx = max(1, round(math.sqrt(cells * length / width)))
+    ny = max(1, round(cells / nx))
+
+    parts = [('Tabletop', *box_mesh(-length / 2, length / 2, -width / 2, width / 2,
+                                     top - thickness, top, nx, ny))]
+    for i, (sx, sy) in enumerate(((-1, -1), (1, -1), (1, 1), (-1, 1)), 1):
+        cx = sx * (length / 2 - inset - leg / 2)
+        cy = sy * (width / 2 - inset - leg / 2)
+        parts.append((f'Leg_{i}', *box_mesh(cx - leg / 2, cx + leg / 2, cy - leg / 2, cy + leg / 2,
+                                            0.0, top - thickness)))
+    return parts
+
+
+def write_obj(path, parts):
+    """
+    Write parts as one OBJ (one object and material per part, Y up).
+
+    Args:
+        path: Output .obj path
+        parts: (name, vertices, quads) from table_parts()
+
+    Returns:
+        int: Total face count
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    offset, total = 1, 0
+    with open(path, 'w', newline='\n') as f:
+        f.write("# Synthetic benchmark table (synthetic_models.py)\n")
+        for name, vertices, quads in parts:
+            f.write(f"o {name}\nusemtl {'Tabletop' if name == 'Tabletop' else 'Legs'}\n")
+            # Z-up meters -> Y-up OBJ (Blender's importer maps it back)
+            y_up = np.column_stack([vertices[:, 0], vertices[:, 2], -vertices[:, 1]])
+            np.savetxt(f, y_up, fmt='v %.6f %.6f %.6f')
+            np.savetxt(f, quads + offset, fmt='f %d %d %d %d')
+            offset += len(vertices)
+            total += len(quads)
+    return total
+
+
+def faces_label(faces):
+    """Short face count label: 10000 -> '10k', 1000000 -> '1m'"""
+    for size, suffix in ((1_000_000, 'm'), (1_000, 'k')):
+        if faces >= size and faces % size == 0:
+            return f"{faces // size}{suffix}"
+    return str(faces)
+
+
+def generate_tables(output_dir, face_counts, presets=None):
+    """
+    Write one table per (preset, face count), skipping files that exist.
+
+    Args:
+        output_dir: Directory for the OBJ files
+        face_counts: Target face counts
+        presets: DIMENSION_PRESETS names (None = all)
+
+    Returns:
+        list: Paths of the generated tables
+    """
+    output_dir = Path(output_dir)
+    paths = []
+    for name in presets or DIMENSION_PRESETS:
+        dims = DIMENSION_PRESETS[name]
+        for faces in face_counts:
+            path = output_dir / f"{name} ({faces_label(faces)}).obj"
+            if not path.exists():
+                write_obj(path, table_parts(dims['length'], dims['width'], dims['thickness'],
+                                            faces))
+            paths.append(path)
+    return paths
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate synthetic benchmark tables')
+    parser.add_argument('output', help='Output directory')
+    parser.add_argument('--faces', nargs='+', type=int, default=[10_000, 100_000],
+                        help='Face counts (default: 10000 100000)')
+    parser.add_argument('--presets', nargs='+', choices=list(DIMENSION_PRESETS),
+                        help='Dimension presets (default: all)')
+    args = parser.parse_args()
+
+    paths = generate_tables(args.output, args.faces, args.presets)
+    print(f"✓ {len(paths)} synthetic tables in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Tiled rendering of single high-resolution frames.
+
+A frame is split into a grid of render.border regions that separate
+Blender worker processes render with the same seed and settings. Each
+tile is rendered with an overlap margin into its neighbours, so the
+denoiser sees the same context on both sides of a tile edge, and the
+overlaps are cross-faded when stitching. A tile is written atomically
+under a name that includes its render key (and stored in the render cache
+if one is configured), so a crashed or interrupted run only re-renders
+the tiles that are missing.
+
+Pixel rectangles are (x0, y0, x1, y1) with y measured from the bottom,
+matching render.border and bpy image pixel order.
+"""
+
+import argparse
+import json
+import subprocess
+import time
+from pathlib import Path
+
+import numpy as np
+
+from parallel_render import (available_cores, build_worker_command, merge_results,
+                             plan_core_affinity)
+
+
+DEFAULT_TILE_OVERLAP = 64
+TILE_DIR_NAME = '.tiles'
+
+
+def parse_tile_grid(spec):
+    """
+    Parse a tile grid such as '2' (2×2) or '4x2' (4 columns, 2 rows).
+
+    Used as an argparse type, so errors are reported as usage errors.
+
+    Returns:
+        tuple: (columns, rows)
+
+    Raises:
+        argparse.ArgumentTypeError: If the spec is not N or NxM with positive integers
+    """
+    parts = str(spec).strip().lower().split('x')
+    if len(parts) == 1:
+        parts = parts * 2
+    if len(parts) != 2 or not all(p.strip().isdigit() for p in parts):
+        raise argparse.ArgumentTypeError(
+            f"invalid tile grid '{spec}' (expected N or NxM, e.g. 2 or 4x2)")
+    columns, rows = (int(p) for p in parts)
+    if columns < 1 or rows < 1:
+        raise argparse.ArgumentTypeError(
+            f"invalid tile grid '{spec}' (columns and rows must be at least 1)")
+    return columns, rows
+
+
+def _split(length, count):
+    """Integer edges dividing [0, length) into count nearly equal parts"""
+    return [round(i * length / count) for i in range(count + 1)]
+
+
+def plan_tiles(width, height, grid, overlap=DEFAULT_TILE_OVERLAP):
+    """
+    Split a frame into tiles.
+
+    Args:
+        width, height: Frame size in pixels
+        grid: (columns, rows)
+        overlap: Pixels each tile extends into its neighbours
+
+    Returns:
+        list: Tile dicts {'id', 'core', 'render'} with pixel rectangles; 'core'
+            tiles the frame exactly, 'render' adds the overlap margin
+    """
+    columns, rows = grid
+    xs, ys = _split(width, columns), _split(height, rows)
+    tiles = []
+    for row in range(rows):
+        for col in range(columns):
+            core = [xs[col], ys[row], xs[col + 1], ys[row + 1]]
+            render = [max(0, core[0] - overlap), max(0, core[1] - overlap),
+                      min(width, core[2] + overlap), min(height, core[3] + overlap)]
+            tiles.append({'id': f"r{row}c{col}", 'core': core, 'render': render})
+    return tiles
+
+
+def tile_border(tile, width, height):
+    """
+    render.border fractions for a tile's render rectangle.
+
+    Returns:
+        tuple: (min_x, min_y, max_x, max_y) in 0-1 frame coordinates
+    """
+    x0, y0, x1, y1 = tile['render']
+    return (x0 / width, y0 / height, x1 / width, y1 / height)
+
+
+def tile_weights(tile):
+    """
+    Cross-fade weights over a tile's render rectangle.
+    1 inside the core, falling linearly to ~0 at the outer overlap edge.
+
+    Returns:
+        np.ndarray: (height, width) float32 weights
+    """
+    rx0, ry0, rx1, ry1 = tile['render']
+    cx0, cy0, cx1, cy1 = tile['core']
+
+    def ramp(start, end, core_start, core_end):
+        pos = np.arange(start, end) + 0.5
+        before = np.clip((pos - start) / max(core_start - start, 1), 0, 1)
+        after = np.clip((end - pos) / max(end - core_end, 1), 0, 1)
+        weights = np.ones(end - start, dtype=np.float32)
+        if core_start > start:
+            weights = np.minimum(weights, before)
+        if end > core_end:
+            weights = np.minimum(weights, after)
+        return weights.astype(np.float32)
+
+    return np.outer(ramp(ry0, ry1, cy0, cy1), ramp(rx0, rx1, cx0, cx1))
+
+
+def stitch_tiles(width, height, tile_pixels):
+    """
+    Blend rendered tiles into one frame.
+
+    Args:
+        width, height: Frame size in pixels
+        tile_pixels: List of (tile, (h, w, channels) float array) pairs, rows
+            bottom-up like bpy image pixels
+
+    Returns:
+        np.ndarray: (height, width, channels) float32 frame
+    """
+    channels = tile_pixels[0][1].shape[2]
+    accum = np.zeros((height, width, channels), dtype=np.float32)
+    total = np.zeros((height, width, 1), dtype=np.float32)
+    for tile, pixels in tile_pixels:
+        x0, y0, x1, y1 = tile['render']
+        # Border rounding can make a tile a pixel smaller than planned
+        h, w = min(pixels.shape[0], y1 - y0), min(pixels.shape[1], x1 - x0)
+        weights = tile_weights(tile)[:h, :w, None]
+        accum[y0:y0 + h, x0:x0 + w] += pixels[:h, :w] * weights
+        total[y0:y0 + h, x0:x0 + w] += weights
+    return accum / np.maximum(total, 1e-8)
+
+
+def tile_path(output_dir, model_name, angle_id, tile, key):
+    """Tile PNG path, named by render key so stale tiles are never reused"""
+    return (Path(output_dir) / TILE_DIR_NAME / model_name / angle_id /
+            f"tile_{tile['id']}_{key[:16]}.png")
+
+
+def run_tile_workers(model_path, jobs, output_dir, workers, blender_binary,
+                     resolution=(2048, 2048), threads_per_worker=None, pin_cores=False,
+                     worker_args=()):
+    """
+    Render tiles across several Blender processes.
+
+    Args:
+        model_path: Model file every worker imports
+        jobs: Tile jobs [{'angle', 'tile', 'path', 'key'}, ...]
+        output_dir: Output directory (work files go to <output>/.workers/)
+        workers: Number of Blender processes
+        blender_binary: Path to the Blender executable
+        resolution: Full frame resolution
+        threads_per_worker: Cycles threads per worker (None = cores / workers)
+        pin_cores: If True, pin each worker to its own group of cores
+        worker_args: Extra batch_render.py flags forwarded to every worker
+
+    Returns:
+        dict: Merged {'<angle>/<tile id>': result} from all workers
+    """
+    work_dir = Path(output_dir) / '.workers'
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    # Round-robin keeps each worker's tiles spread over the frame
+    shards = [jobs[i::workers] for i in range(workers)]
+    shards = [shard for shard in shards if shard]
+    core_groups = plan_core_affinity(len(shards))
+    if threads_per_worker is None:
+        threads_per_worker = max(1, len(available_cores()) // len(shards))
+
+    print(f"✓ Rendering {len(jobs)} tiles in {len(shards)} Blender workers, "
+          f"{threads_per_worker} threads each")
+
+    processes = []
+    for i, shard in enumerate(shards):
+        jobs_file = work_dir / f"tiles_{i}.json"
+        results_file = work_dir / f"tile_results_{i}.json"
+        log_file = work_dir / f"tile_worker_{i}.log"
+        with open(jobs_file, 'w') as f:
+            json.dump(shard, f, indent=2)
+        if results_file.exists():
+            results_file.unlink()
+
+        command = build_worker_command(
+            blender_binary, model_path, results_file, output_dir,
+            resolution=resolution, threads=threads_per_worker,
+            cores=core_groups[i] if pin_cores else None,
+            worker_args=[*worker_args, '--tile-jobs', str(jobs_file)]
+        )
+        log = open(log_file, 'w')
+        processes.append((i, subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT),
+                          log, results_file))
+        print(f"  • Tile worker {i}: {len(shard)} tiles, log {log_file.name}")
+
+    start = time.time()
+    for i, process, log, results_file in processes:
+        return_code = process.wait()
+        log.close()
+        status = '✓' if return_code == 0 else '❌'
+        print(f"{status} Tile worker {i} finished (exit {return_code}) "
+              f"after {time.time() - start:.0f}s")
+
+    return merge_results(p[3] for p in processes)